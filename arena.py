@@ -0,0 +1,257 @@
+"""
+Arena: hundreds or thousands of AI snakes on one wrap-around board.
+
+Every snake is a Snake driven by a policy (see policies.py), and food is
+placed by Food.spawn. All snakes share one ownership grid: an array with
+the serial number of the snake covering each packed cell (0 for none).
+Each snake marks it through Snake's occupancy hook, so moving claims the
+new head and releases the tail in O(1), and a snake's occupies() answers
+for every live snake, which makes the built-in policies avoid each other
+unchanged. A dead snake's cells are not cleared: a cell whose owner is no
+longer alive simply reads as free. So a tick costs O(1) per snake,
+whatever the snakes' lengths, with no snake-vs-snake comparisons.
+
+Each tick resolves in a fixed order, so the outcome never depends on the
+order snakes are stored in:
+
+    1. Every live snake's policy picks a direction; heads are aimed.
+    2. A head aimed at a cell owned by a live snake dies, unless the cell
+       is that snake's tail and it leaves this tick (not growing). This
+       covers hitting bodies, its own body and heads swapping places.
+    3. Heads aimed at the same free cell: the longest snake survives; if
+       the longest are tied, all of them die.
+    4. The dead are removed at once; survivors move, then eat (10 points
+       and a segment, and the food respawns elsewhere).
+    5. Dead snakes respawn as new snakes where a random spot is free,
+       retrying on later ticks when the board is too crowded.
+"""
+
+import itertools
+import random
+from array import array
+
+from config import BOARD_WIDTH, BOARD_HEIGHT
+from food import Food, BonusFood
+from policies import autopilot_policy
+from snake import Snake
+
+SPAWN_TRIES = 32  # Random probes per tick for a free spawn spot or food cell
+
+
+class _Ownership:
+    """One snake's handle on the arena grid, indexed like snake.py's occupancy map.
+
+    Setting a cell claims it for the snake; clearing releases it only if the
+    snake still owns it. A cell reads as taken while its owner is alive.
+    """
+
+    __slots__ = ('grid', 'live', 'serial')
+
+    def __init__(self, grid, live, serial):
+        self.grid = grid
+        self.live = live
+        self.serial = serial
+
+    def __getitem__(self, cell):
+        return self.grid[cell] in self.live
+
+    def __setitem__(self, cell, flag):
+        if flag:
+            self.grid[cell] = self.serial
+        elif self.grid[cell] == self.serial:
+            self.grid[cell] = 0
+
+
+class _FreeCells:
+    """Free-cell sampler over the arena grid, for Food.spawn."""
+
+    def __init__(self, arena):
+        self.arena = arena
+
+    def choice(self, excluded=(), rng=random):
+        """A random cell free of snakes and food, or None if SPAWN_TRIES probes fail."""
+        arena = self.arena
+        for _ in range(SPAWN_TRIES):
+            cell = rng.randrange(arena.cells)
+            if arena.is_free(cell):
+                return arena.unpack(cell)
+        return None
+
+
+class ArenaPlayer:
+    """One AI snake and its score; policies see it as their engine."""
+
+    __slots__ = ('arena', 'slot', 'serial', 'policy', 'snake', 'food', 'bonus_food', 'score',
+                 'alive', 'board_width', 'board_height', 'target', 'policy_rng')
+
+    def __init__(self, arena, slot, policy, food):
+        self.arena = arena
+        self.slot = slot
+        self.policy = policy
+        self.food = food  # The food this snake's policy steers for
+        self.bonus_food = arena.bonus_food
+        self.board_width = arena.board_width
+        self.board_height = arena.board_height
+        self.serial = 0
+        self.snake = None
+        self.score = 0
+        self.alive = False
+        self.target = None  # Packed cell the head is aimed at this tick
+        self.policy_rng = None  # Seeded from the arena's stream at each spawn
+
+    @property
+    def tick(self):
+        return self.arena.tick
+
+
+class Arena:
+    """Many policy-driven snakes, one board, one shared ownership grid.
+
+    `policies` gives one callable per snake. Each snake steers for one of
+    `foods` foods (default one per snake), though it may eat any of them.
+    The autopilot is refused: it plans for a lone snake on an empty board.
+    """
+
+    def __init__(self, policies, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 foods=None, seed=None):
+        if autopilot_policy in policies:
+            raise ValueError("the autopilot policy plans for a single snake on an empty "
+                             "board and cannot play in the arena")
+        self.board_width = board_width
+        self.board_height = board_height
+        self.cells = board_width * board_height
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.grid = array('I', [0]) * self.cells  # Serial of the snake on each packed cell
+        self.live = {}  # Serial -> ArenaPlayer, for every snake alive
+        self._serials = itertools.count(1)
+
+        self.foods = [Food() for _ in range(foods or len(policies))]
+        self.bonus_food = BonusFood()  # Never spawned; there for policies written for Engine
+        self.food_cells = {}  # Packed cell -> index into foods
+        self.free_cells = _FreeCells(self)
+        self._unplaced = []  # Foods that found no free cell, retried every tick
+
+        self.deaths = 0
+        self.head_on = 0  # Deaths from heads meeting in one cell
+        self.eaten = 0
+        self.best_score = 0
+        self.players = [ArenaPlayer(self, slot, policy, self.foods[slot % len(self.foods)])
+                        for slot, policy in enumerate(policies)]
+        self._waiting = list(self.players)  # Dead players waiting to respawn
+        self._respawn()
+        for index in range(len(self.foods)):
+            self._spawn_food(index)
+
+    def unpack(self, cell):
+        y, x = divmod(cell, self.board_width)
+        return x, y
+
+    def is_free(self, cell):
+        """Whether a packed cell holds neither a live snake nor food."""
+        return self.grid[cell] not in self.live and cell not in self.food_cells
+
+    def _spawn_food(self, index):
+        food = self.foods[index]
+        if food.position is not None:
+            del self.food_cells[food.position[1] * self.board_width + food.position[0]]
+        food.spawn(None, self.board_width, self.board_height,
+                   free_cells=self.free_cells, rng=self.rng)
+        if food.position is not None:
+            self.food_cells[food.position[1] * self.board_width + food.position[0]] = index
+        else:
+            self._unplaced.append(index)
+
+    def _spawn(self, player):
+        """Start a new snake for player on a free row of 4 cells; False if none was found."""
+        w, h = self.board_width, self.board_height
+        for _ in range(SPAWN_TRIES):
+            x, y = self.rng.randrange(w), self.rng.randrange(h)
+            row = y * w
+            # Three segments ending at (x, y) heading right, plus the cell ahead
+            if all(self.is_free(row + (x + dx) % w) for dx in (-2, -1, 0, 1)):
+                break
+        else:
+            return False
+        serial = next(self._serials)
+        player.serial = serial
+        player.snake = Snake(x, y, w, h, occupancy=_Ownership(self.grid, self.live, serial))
+        player.policy_rng = random.Random(self.rng.getrandbits(64))
+        player.score = 0
+        player.alive = True
+        self.live[serial] = player
+        return True
+
+    def _respawn(self):
+        self._waiting = [p for p in self._waiting if not self._spawn(p)]
+
+    def _kill(self, player):
+        """Remove a snake in O(1); its cells read as free once it is not live."""
+        player.alive = False
+        del self.live[player.serial]
+        self.deaths += 1
+        self.best_score = max(self.best_score, player.score)
+        self._waiting.append(player)
+
+    def _blocked(self, cell):
+        """Whether a head entering cell this tick hits a snake (step 2)."""
+        owner = self.live.get(self.grid[cell])
+        if owner is None:
+            return False
+        snake = owner.snake
+        if snake.growing:
+            return True
+        x, y = snake.tail
+        return cell != y * self.board_width + x
+
+    def step(self):
+        """Advance every snake by one tick (see the module docstring for the order)."""
+        self.tick += 1
+        w, h = self.board_width, self.board_height
+        movers = list(self.live.values())
+
+        # 1. Policies pick directions; heads are aimed
+        aimed = {}  # Packed cell -> players aiming at it
+        for player in movers:
+            snake = player.snake
+            direction = player.policy(player)
+            if direction is not None:
+                snake.change_direction(direction)
+            x, y = snake.head
+            dx, dy = snake.direction
+            player.target = (y + dy) % h * w + (x + dx) % w
+            aimed.setdefault(player.target, []).append(player)
+
+        # 2-3. Collisions with bodies, then heads meeting
+        dead = []
+        for cell, players in aimed.items():
+            if self._blocked(cell):
+                dead.extend(players)
+            elif len(players) > 1:
+                players.sort(key=lambda p: len(p.snake.body), reverse=True)
+                longest = len(players[0].snake.body)
+                tied = len(players[1].snake.body) == longest
+                losers = players if tied else players[1:]
+                dead.extend(losers)
+                self.head_on += len(losers)
+
+        # 4. Remove the dead, move the rest, then eat
+        for player in dead:
+            self._kill(player)
+        survivors = [p for p in movers if p.alive]
+        for player in survivors:
+            player.snake.move()
+        for player in survivors:
+            index = self.food_cells.get(player.target)
+            if index is not None:
+                player.snake.grow()
+                player.score += 10
+                self.eaten += 1
+                self._spawn_food(index)
+
+        # 5. Respawn the dead, and any food that found no free cell earlier
+        self._respawn()
+        unplaced, self._unplaced = self._unplaced, []
+        for index in unplaced:
+            self._spawn_food(index)
+        return len(dead)
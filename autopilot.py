@@ -0,0 +1,315 @@
+"""
+Autopilot: a planner that steers the snake to the food safely.
+
+The snake follows a fixed Hamiltonian cycle of the board, computed per
+cell in O(1) rather than stored, and cuts across it toward the food. It
+keeps its body in cycle order: walking the cycle forward from the tail
+meets every body cell in turn, ending at the head. While that holds the
+next cell on the cycle is always free by the time the head gets there, so
+following the cycle is always safe. A shortcut is only taken if it lands
+ahead of the head and before the food, which keeps the order, and leaves
+more free cells ahead than the body is long, so the tail moves past the
+cells it skipped before the head can run out of room (shortcuts stop once
+the snake fills about half the board). The snake therefore never seals
+itself in, and it cannot livelock: every move brings the food closer
+along the cycle, so the game always ends with the board filled.
+
+The planner never searches the board for a path to the food (no BFS or
+A* toward it): a free path found that way can lead the snake into a
+pocket it cannot leave, and ruling that out costs a search per tick that
+grows with the board. Instead each move is one of the head's neighbours,
+read off a distance field: for each cell before the food on the cycle,
+the fewest moves to the food when only moving forward. The cells between
+the head and the food are free, so the field depends only on the board;
+it is built backward from the food a slice per tick within a per-tick
+time budget and reused until the food moves. Until it reaches the head
+the snake takes the largest safe shortcut toward the food. Routes are
+therefore longer than a shortest path whenever the food lies behind the
+head on the cycle.
+
+The body is mirrored with the tick each cell was entered, and with the
+cycle distance from the tail to the head along it, both updated from the
+new head and vacated tail every tick. If the body is not in cycle order
+(the start of a game running against the cycle, or a game taken over
+midway), the snake follows the cycle wherever a time-aware flood fill
+shows it can still reach its own tail, which lines it up within about
+its length in moves.
+"""
+
+import time
+from array import array
+from collections import deque
+
+from config import UP, DOWN, LEFT, RIGHT, OPPOSITES
+from policies import DIRECTIONS
+
+TIME_BUDGET = 0.004  # Seconds of planning per tick, well inside MIN_SPEED
+CHECK_EVERY = 16  # Cells searched between clock checks
+
+
+class _Timeout(Exception):
+    pass
+
+
+def cycle_direction(cell, board_width, board_height):
+    """Direction of a fixed Hamiltonian cycle of the board at cell.
+
+    Rows are swept in a boustrophedon over columns 1.., returning up column
+    0. On odd heights the last row is spliced in between (2, h-2) and
+    (1, h-2), using the horizontal wrap. Needs a board of at least 3x2.
+    """
+    x, y = cell
+    rows = board_height - board_height % 2  # Rows covered by the plain sweep
+    if y >= rows:
+        return UP if x == 1 else RIGHT
+    if x == 0:
+        return RIGHT if y == 0 else UP
+    if y % 2 == 0:
+        return RIGHT if x < board_width - 1 else DOWN
+    if y == rows - 1:
+        return DOWN if x == 2 and rows < board_height else LEFT
+    return LEFT if x > 1 else DOWN
+
+
+def cycle_index(cell, board_width, board_height):
+    """Position of cell along cycle_direction's cycle, counting from (0, 0)."""
+    x, y = cell
+    rows = board_height - board_height % 2
+    if x == 0 and y < rows:
+        return -y % (board_width * board_height)
+    if y >= rows:
+        return rows * (board_width - 1) + (x - 2) % board_width
+    if y % 2 == 0:
+        return y * (board_width - 1) + x
+    if x == 1 and y == rows - 1 and rows < board_height:
+        return rows * (board_width - 1) + board_width
+    return y * (board_width - 1) + board_width - x
+
+
+def cycle_cell(index, board_width, board_height):
+    """Cell at a position along the cycle (the inverse of cycle_index)."""
+    rows = board_height - board_height % 2
+    sweep = rows * (board_width - 1)  # Positions of the plain sweep end here
+    if index == 0:
+        return 0, 0
+    if rows < board_height and index >= sweep:
+        if index < sweep + board_width:
+            return (index - sweep + 2) % board_width, board_height - 1
+        if index == sweep + board_width:
+            return 1, rows - 1
+    elif index <= sweep:
+        y, offset = divmod(index - 1, board_width - 1)
+        return (offset + 1 if y % 2 == 0 else board_width - 1 - offset), y
+    return 0, board_width * board_height - index
+
+
+class Autopilot:
+    """Policy callable (see policies.py) that plans paths to the food.
+
+    One instance can drive any number of games in turn; it resynchronizes
+    whenever it is handed a new engine or a reset one.
+    """
+
+    def __init__(self, time_budget=TIME_BUDGET):
+        self.time_budget = time_budget
+        self.engine = None
+        self.tick = None
+        self.body = deque()  # Mirror of snake.body
+        self.entered = {}  # Body cell -> tick the head entered it
+        self.span = 0  # Cycle distance from the tail to the head along the body
+        self.field = array('I')  # field[r]: moves to the food from r cells before it on the cycle
+        self.field_food = None
+        self.stats = {'shortcuts': 0, 'timeouts': 0, 'aligning': 0}
+
+    def __call__(self, engine):
+        self.deadline = time.perf_counter() + self.time_budget
+        self._sync(engine)
+        if self.span >= self.cells:  # Gaps add up past a whole cycle: not in order
+            self.stats['aligning'] += 1
+            return self._align()
+        return self._shortcut(engine.food.position)
+
+    def _sync(self, engine):
+        """Bring the body mirror up to date with the engine's snake."""
+        snake = engine.snake
+        body = self.body
+        if engine is self.engine and engine.tick == self.tick:
+            return
+        if engine is self.engine and engine.tick == self.tick + 1 and body:
+            # One move: the tail left (unless growing), then the head entered
+            while body and len(body) + 1 > len(snake.body):
+                tail = body.pop()
+                del self.entered[tail]
+                if body:
+                    self.span -= self._gap(tail, body[-1])
+            self.span += self._gap(body[0], snake.head)
+            body.appendleft(snake.head)
+            self.entered[snake.head] = engine.tick
+            synced = body[-1] == snake.tail and len(body) == len(snake.body)
+        else:
+            synced = False
+
+        if not synced:
+            self.width, self.height = engine.board_width, engine.board_height
+            self.cells = self.width * self.height
+            self.body = deque(snake.body)
+            self.entered = {cell: engine.tick - i for i, cell in enumerate(snake.body)}
+            self.span = sum(self._gap(self.body[i + 1], self.body[i])
+                            for i in range(len(self.body) - 1))
+            self.field_food = None
+        self.engine = engine
+        self.tick = engine.tick
+
+    def _index(self, cell):
+        return cycle_index(cell, self.width, self.height)
+
+    def _gap(self, a, b):
+        """Moves along the cycle from cell a forward to cell b."""
+        return (self._index(b) - self._index(a)) % self.cells
+
+    def _free_after(self, cell):
+        """Moves until a body cell is vacated (0 if it is free now)."""
+        entered = self.entered.get(cell)
+        if entered is None:
+            return 0
+        return entered - self.entered[self.body[-1]] + 1 + self.engine.snake.growing
+
+    def _enterable(self, cell):
+        return self._free_after(cell) <= 1
+
+    def _neighbors(self, cell):
+        x, y = cell
+        width, height = self.width, self.height
+        for dx, dy in DIRECTIONS:
+            yield ((x + dx) % width, (y + dy) % height)
+
+    def _check_clock(self, expansions):
+        if expansions % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise _Timeout
+
+    def _shortcut(self, food):
+        """Step along the cycle or ahead of it toward the food, keeping the body in order."""
+        engine = self.engine
+        snake = engine.snake
+        head = snake.head
+        if food is None:
+            return cycle_direction(head, self.width, self.height)
+        head_index = self._index(head)
+        to_food = (self._index(food) - head_index) % self.cells
+        room = self.cells - 1 - self.span  # Free cells from the head forward to the tail
+        try:
+            self._extend_field(food, to_food - 1)
+        except _Timeout:
+            self.stats['timeouts'] += 1
+        field = self.field
+        use_field = to_food <= room and len(field) >= to_food
+
+        bonus = engine.bonus_food
+        best = best_key = None
+        for direction, cell in zip(DIRECTIONS, self._neighbors(head)):
+            if direction == OPPOSITES[snake.direction]:
+                continue
+            jump = (self._index(cell) - head_index) % self.cells
+            if jump == 1:
+                # The next cell on the cycle: free unless it is the tail and it stays
+                if not self._enterable(cell):
+                    continue
+            else:
+                grows = cell == food or (bonus.active and bonus.is_eaten(cell))
+                # Land before the food, leaving more free cells ahead than the body is long
+                if jump > to_food or room - jump <= len(self.body) + grows:
+                    continue
+            rest = to_food - jump
+            key = (field[rest] if use_field else rest, rest)
+            if best_key is None or key < best_key:
+                best, best_key = (direction, jump), key
+        if best is None:
+            return self._align()
+        if best[1] > 1:
+            self.stats['shortcuts'] += 1
+        return best[0]
+
+    def _extend_field(self, food, last):
+        """Grow the distance field to the food until it covers `last` cells before it."""
+        if food != self.field_food:
+            self.field = array('I', [0])
+            self.field_food = food
+        field = self.field
+        width, height, cells = self.width, self.height, self.cells
+        food_index = self._index(food)
+        expansions = 0
+        for before in range(len(field), last + 1):
+            expansions += 1
+            self._check_clock(expansions)
+            cell = cycle_cell((food_index - before) % cells, width, height)
+            best = field[before - 1]  # Its successor on the cycle
+            for neighbor in self._neighbors(cell):
+                ahead = (food_index - cycle_index(neighbor, width, height)) % cells
+                if ahead < before and field[ahead] < best:
+                    best = field[ahead]
+            field.append(best + 1)
+
+    def _tail_reachable(self, path, eats=True):
+        """Whether, after following path (and eating at its end), the head can reach the tail."""
+        grows = int(eats)
+        length = len(self.body) + self.engine.snake.growing
+        moves = len(path)
+        on_path = {cell: i for i, cell in enumerate(path)}
+        head = path[-1]
+        if moves < length:
+            tail = self.body[length - moves - 1]
+        else:
+            tail = path[moves - length]
+
+        def free_after(cell):
+            # Moves, counted from arrival, until a cell of the virtual body is free
+            i = on_path.get(cell)
+            if i is not None:
+                index = moves - 1 - i  # Position from the virtual head
+                return length - index + grows if index < length else 0
+            remaining = self._free_after(cell) - moves
+            return remaining + grows if remaining > 0 else 0
+
+        seen = {head}
+        frontier = [head]
+        depth = expansions = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for cell in frontier:
+                expansions += 1
+                self._check_clock(expansions)
+                for neighbor in self._neighbors(cell):
+                    if neighbor in seen or free_after(neighbor) > depth:
+                        continue
+                    if neighbor == tail:
+                        return True
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+        return False
+
+    def _safe_moves(self):
+        """(direction, cell) pairs that do not collide on this move."""
+        snake = self.engine.snake
+        return [
+            (direction, cell)
+            for direction, cell in zip(DIRECTIONS, self._neighbors(snake.head))
+            if direction != OPPOSITES[snake.direction] and self._enterable(cell)
+        ]
+
+    def _align(self):
+        """Follow the cycle, or the move nearest it, that keeps the tail reachable."""
+        engine = self.engine
+        moves = self._safe_moves()
+        if not moves:
+            return None
+        head = engine.snake.head
+        moves.sort(key=lambda move: self._gap(head, move[1]))
+        try:
+            for direction, cell in moves:
+                if self._tail_reachable([cell], eats=cell == engine.food.position):
+                    return direction
+        except _Timeout:
+            self.stats['timeouts'] += 1
+        return moves[0][0]
@@ -0,0 +1,248 @@
+"""
+Vectorized engine that runs many games in lockstep with NumPy.
+
+Requires NumPy (the rest of the game does not). Rules follow Engine.update:
+wall wrapping, self collision, regular food, timed bonus food on the game
+clock, speed-ups and the win bonus. Each game keeps its own occupancy row
+and ring-buffer body; finished games are reset automatically inside the
+batch. Spawns are sampled from one NumPy generator, so a seeded batch is
+reproducible, but its random stream differs from Engine's.
+"""
+
+import numpy as np
+
+from config import (
+    BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED, SPEED_INCREMENT, MIN_SPEED,
+    BONUS_FOOD_INTERVAL, BONUS_FOOD_SIZE, BONUS_FOOD_DURATION,
+    BONUS_MAX_SCORE, BONUS_MIN_SCORE, UP, DOWN, LEFT, RIGHT
+)
+
+# Action indexes; -1 keeps the current direction
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+ACTION_DX = np.array([d[0] for d in ACTIONS], dtype=np.int64)
+ACTION_DY = np.array([d[1] for d in ACTIONS], dtype=np.int64)
+OPPOSITE_ACTION = np.array([1, 0, 3, 2], dtype=np.int64)
+RIGHT_ACTION = ACTIONS.index(RIGHT)
+
+# Rejection-sampling rounds before falling back to an exact scan
+SPAWN_TRIES = 8
+
+
+class BatchEngine:
+    """N games stored as arrays and advanced together by step()."""
+
+    def __init__(self, num_games, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 seed=None):
+        self.num_games = num_games
+        self.board_width = board_width
+        self.board_height = board_height
+        self.cells = board_width * board_height
+        self.rng = np.random.default_rng(seed)
+
+        n = num_games
+        self.grid = np.zeros((n, self.cells), dtype=bool)  # Occupancy, flat y*W+x
+        self.bodies = np.zeros((n, self.cells), dtype=np.int32)  # Ring buffers
+        self.head_ptr = np.zeros(n, dtype=np.int64)  # Ring index of the head
+        self.length = np.zeros(n, dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.grow_pending = np.zeros(n, dtype=bool)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.bonus = np.full(n, -1, dtype=np.int64)  # Top-left cell, -1 if inactive
+        self.bonus_spawn = np.zeros(n, dtype=np.int64)  # Game clock (ms) at spawn
+        self.food_count = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.speed = np.zeros(n, dtype=np.int64)
+        self.clock = np.zeros(n, dtype=np.int64)  # Game time in ms
+        self.tick = np.zeros(n, dtype=np.int64)
+
+        self.final_scores = np.zeros(n, dtype=np.int64)  # Score of games ended last step
+        self.games_finished = 0
+        self.reset(np.arange(n))
+
+    def reset(self, games=None):
+        """Start new games for the given indexes (all games if None)."""
+        games = np.arange(self.num_games) if games is None else np.asarray(games)
+        if games.size == 0:
+            return
+
+        w = self.board_width
+        cx, cy = w // 2, self.board_height // 2
+        start = np.array([cy * w + cx - 2, cy * w + cx - 1, cy * w + cx])  # Tail .. head
+
+        self.grid[games] = False
+        self.grid[games[:, None], start[None, :]] = True
+        self.bodies[games, :3] = start
+        self.head_ptr[games] = 2
+        self.length[games] = 3
+        self.head[games] = start[-1]
+        self.direction[games] = RIGHT_ACTION
+        self.grow_pending[games] = False
+        self.bonus[games] = -1
+        self.bonus_spawn[games] = 0
+        self.food_count[games] = 0
+        self.score[games] = 0
+        self.speed[games] = INITIAL_SPEED
+        self.clock[games] = 0
+        self.tick[games] = 0
+        self.food[games] = self._sample_food(games)
+
+    def step(self, actions=None):
+        """Advance every game by one tick.
+
+        actions is an array of action indexes into ACTIONS (-1 keeps the
+        current direction). Returns (state, rewards, dones); games that
+        finished are reset before returning and their final score is left
+        in final_scores.
+        """
+        n = self.num_games
+        games = np.arange(n)
+        w, h = self.board_width, self.board_height
+
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int64)
+            turn = (actions >= 0) & (actions != OPPOSITE_ACTION[self.direction])
+            self.direction = np.where(turn, actions, self.direction)
+
+        self.tick += 1
+        self.clock += self.speed
+        score_before = self.score.copy()
+
+        # Move with wall wrapping
+        new_x = (self.head % w + ACTION_DX[self.direction]) % w
+        new_y = (self.head // w + ACTION_DY[self.direction]) % h
+        new_head = new_y * w + new_x
+
+        # Drop tails first so the head may follow into the cell just vacated
+        cap = self.cells
+        shrink = ~self.grow_pending
+        tail = self.bodies[games, (self.head_ptr - self.length + 1) % cap]
+        self.grid[games[shrink], tail[shrink]] = False
+        self.length -= shrink
+        self.grow_pending[:] = False
+
+        dead = self.grid[games, new_head]
+
+        self.head_ptr = (self.head_ptr + 1) % cap
+        self.bodies[games, self.head_ptr] = new_head
+        self.grid[games, new_head] = True
+        self.length += 1
+        self.head = new_head
+        alive = ~dead
+
+        # Bonus expiry and collision
+        bonus_active = self.bonus >= 0
+        elapsed = self.clock - self.bonus_spawn
+        expired = bonus_active & (elapsed > BONUS_FOOD_DURATION * 1000)
+        self.bonus[expired] = -1
+        bonus_active &= ~expired
+
+        size = BONUS_FOOD_SIZE
+        bx, by = self.bonus % w, self.bonus // w
+        ate_bonus = (alive & bonus_active
+                     & (new_x >= bx) & (new_x < bx + size)
+                     & (new_y >= by) & (new_y < by + size))
+        seconds = self.clock / 1000 - self.bonus_spawn / 1000
+        ratio = np.clip(1 - seconds / BONUS_FOOD_DURATION, 0, 1)
+        bonus_score = BONUS_MIN_SCORE + (BONUS_MAX_SCORE - BONUS_MIN_SCORE) * ratio
+        bonus_score = bonus_score.astype(np.int64)
+        self.score += np.where(ate_bonus, bonus_score, 0)
+        self.grow_pending |= ate_bonus
+        self.bonus[ate_bonus] = -1
+
+        # Regular food
+        ate = alive & (new_head == self.food)
+        self.grow_pending |= ate
+        self.score += 10 * ate
+        self.food_count += ate
+
+        spawn_bonus = ate & (self.food_count % BONUS_FOOD_INTERVAL == 0) & (self.bonus < 0)
+        spawning = games[spawn_bonus]
+        if spawning.size:
+            self.bonus[spawning] = self._sample_bonus(spawning)
+            self.bonus_spawn[spawning] = self.clock[spawning]
+
+        eaters = games[ate]
+        won = np.zeros(n, dtype=bool)
+        if eaters.size:
+            self.food[eaters] = self._sample_food(eaters)
+            self.speed[eaters] = np.maximum(
+                MIN_SPEED, INITIAL_SPEED - (self.score[eaters] // 50) * SPEED_INCREMENT)
+            won[eaters] = self.food[eaters] < 0
+            self.score += 100 * won
+
+        rewards = self.score - score_before
+        dones = dead | won
+        finished = games[dones]
+        self.final_scores[:] = 0
+        if finished.size:
+            self.final_scores[finished] = self.score[finished]
+            self.games_finished += finished.size
+            self.reset(finished)
+
+        return self, rewards, dones
+
+    def _bonus_mask(self, games, cells):
+        """True where cells[i] lies inside game i's active bonus block."""
+        w = self.board_width
+        bonus = self.bonus[games][:, None]
+        bx, by = bonus % w, bonus // w
+        x, y = cells % w, cells // w
+        size = BONUS_FOOD_SIZE
+        return (bonus >= 0) & (x >= bx) & (x < bx + size) & (y >= by) & (y < by + size)
+
+    def _sample_food(self, games):
+        """Pick a random free cell outside the bonus block for each game, -1 if full."""
+        result = np.full(games.size, -1, dtype=np.int64)
+        pending = np.arange(games.size)
+
+        for _ in range(SPAWN_TRIES):
+            if pending.size == 0:
+                return result
+            candidates = self.rng.integers(0, self.cells, size=(pending.size, 1))
+            rows = games[pending]
+            ok = ~self.grid[rows, candidates[:, 0]] & ~self._bonus_mask(rows, candidates)[:, 0]
+            result[pending[ok]] = candidates[ok, 0]
+            pending = pending[~ok]
+
+        # Crowded boards: choose exactly among the remaining free cells
+        all_cells = np.arange(self.cells)
+        for i in pending:
+            game = games[i]
+            free = ~self.grid[game] & ~self._bonus_mask(games[i:i + 1], all_cells[None, :])[0]
+            choices = np.flatnonzero(free)
+            if choices.size:
+                result[i] = choices[self.rng.integers(choices.size)]
+        return result
+
+    def _sample_bonus(self, games):
+        """Pick a random fully free bonus block for each game, -1 if none fits."""
+        w, h = self.board_width, self.board_height
+        size = BONUS_FOOD_SIZE
+        offsets = np.array([dy * w + dx for dy in range(size) for dx in range(size)])
+        result = np.full(games.size, -1, dtype=np.int64)
+        pending = np.arange(games.size)
+
+        for _ in range(SPAWN_TRIES):
+            if pending.size == 0:
+                return result
+            x = self.rng.integers(0, w - size + 1, size=pending.size)
+            y = self.rng.integers(0, h - size + 1, size=pending.size)
+            corners = y * w + x
+            rows = games[pending]
+            ok = ~self.grid[rows[:, None], corners[:, None] + offsets[None, :]].any(axis=1)
+            result[pending[ok]] = corners[ok]
+            pending = pending[~ok]
+
+        # Crowded boards: summed-area table over the occupancy grid
+        for i in pending:
+            grid = self.grid[games[i]].reshape(h, w).astype(np.int32)
+            table = np.zeros((h + 1, w + 1), dtype=np.int32)
+            table[1:, 1:] = grid.cumsum(axis=0).cumsum(axis=1)
+            blocks = (table[size:, size:] - table[:-size, size:]
+                      - table[size:, :-size] + table[:-size, :-size])
+            choices = np.flatnonzero(blocks == 0)
+            if choices.size:
+                pick = choices[self.rng.integers(choices.size)]
+                result[i] = (pick // (w - size + 1)) * w + pick % (w - size + 1)
+        return result
@@ -0,0 +1,5 @@
+"""
+Benchmarks for the engine and rendering hot paths.
+
+Run from the repository root with `python -m bench`; see `python -m bench --help`.
+"""
@@ -0,0 +1,119 @@
+"""
+Scaling benchmark for the engine and rendering hot paths.
+
+    python -m bench                          # full run, text table
+    python -m bench --quick                  # boards up to 100x100
+    python -m bench --json out.json          # also save machine-readable results
+    python -m bench --compare baseline.json  # flag regressions, exit 1 if any
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from bench.cases import run_board
+
+SIZES = (10, 50, 100, 200, 500, 1000)
+QUICK_SIZES = (10, 50, 100)
+LENGTH_FRACTIONS = (0.25, 0.5, 0.9)  # Plus the starting length of 3
+
+
+def lengths_for(size):
+    return [3] + [max(4, int(size * size * f)) for f in LENGTH_FRACTIONS]
+
+
+def length_label(result):
+    if result['length'] == 3:
+        return '3'
+    return f"{result['length'] / (result['width'] * result['height']):.0%}"
+
+
+def format_ns(ns):
+    if ns >= 1e9:
+        return f"{ns / 1e9:.2f}s"
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f}us"
+    return f"{ns:.0f}ns"
+
+
+def format_table(results):
+    """One row per (case, length), one column per board size."""
+    sizes = sorted({r['width'] for r in results})
+    rows = {}
+    for r in results:
+        rows.setdefault((r['case'], length_label(r)), {})[r['width']] = r
+
+    header = f"{'case':<28}{'length':>7}" + ''.join(f"{f'{s}x{s}':>12}" for s in sizes)
+    lines = [header, '-' * len(header)]
+    for (case, label), by_size in rows.items():
+        cells = []
+        for s in sizes:
+            r = by_size.get(s)
+            cells.append(f"{format_ns(r['ns']) if r else '-':>12}")
+        lines.append(f"{case:<28}{label:>7}" + ''.join(cells))
+    return '\n'.join(lines)
+
+
+def compare(results, baseline, threshold):
+    """Return (result, baseline_result) pairs that got slower than threshold allows."""
+    def key(r):
+        return (r['case'], r['width'], r['height'], r['length'])
+
+    previous = {key(r): r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        old = previous.get(key(r))
+        if old and old['ns'] > 0 and r['ns'] > old['ns'] * threshold:
+            regressions.append((r, old))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help='Only boards up to 100x100')
+    parser.add_argument('--sizes', type=int, nargs='+', help='Square board sizes to run')
+    parser.add_argument('--json', metavar='PATH', help='Write results as JSON to PATH')
+    parser.add_argument('--compare', metavar='PATH', help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown factor counted as a regression (default: 1.25)')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    results = []
+    for size in sizes:
+        for length in lengths_for(size):
+            print(f"  {size}x{size}, length {length}...", file=sys.stderr, flush=True)
+            results.extend(run_board(size, size, length))
+
+    print(format_table(results))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold}x baseline:")
+            for r, old in regressions:
+                print(f"  {r['case']} {r['width']}x{r['height']} length {r['length']}: "
+                      f"{format_ns(old['ns'])} -> {format_ns(r['ns'])}")
+            return 1
+        print(f"\nNo regressions over {args.threshold}x baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Benchmark cases for the hot paths, parameterized by board size and snake length."""
+
+import statistics
+import time
+
+from board import Board
+from config import DOWN, LEFT, RIGHT
+from engine import Engine
+from gamestate import GameState
+from snake import Snake
+from ui import UI
+
+from bench.fakes import FakeScreen, fake_terminal, reset_screen_counts, screen_calls
+
+UPDATE_TICKS = 200  # Ticks sampled per board for Engine.update and UI.render
+
+
+def make_snake(board_width, board_height, length):
+    """Grow a snake of `length` cells along a serpentine path from the top-left."""
+    snake = Snake(2, 0, board_width, board_height)
+    row_direction = RIGHT
+    while len(snake.body) < length:
+        x, _ = snake.head
+        if snake.direction == DOWN:
+            snake.change_direction(row_direction)
+        elif (row_direction == RIGHT and x == board_width - 1) or (row_direction == LEFT and x == 0):
+            snake.change_direction(DOWN)
+            row_direction = LEFT if row_direction == RIGHT else RIGHT
+        snake.grow()
+        snake.move(board_width, board_height)
+    return snake
+
+
+def make_engine(board_width, board_height, length, seed=0):
+    """Build an Engine whose snake already has `length` cells."""
+    engine = Engine(board_width, board_height, seed=seed)
+    engine.snake = make_snake(board_width, board_height, length)
+    engine.board = Board(board_width, board_height, block_sizes=(engine.bonus_food.size,))
+    for cell in engine.snake.body:
+        engine.board.occupy(cell)
+    engine.food.spawn(engine.snake.body, board_width, board_height,
+                      free_cells=engine.board.free_cells, rng=engine.rng)
+    return engine
+
+
+def time_op(fn, min_time=0.02, repeat=3):
+    """Best-of-`repeat` nanoseconds per call of fn, looping until min_time elapses."""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 or number >= 1 << 20:
+            break
+        number *= 2
+
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def run_board(board_width, board_height, length):
+    """Run every case on one board size and snake length; return result dicts."""
+    results = []
+
+    def add(case, ns, **extra):
+        results.append(dict(case=case, width=board_width, height=board_height,
+                            length=length, ns=round(ns, 1), **extra))
+
+    engine = make_engine(board_width, board_height, length)
+    snake = engine.snake
+
+    add('snake.check_self_collision', time_op(snake.check_self_collision))
+
+    def spawn_food():
+        engine.food.spawn(snake.body, board_width, board_height,
+                          free_cells=engine.board.free_cells, rng=engine.rng)
+    add('food.spawn', time_op(spawn_food))
+
+    blocks = engine.board.free_blocks[engine.bonus_food.size]
+
+    def spawn_bonus():
+        engine.bonus_food.spawn(snake.body, board_width, board_height, engine.food.position,
+                                free_blocks=blocks, rng=engine.rng, now=engine.now)
+    add('bonus_food.spawn', time_op(spawn_bonus))
+    engine.bonus_food.despawn()
+
+    # What a lookahead search pays per node: clone the position, step the clone
+    state = GameState.from_engine(engine)
+    add('gamestate.clone+step', time_op(lambda: state.clone().step()))
+
+    # Engine.update and UI.render, sampled tick by tick until the snake dies
+    screen = FakeScreen()
+    with fake_terminal():
+        ui = UI(screen, board_width, board_height)
+        start = time.perf_counter_ns()
+        ui.render(engine.snake, engine.food, engine.score, engine.bonus_food, now=engine.now)
+        add('ui.render (first frame)', time.perf_counter_ns() - start, calls=screen_calls(ui))
+
+        # The same frames on an 80x24 terminal, drawn through the scrolling viewport
+        small_screen = FakeScreen(24, 80)
+        small_ui = UI(small_screen, board_width, board_height)
+        small_ui.render(engine.snake, engine.food, engine.score, engine.bonus_food,
+                        now=engine.now)
+
+        update_ns, render_ns, calls, viewport_ns = [], [], [], []
+        engine.snake.change_direction(DOWN)
+        for _ in range(UPDATE_TICKS):
+            start = time.perf_counter_ns()
+            engine.update()
+            update_ns.append(time.perf_counter_ns() - start)
+            if engine.game_over:
+                break
+            reset_screen_counts(ui)
+            start = time.perf_counter_ns()
+            ui.render(engine.snake, engine.food, engine.score, engine.bonus_food, now=engine.now)
+            render_ns.append(time.perf_counter_ns() - start)
+            calls.append(screen_calls(ui))
+            start = time.perf_counter_ns()
+            small_ui.render(engine.snake, engine.food, engine.score, engine.bonus_food,
+                            now=engine.now)
+            viewport_ns.append(time.perf_counter_ns() - start)
+
+    add('engine.update', statistics.median(update_ns))
+    if render_ns:
+        add('ui.render', statistics.median(render_ns), calls=statistics.median(calls))
+        add('ui.render 80x24 (max)', max(viewport_ns))
+
+    # Snake.move last: it runs the snake into itself and leaves it inconsistent
+    def move():
+        snake.move(board_width, board_height)
+    add('snake.move', time_op(move))
+
+    return results
@@ -0,0 +1,65 @@
+"""
+Sample-collection throughput of the RL environments (needs NumPy).
+
+Steps SyncVectorEnv and AsyncVectorEnv with random actions and reports
+environment steps per second, so the in-place observations and the
+worker processes can be compared across board sizes and core counts.
+
+    python -m bench.env_throughput [--envs 64] [--seconds 3] [--board WxH ...]
+                                   [--crop R] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from env import SyncVectorEnv, AsyncVectorEnv
+
+
+def _measure(venv, num_envs, seconds):
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, venv.num_actions, (256, num_envs))
+    venv.reset(seed=0)
+    steps = episodes = 0
+    began = time.perf_counter()
+    while time.perf_counter() - began < seconds:
+        _, _, _, _, info = venv.step(actions[steps % len(actions)])
+        episodes += int((info['final_score'] >= 0).sum())
+        steps += 1
+    elapsed = time.perf_counter() - began
+    return steps * num_envs / elapsed, episodes
+
+
+def main(argv=None):
+    from main import parse_board
+
+    parser = argparse.ArgumentParser(prog='python -m bench.env_throughput')
+    parser.add_argument('--envs', type=int, default=64, help='Environments per vector env')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Time per measurement')
+    parser.add_argument('--board', action='append', type=parse_board,
+                        help='Board size as WxH (repeatable, default: 20x20 and 100x100)')
+    parser.add_argument('--crop', type=int, default=5, help='Egocentric crop radius')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Async worker processes (default: CPU count, {os.cpu_count()})')
+    args = parser.parse_args(argv)
+
+    print(f"{'board':>10} {'mode':>6} {'steps/s':>12} {'episodes':>9}")
+    for width, height in args.board or [(20, 20), (100, 100)]:
+        for mode in ('sync', 'async'):
+            if mode == 'sync':
+                venv = SyncVectorEnv(args.envs, width, height, crop_radius=args.crop)
+            else:
+                venv = AsyncVectorEnv(args.envs, width, height, crop_radius=args.crop,
+                                      workers=args.workers)
+            with venv:
+                rate, episodes = _measure(venv, args.envs, args.seconds)
+            board = f'{width}x{height}'
+            print(f"{board:>10} {mode:>6} {rate:12,.0f} {episodes:9}", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Stand-ins for a curses screen, so UI can be benchmarked without a terminal."""
+
+import curses
+from contextlib import contextmanager
+
+
+class FakeScreen:
+    """Minimal stdscr replacement that counts drawing calls and characters."""
+
+    def __init__(self, rows=10_000, cols=10_000):
+        self.rows = rows
+        self.cols = cols
+        self.calls = 0
+        self.chars = 0
+        self.keys = []
+
+    def reset_counts(self):
+        self.calls = 0
+        self.chars = 0
+
+    def getmaxyx(self):
+        return (self.rows, self.cols)
+
+    def addch(self, y, x, ch, attr=0):
+        self.calls += 1
+        self.chars += 1
+
+    def addstr(self, y, x, text, attr=0):
+        self.calls += 1
+        self.chars += len(text)
+
+    def getch(self):
+        return self.keys.pop(0) if self.keys else -1
+
+    def clear(self):
+        self.calls += 1
+
+    def refresh(self):
+        self.calls += 1
+
+    def noutrefresh(self, *args):
+        self.calls += 1
+
+    def nodelay(self, flag):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+
+@contextmanager
+def fake_terminal():
+    """Patch the curses module-level calls UI makes outside of stdscr."""
+    saved = curses.curs_set, curses.has_colors, curses.newpad, curses.doupdate
+    curses.curs_set = lambda visibility: None
+    curses.has_colors = lambda: False
+    curses.newpad = FakeScreen
+    curses.doupdate = lambda: None
+    try:
+        yield
+    finally:
+        curses.curs_set, curses.has_colors, curses.newpad, curses.doupdate = saved
+
+
+def screen_calls(ui):
+    """Drawing calls a UI made on its screen and all of its layers."""
+    return ui.stdscr.calls + sum(layer.pad.calls for layer in ui.layers)
+
+
+def reset_screen_counts(ui):
+    ui.stdscr.reset_counts()
+    for layer in ui.layers:
+        layer.pad.reset_counts()
@@ -0,0 +1,98 @@
+"""
+Load test for the shared leaderboard.
+
+Starts the leaderboard service on a scratch database, then has several
+local processes submit scores through leaderboard.save_score as fast as
+they can, and checks that every submission was stored.
+
+    python -m bench.leaderboard_load [--processes 8] [--scores 2000] [--direct]
+
+--direct skips the service so processes write the database concurrently.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+
+def _configure(directory, use_service):
+    import leaderboard
+    leaderboard.SCORES_DB = os.path.join(directory, 'scores.db')
+    leaderboard.SCORES_FILE = os.path.join(directory, 'scores.json')
+    leaderboard.SOCKET_PATH = os.path.join(directory, 'leaderboard.sock' if use_service else 'none')
+    return leaderboard
+
+
+def _serve(directory, ready):
+    import asyncio
+    from leaderboard_service import LeaderboardService
+
+    leaderboard = _configure(directory, True)
+    service = LeaderboardService(leaderboard.SOCKET_PATH)
+
+    async def main():
+        task = asyncio.create_task(service.serve())
+        while not os.path.exists(service.socket_path):
+            await asyncio.sleep(0.01)
+        ready.set()
+        await task
+
+    asyncio.run(main())
+
+
+def _submit(directory, use_service, worker, count, start):
+    leaderboard = _configure(directory, use_service)
+    start.wait()
+    for i in range(count):
+        leaderboard.save_score(f'w{worker}', worker * count + i)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.leaderboard_load')
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--scores', type=int, default=2000, help='Submissions per process')
+    parser.add_argument('--direct', action='store_true', help='Write without the service')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        _configure(directory, False).get_top_scores()  # Create the schema up front
+
+        server = None
+        if not args.direct:
+            ready = multiprocessing.Event()
+            server = multiprocessing.Process(target=_serve, args=(directory, ready), daemon=True)
+            server.start()
+            ready.wait(10)
+
+        start = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(target=_submit,
+                                    args=(directory, not args.direct, w, args.scores, start))
+            for w in range(args.processes)
+        ]
+        for p in workers:
+            p.start()
+        began = time.perf_counter()
+        start.set()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - began
+
+        if server:
+            server.terminate()
+            server.join()
+
+        stored = len(_configure(directory, False).load_scores())
+        expected = args.processes * args.scores
+        mode = 'direct' if args.direct else 'service'
+        print(f"{mode}: {expected} submissions from {args.processes} processes "
+              f"in {elapsed:.2f}s ({expected / elapsed:,.0f}/s)")
+        print(f"stored {stored}/{expected}" + ('' if stored == expected else '  LOST SCORES'))
+        return 0 if stored == expected else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
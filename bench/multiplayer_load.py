@@ -0,0 +1,103 @@
+"""
+Load test for the multiplayer server.
+
+Runs a MatchServer and many simulated clients in one process over local
+TCP. Each client mirrors its match with ClientState, turns at random and
+rejoins as soon as its match ends, so the server stays at full load.
+
+    python -m bench.multiplayer_load [--matches 200] [--players 4] [--seconds 10]
+                                     [--board WxH ...] [--tick-ms 100]
+
+Reports the server's time per match tick (stepping plus broadcast) and
+bytes per tick for each board size; both should stay flat as boards grow.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from config import UP, DOWN, LEFT, RIGHT
+from multiplayer import (
+    MatchServer, ClientState, connect, read_frame, send_turn, END, WELCOME_FRAME
+)
+
+TURN_CHANCE = 0.1  # Per tick, for each simulated client
+
+
+async def _client(port, name, stop_at):
+    """Play matches back to back until stop_at; returns the number of ticks seen."""
+    rng = random.Random(name)
+    ticks = 0
+    while time.perf_counter() < stop_at:
+        reader, writer = await connect('127.0.0.1', port, name)
+        try:
+            _, player_id, width, height, _ = WELCOME_FRAME.unpack(await read_frame(reader))
+            state = ClientState(player_id, width, height)
+            while True:
+                payload = await read_frame(reader)
+                if payload[0] == END:
+                    break
+                state.apply(payload)
+                ticks += 1
+                if rng.random() < TURN_CHANCE:
+                    send_turn(writer, rng.choice((UP, DOWN, LEFT, RIGHT)))
+                if time.perf_counter() >= stop_at:
+                    return ticks
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    return ticks
+
+
+async def _run(board, args):
+    width, height = board
+    server = MatchServer(args.players, width, height, args.tick_ms)
+    port = await server.start()
+    stop_at = time.perf_counter() + args.seconds
+    clients = [_client(port, f'bot{i}', stop_at) for i in range(args.matches * args.players)]
+
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while time.perf_counter() < stop_at:
+            peak = max(peak, len(server.matches))
+            await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    client_ticks, _ = await asyncio.gather(asyncio.gather(*clients), watch())
+    elapsed = time.perf_counter() - start
+    server.server.close()
+
+    ticks = max(server.ticks, 1)
+    expected = peak * elapsed * 1000 / args.tick_ms
+    print(f"{width}x{height}: {server.ticks} match ticks in {elapsed:.1f}s, "
+          f"peak {peak} concurrent matches")
+    print(f"  server {server.tick_seconds / ticks * 1e6:.1f}us/tick, "
+          f"{server.bytes_sent / ticks:.0f} bytes/tick, "
+          f"{sum(client_ticks):,} client ticks applied, "
+          f"tick rate {server.ticks / max(expected, 1):.0%} of target")
+
+
+def main(argv=None):
+    from main import parse_board
+
+    parser = argparse.ArgumentParser(prog='python -m bench.multiplayer_load')
+    parser.add_argument('--matches', type=int, default=200, help='Concurrent matches')
+    parser.add_argument('--players', type=int, default=4, help='Players per match')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--board', action='append', type=parse_board,
+                        help='Board size as WxH (repeatable, default: 40x20 and 1000x1000)')
+    parser.add_argument('--tick-ms', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    for board in args.board or [(40, 20), (1000, 1000)]:
+        asyncio.run(_run(board, args))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Throughput test for the shared memory board export.
+
+The main process plays greedy games back to back as fast as it can,
+publishing every tick through shared_board.BoardPublisher, while reader
+processes attach with BoardReader and take snapshots in a tight loop. Every
+snapshot is checked for consistency (the head is on the body, the food is
+not); --full also walks the whole body and matches it against the
+occupancy bitmap, which catches any torn read.
+
+    python -m bench.shm_throughput [--readers 2] [--seconds 5] [--board WxH ...] [--full]
+
+Reports the publisher's tick rate and cost per publish, and each reader's
+snapshot rate, the share of reads retried by the seqlock and the number of
+inconsistent snapshots, which must be 0.
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+from engine import Engine
+from policies import greedy_policy
+from shared_board import BoardPublisher, BoardReader
+
+
+def _consistent(reader, snapshot):
+    if snapshot.length == 0:
+        return False
+    x, y = reader.unpack(reader.ring[snapshot.head_index % reader.capacity])
+    if not reader.occupied(x, y):
+        return False
+    return snapshot.food < 0 or not reader.occupied(*reader.unpack(snapshot.food))
+
+
+def _fully_consistent(reader, snapshot):
+    if not _consistent(reader, snapshot):
+        return False
+    body = reader.body(snapshot)
+    if not all(reader.occupied(x, y) for x, y in body):
+        return False
+    return int.from_bytes(reader.occupancy, 'little').bit_count() == len(set(body))
+
+
+def _read(name, full, start, stop_at, results):
+    reader = BoardReader(name)
+    check = _fully_consistent if full else _consistent
+    reads = bad = ticks = 0
+    last_seq = None
+    start.wait()
+    while time.perf_counter() < stop_at.value:
+        snapshot, ok = reader.read(check)
+        reads += 1
+        bad += not ok
+        if snapshot.seq != last_seq:
+            ticks += 1
+            last_seq = snapshot.seq
+    results.put((reads, reader.retries, bad, ticks))
+    reader.close()
+
+
+def _run(board, args):
+    width, height = board
+    publisher = BoardPublisher(width, height)
+    engine = Engine(width, height, seed=0)
+    publisher.publish(engine)
+
+    start = multiprocessing.Event()
+    stop_at = multiprocessing.Value('d', 0.0)
+    results = multiprocessing.Queue()
+    readers = [
+        multiprocessing.Process(target=_read,
+                                args=(publisher.name, args.full, start, stop_at, results))
+        for _ in range(args.readers)
+    ]
+    for p in readers:
+        p.start()
+
+    began = time.perf_counter()
+    stop_at.value = began + args.seconds
+    start.set()
+    ticks = games = 0
+    publish_ns = 0
+    while time.perf_counter() < stop_at.value:
+        engine.step(greedy_policy(engine))
+        t0 = time.perf_counter_ns()
+        publisher.publish(engine)
+        publish_ns += time.perf_counter_ns() - t0
+        ticks += 1
+        if engine.game_over:
+            games += 1
+            engine.reset(games)
+            publisher.publish(engine)
+    elapsed = time.perf_counter() - began
+
+    stats = [results.get() for _ in readers]
+    for p in readers:
+        p.join()
+    publisher.close()
+
+    print(f"{width}x{height}: published {ticks:,} ticks ({games} games) "
+          f"at {ticks / elapsed:,.0f}/s, {publish_ns / max(ticks, 1) / 1000:.2f} us per publish")
+    bad_total = 0
+    for i, (reads, retries, bad, seen) in enumerate(stats):
+        bad_total += bad
+        print(f"  reader {i}: {reads / elapsed:,.0f} snapshots/s, "
+              f"{retries / max(reads + retries, 1):.2%} retried, "
+              f"saw {seen / max(ticks, 1):.0%} of ticks, {bad} inconsistent")
+    return bad_total
+
+
+def main(argv=None):
+    from main import parse_board
+
+    parser = argparse.ArgumentParser(prog='python -m bench.shm_throughput')
+    parser.add_argument('--readers', type=int, default=2, help='Reader processes')
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--board', action='append', type=parse_board,
+                        help='Board size as WxH (repeatable, default: 40x20 and 1000x1000)')
+    parser.add_argument('--full', action='store_true',
+                        help='Check every snapshot against the whole body and bitmap')
+    args = parser.parse_args(argv)
+
+    bad = sum(_run(board, args) for board in args.board or [(40, 20), (1000, 1000)])
+    return 1 if bad else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Startup-time benchmark for the CLI entry points.
+
+Runs each entry point in a fresh interpreter under `python -X importtime`
+and reports the median wall time, the median total import time and the
+slowest top-level imports, so a heavy module (curses, sqlite3, numpy)
+creeping onto a headless path shows up. Scores and replays come from a
+scratch directory, never the real leaderboard.
+
+    python -m bench.startup [--runs 20] [--top 3]
+
+Stale bytecode caches inflate import times when they cannot be rewritten
+(PYTHONDONTWRITEBYTECODE); run `python -m compileall -q .` first.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def entry_points(replay_path):
+    """(label, argv after the interpreter) for every entry point measured."""
+    main = os.path.join(ROOT, 'main.py')
+    return [
+        ('python (empty)', ['-c', 'pass']),
+        ('main.py --help', [main, '--help']),
+        ('main.py scores', [main, 'scores']),
+        ('main.py replay --headless', [main, 'replay', '--headless', replay_path]),
+        ('main.py tournament --help', [main, 'tournament', '--help']),
+        ('import engine', ['-c', 'import engine']),
+        ('import game (curses UI)', ['-c', 'import game']),
+    ]
+
+
+def record_replay(path):
+    """Record a short game to replay from the command line."""
+    sys.path.insert(0, ROOT)
+    from engine import Engine
+    from policies import greedy_policy
+    from replay import Recorder
+
+    engine = Engine(20, 20, seed=1)
+    recorder = Recorder(engine)
+    done = False
+    while not done and engine.tick < 2000:
+        _, _, done = engine.step(greedy_policy(engine))
+        recorder.record(engine)
+    recorder.finish(engine)
+    recorder.save(path)
+
+
+def parse_importtime(stderr):
+    """Return (total import microseconds, [(cumulative us, module)]) for top-level imports."""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):  # Nested imports are indented past one space
+            top_level.append((int(cumulative), name.strip()))
+    return sum(us for us, _ in top_level), top_level
+
+
+def measure(argv, env, runs):
+    walls, imports = [], []
+    top_level = []
+    for _ in range(runs + 1):  # The first run warms the OS file cache
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime', *argv], cwd=ROOT, env=env,
+                                capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(argv)} failed:\n{result.stderr[-2000:]}")
+        total, top_level = parse_importtime(result.stderr)
+        imports.append(total)
+    return statistics.median(walls[1:]), statistics.median(imports[1:]), top_level
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench.startup')
+    parser.add_argument('--runs', type=int, default=20, help='Runs per entry point')
+    parser.add_argument('--top', type=int, default=3, help='Slowest top-level imports to list')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        replay_path = os.path.join(directory, 'game.snkr')
+        record_replay(replay_path)
+        env = dict(os.environ,
+                   SNAKE_SCORES_DB=os.path.join(directory, 'scores.db'),
+                   SNAKE_LEADERBOARD_SOCKET=os.path.join(directory, 'none.sock'))
+
+        print(f"{'entry point':28} {'wall':>9} {'imports':>9}  slowest imports")
+        for label, entry_argv in entry_points(replay_path):
+            wall, imports, top_level = measure(entry_argv, env, args.runs)
+            slowest = sorted(top_level, reverse=True)[:args.top]
+            names = ', '.join(f"{name} {us / 1000:.1f}ms" for us, name in slowest)
+            print(f"{label:28} {wall * 1000:7.1f}ms {imports / 1000:7.1f}ms  {names}", flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+import random
+
+SPARSE_CELLS = 1_000_000  # Boards with more cells than this use the sparse indexes
+SAMPLE_TRIES = 64  # Random probes before a sparse index falls back to scanning
+
+
+class IndexedSet:
+    """Set of hashable items supporting O(1) add, discard and random choice.
+
+    Items live in a flat list; a position map gives each item's index so an
+    item can be removed by swapping it with the last entry.
+    """
+
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._index = {item: i for i, item in enumerate(self._items)}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._index
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def add(self, item):
+        """Add an item (no-op if already present)."""
+        if item in self._index:
+            return
+        self._index[item] = len(self._items)
+        self._items.append(item)
+
+    def discard(self, item):
+        """Remove an item (no-op if absent)."""
+        i = self._index.pop(item, None)
+        if i is None:
+            return
+        last = self._items.pop()
+        if i < len(self._items):
+            self._items[i] = last
+            self._index[last] = i
+
+    def choice(self, excluded=(), rng=random):
+        """Pick a uniformly random item not in excluded, or None if there is none."""
+        excluded = {item for item in excluded if item in self._index}
+        if len(self._items) <= len(excluded):
+            return None
+
+        while True:
+            item = self._items[rng.randrange(len(self._items))]
+            if item not in excluded:
+                return item
+
+
+class FreeCells(IndexedSet):
+    """Index of the board cells not covered by the snake."""
+
+    def __init__(self, board_width, board_height):
+        super().__init__((x, y) for y in range(board_height) for x in range(board_width))
+        self.board_width = board_width
+        self.board_height = board_height
+
+    def occupy(self, cell):
+        """Mark a cell as taken (no-op if it is already taken)."""
+        self.discard(cell)
+
+    def release(self, cell):
+        """Mark a cell as free again (no-op if it is already free)."""
+        self.add(cell)
+
+
+class FreeBlocks:
+    """Index of the size x size blocks that contain no taken cell.
+
+    Each block is keyed by its top-left cell and keeps a count of taken
+    cells inside it, so taking or freeing a cell only touches the size**2
+    blocks that cover it. Blocks do not wrap around the board edges.
+    """
+
+    def __init__(self, board_width, board_height, size=2):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.size = size
+        self._taken = set()
+        self._counts = {}
+        self._free = IndexedSet(
+            (x, y)
+            for y in range(board_height - size + 1)
+            for x in range(board_width - size + 1)
+        )
+
+    def __len__(self):
+        return len(self._free)
+
+    def __contains__(self, block):
+        return block in self._free
+
+    def _covering_blocks(self, cell):
+        """Yield the top-left corners of every block containing cell."""
+        x, y = cell
+        size = self.size
+        for by in range(max(0, y - size + 1), min(y, self.board_height - size) + 1):
+            for bx in range(max(0, x - size + 1), min(x, self.board_width - size) + 1):
+                yield (bx, by)
+
+    def occupy(self, cell):
+        """Mark a cell as taken (no-op if it is already taken)."""
+        if cell in self._taken:
+            return
+        self._taken.add(cell)
+        for block in self._covering_blocks(cell):
+            count = self._counts.get(block, 0)
+            if count == 0:
+                self._free.discard(block)
+            self._counts[block] = count + 1
+
+    def release(self, cell):
+        """Mark a cell as free again (no-op if it is already free)."""
+        if cell not in self._taken:
+            return
+        self._taken.discard(cell)
+        for block in self._covering_blocks(cell):
+            count = self._counts.pop(block) - 1
+            if count == 0:
+                self._free.add(block)
+            else:
+                self._counts[block] = count
+
+    def choice(self, excluded_cells=(), rng=random):
+        """Pick a random free block avoiding excluded cells, or None if there is none."""
+        excluded = set()
+        for cell in excluded_cells:
+            excluded.update(self._covering_blocks(cell))
+        return self._free.choice(excluded, rng)
+
+
+class SparseFreeCells:
+    """FreeCells for huge boards: stores only the taken cells.
+
+    Memory is proportional to the snake, not the board. Random choice
+    samples cells until it finds a free one, which is fast while the board
+    is mostly empty; it falls back to a full scan if sampling keeps failing.
+    """
+
+    def __init__(self, board_width, board_height):
+        self.board_width = board_width
+        self.board_height = board_height
+        self._taken = set()
+
+    def __len__(self):
+        return self.board_width * self.board_height - len(self._taken)
+
+    def __contains__(self, cell):
+        x, y = cell
+        return (0 <= x < self.board_width and 0 <= y < self.board_height
+                and cell not in self._taken)
+
+    def __iter__(self):
+        for y in range(self.board_height):
+            for x in range(self.board_width):
+                if (x, y) not in self._taken:
+                    yield (x, y)
+
+    def occupy(self, cell):
+        """Mark a cell as taken (no-op if it is already taken)."""
+        self._taken.add(cell)
+
+    def release(self, cell):
+        """Mark a cell as free again (no-op if it is already free)."""
+        self._taken.discard(cell)
+
+    def choice(self, excluded=(), rng=random):
+        """Pick a uniformly random free cell not in excluded, or None if there is none."""
+        excluded = set(excluded)
+        for _ in range(SAMPLE_TRIES):
+            cell = (rng.randrange(self.board_width), rng.randrange(self.board_height))
+            if cell not in self._taken and cell not in excluded:
+                return cell
+        free = [cell for cell in self if cell not in excluded]
+        return rng.choice(free) if free else None
+
+
+class SparseFreeBlocks:
+    """FreeBlocks for huge boards, sampling blocks against the taken cells."""
+
+    def __init__(self, board_width, board_height, size=2):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.size = size
+        self._taken = set()
+
+    def __contains__(self, block):
+        x, y = block
+        return (0 <= x <= self.board_width - self.size
+                and 0 <= y <= self.board_height - self.size
+                and not self._blocked(block, ()))
+
+    def _blocked(self, block, excluded):
+        x, y = block
+        for dy in range(self.size):
+            for dx in range(self.size):
+                cell = (x + dx, y + dy)
+                if cell in self._taken or cell in excluded:
+                    return True
+        return False
+
+    def occupy(self, cell):
+        """Mark a cell as taken (no-op if it is already taken)."""
+        self._taken.add(cell)
+
+    def release(self, cell):
+        """Mark a cell as free again (no-op if it is already free)."""
+        self._taken.discard(cell)
+
+    def choice(self, excluded_cells=(), rng=random):
+        """Pick a random free block avoiding excluded cells, or None if there is none."""
+        excluded = set(excluded_cells)
+        max_x = self.board_width - self.size
+        max_y = self.board_height - self.size
+        if max_x < 0 or max_y < 0:
+            return None
+        for _ in range(SAMPLE_TRIES):
+            block = (rng.randint(0, max_x), rng.randint(0, max_y))
+            if not self._blocked(block, excluded):
+                return block
+        free = [(x, y) for y in range(max_y + 1) for x in range(max_x + 1)
+                if not self._blocked((x, y), excluded)]
+        return rng.choice(free) if free else None
+
+
+class Board:
+    """Free-cell and free-block indexes kept in sync with the snake.
+
+    Boards larger than SPARSE_CELLS use the sparse indexes, whose memory
+    does not grow with the board; pass `sparse` to choose explicitly.
+    """
+
+    def __init__(self, board_width, board_height, block_sizes=(2,), sparse=None):
+        self.board_width = board_width
+        self.board_height = board_height
+        if sparse is None:
+            sparse = board_width * board_height > SPARSE_CELLS
+        self.sparse = sparse
+        cells, blocks = (SparseFreeCells, SparseFreeBlocks) if sparse else (FreeCells, FreeBlocks)
+        self.free_cells = cells(board_width, board_height)
+        self.free_blocks = {
+            size: blocks(board_width, board_height, size) for size in block_sizes
+        }
+
+    def occupy(self, cell):
+        """Mark a cell as covered by the snake."""
+        self.free_cells.occupy(cell)
+        for blocks in self.free_blocks.values():
+            blocks.occupy(cell)
+
+    def release(self, cell):
+        """Mark a cell as no longer covered by the snake."""
+        self.free_cells.release(cell)
+        for blocks in self.free_blocks.values():
+            blocks.release(cell)
@@ -16,6 +16,7 @@ BONUS_FOOD_CHAR = '$'
 
 # Bonus food settings
 BONUS_FOOD_INTERVAL = 4  # Spawn bonus after every N regular foods
+BONUS_FOOD_SIZE = 2  # Bonus food covers a SIZE x SIZE block
 BONUS_FOOD_DURATION = 10  # Seconds before bonus food disappears
 BONUS_MAX_SCORE = 100  # Maximum bonus score (if eaten immediately)
 BONUS_MIN_SCORE = 10  # Minimum bonus score (if eaten at last moment)
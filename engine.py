@@ -0,0 +1,156 @@
+import random
+from contextlib import nullcontext
+
+from config import (
+    BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED,
+    SPEED_INCREMENT, MIN_SPEED, BONUS_FOOD_INTERVAL
+)
+from snake import Snake
+from food import Food, BonusFood
+from board import Board
+from scheduler import Scheduler
+
+
+class Engine:
+    """Curses-free game rules, advanced one tick at a time.
+
+    Time is measured on a game clock that advances by the current speed
+    (ms per frame) every tick, so bonus expiry and scoring behave as in
+    real-time play but do not depend on wall-clock time. Given the same
+    seed and actions, a game always plays out the same way.
+
+    Timed rules run from `scheduler`, a heap of callbacks keyed by the game
+    clock, rather than being polled every tick.
+    """
+
+    def __init__(self, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT, seed=None):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.profiler = None  # Optional FrameProfiler timing spawns
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new game. A random seed is chosen if none is given."""
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._policy_rng = None
+        self.tick = 0
+        self.clock = 0  # Game time in ms
+        self.scheduler = Scheduler()
+        self._bonus_expiry = None  # Scheduler event despawning the bonus food
+
+        self.snake = Snake(self.board_width // 2, self.board_height // 2,
+                           self.board_width, self.board_height)
+        self.bonus_food = BonusFood()
+        self.board = Board(self.board_width, self.board_height,
+                           block_sizes=(self.bonus_food.size,))
+        for cell in self.snake.body:
+            self.board.occupy(cell)
+        self.food = Food()
+        self.food.spawn(self.snake.body, self.board_width, self.board_height,
+                        free_cells=self.board.free_cells, rng=self.rng)
+        self.food_count = 0  # Track regular foods eaten for bonus spawning
+        self.score = 0
+        self.game_over = False
+        self.won = False
+        self.speed = INITIAL_SPEED
+        return self
+
+    def _measure(self, name):
+        return self.profiler.measure(name) if self.profiler else nullcontext()
+
+    @property
+    def policy_rng(self):
+        """Random stream for policies, split from the seed apart from the food's."""
+        if self._policy_rng is None:
+            self._policy_rng = random.Random(f'{self.seed}/policy')
+        return self._policy_rng
+
+    @property
+    def now(self):
+        """Current game time in seconds."""
+        return self.clock / 1000
+
+    def step(self, action=None):
+        """Apply a direction (or None to keep going) and advance one tick.
+
+        Returns (state, reward, done), where state is the engine itself and
+        reward is the score gained this tick.
+        """
+        if action is not None:
+            self.snake.change_direction(action)
+        score = self.score
+        self.update()
+        return self, self.score - score, self.game_over
+
+    def update(self):
+        """Advance the game by one tick."""
+        if self.game_over:
+            return
+
+        self.tick += 1
+        self.clock += self.speed
+
+        # Move snake with wall wrapping
+        vacated = self.snake.move(self.board_width, self.board_height)
+
+        # Check self collision only (walls wrap around)
+        if self.snake.check_self_collision():
+            self.game_over = True
+            return
+
+        # Keep the free-cell indexes in sync with the snake
+        if vacated is not None:
+            self.board.release(vacated)
+        self.board.occupy(self.snake.head)
+
+        # Fire timers that are due (bonus food expiration)
+        self.scheduler.advance(self.clock)
+
+        # Check bonus food collision
+        if self.bonus_food.is_eaten(self.snake.head):
+            bonus_score = self.bonus_food.calculate_bonus_score(self.now)
+            self.score += bonus_score
+            self.snake.grow()
+            self.bonus_food.despawn()
+            self._bonus_expiry.cancel()
+
+        # Check regular food collision
+        if self.food.is_eaten(self.snake.head):
+            self.snake.grow()
+            self.score += 10
+            self.food_count += 1
+
+            # Spawn bonus food after every BONUS_FOOD_INTERVAL regular foods
+            if self.food_count % BONUS_FOOD_INTERVAL == 0 and not self.bonus_food.active:
+                with self._measure('bonus_spawn'):
+                    self.bonus_food.spawn(
+                        self.snake.body,
+                        self.board_width,
+                        self.board_height,
+                        self.food.position,
+                        free_blocks=self.board.free_blocks[self.bonus_food.size],
+                        rng=self.rng,
+                        now=self.now
+                    )
+                if self.bonus_food.active:
+                    self._bonus_expiry = self.scheduler.schedule(
+                        self.bonus_food.expiry_clock(self.clock), self.bonus_food.despawn
+                    )
+
+            # Spawn new regular food (exclude bonus food positions)
+            excluded = self.bonus_food.get_all_positions() if self.bonus_food.active else []
+            with self._measure('food_spawn'):
+                self.food.spawn(self.snake.body, self.board_width, self.board_height, excluded,
+                                free_cells=self.board.free_cells, rng=self.rng)
+
+            # Increase speed
+            self.speed = max(MIN_SPEED, INITIAL_SPEED - (self.score // 50) * SPEED_INCREMENT)
+
+            # Check win condition (filled the board)
+            if self.food.position is None:
+                self.score += 100  # Bonus for winning
+                self.game_over = True
+                self.won = True
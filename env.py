@@ -0,0 +1,353 @@
+"""
+Gym-style reinforcement learning environments over Engine.
+
+Requires NumPy (the rest of the game does not). The API follows Gymnasium
+without depending on it: reset() returns (observation, info) and step()
+returns (observation, reward, terminated, truncated, info). Rules and
+rewards are Engine's: 10 per food, the bonus food's time-based score and
+100 for filling the board.
+
+Observations are a dict of preallocated uint8 arrays that are updated in
+place, never rebuilt; copy them if you need to keep one past the next step:
+
+    grid   H x W x C, channels BODY (every segment), HEAD, FOOD, BONUS
+    crop   (2R+1) x (2R+1) x C window of the grid centered on the head,
+           wrapping around the board (only with crop_radius=R)
+
+SyncVectorEnv steps K environments in the calling process; AsyncVectorEnv
+spreads them over worker processes that write observations, rewards and
+flags straight into one shared memory segment, so a step costs the parent
+one small message per worker. Both reset finished environments
+automatically and report their final score in info['final_score'];
+a single SnakeEnv must be reset() by the caller once terminated.
+"""
+
+import os
+import random
+from multiprocessing import Pipe, Process, shared_memory
+
+import numpy as np
+
+from batch import ACTIONS
+from config import BOARD_WIDTH, BOARD_HEIGHT
+from engine import Engine
+from shared_board import attach
+
+CHANNELS = ('body', 'head', 'food', 'bonus')
+BODY, HEAD, FOOD, BONUS = range(len(CHANNELS))
+
+
+class SnakeEnv:
+    """One game as an environment; actions index ACTIONS (-1 or None keeps going).
+
+    max_steps truncates episodes. grid and crop may be given to fill
+    caller-owned arrays (vector envs pass slices of their batch buffers).
+    """
+
+    num_actions = len(ACTIONS)
+
+    def __init__(self, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT, crop_radius=None,
+                 max_steps=None, grid=None, crop=None):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.crop_radius = crop_radius
+        self.max_steps = max_steps
+        self.engine = None
+        self._seeds = random.Random()
+
+        shape = (board_height, board_width, len(CHANNELS))
+        self.grid = np.zeros(shape, dtype=np.uint8) if grid is None else grid
+        self.observation = {'grid': self.grid}
+        if crop_radius is not None:
+            size = 2 * crop_radius + 1
+            self.crop = np.zeros((size, size, len(CHANNELS)), dtype=np.uint8) if crop is None else crop
+            self.observation['crop'] = self.crop
+            # Index buffers reused by every crop: window offsets, wrapped rows/cols, flat cells
+            self._offsets = np.arange(-crop_radius, crop_radius + 1)
+            self._rows = np.empty(size, dtype=np.intp)
+            self._cols = np.empty(size, dtype=np.intp)
+            self._cells = np.empty((size, size), dtype=np.intp)
+        self.info = {'score': 0, 'tick': 0}
+
+    def reset(self, seed=None):
+        """Start a new game; seeding also fixes the seeds of later episodes."""
+        if seed is not None:
+            self._seeds.seed(seed)
+        if self.engine is None:
+            self.engine = Engine(self.board_width, self.board_height,
+                                 seed=self._seeds.randrange(2 ** 63))
+        else:
+            self.engine.reset(self._seeds.randrange(2 ** 63))
+
+        grid = self.grid
+        grid.fill(0)
+        for x, y in self.engine.snake.body:
+            grid[y, x, BODY] = 1
+        x, y = self.engine.snake.head
+        grid[y, x, HEAD] = 1
+        self._food = self._bonus = None
+        self._draw_food()
+        if self.crop_radius is not None:
+            self._crop()
+        self.info['score'] = self.info['tick'] = 0
+        return self.observation, self.info
+
+    def step(self, action=None):
+        """Advance one tick; returns (observation, reward, terminated, truncated, info).
+
+        As in Gymnasium, call reset() before the first step and after an
+        episode terminates: stepping a finished game raises RuntimeError.
+        """
+        engine = self.engine
+        if engine is None or engine.game_over:
+            raise RuntimeError("step() called on a finished episode; call reset() first")
+        snake = engine.snake
+        tail, growing = snake.tail, snake.growing
+        x, y = snake.head
+
+        _, reward, terminated = engine.step(
+            None if action is None or action < 0 else ACTIONS[action])
+
+        # Only the cells that changed: vacated tail, old and new head, food
+        grid = self.grid
+        if not growing:
+            grid[tail[1], tail[0], BODY] = 0
+        grid[y, x, HEAD] = 0
+        x, y = snake.head
+        grid[y, x, BODY] = 1
+        grid[y, x, HEAD] = 1
+        self._draw_food()
+        if self.crop_radius is not None:
+            self._crop()
+
+        self.info['score'] = engine.score
+        self.info['tick'] = engine.tick
+        truncated = (not terminated and self.max_steps is not None
+                     and engine.tick >= self.max_steps)
+        return self.observation, float(reward), terminated, truncated, self.info
+
+    def _draw_food(self):
+        """Move the food and bonus channels to where the engine has them now."""
+        grid = self.grid
+        food = self.engine.food.position
+        if food != self._food:
+            if self._food is not None:
+                grid[self._food[1], self._food[0], FOOD] = 0
+            if food is not None:
+                grid[food[1], food[0], FOOD] = 1
+            self._food = food
+
+        bonus_food = self.engine.bonus_food
+        bonus = bonus_food.position if bonus_food.active else None
+        if bonus != self._bonus:
+            if self._bonus is not None:
+                x, y = self._bonus
+                grid[y:y + bonus_food.size, x:x + bonus_food.size, BONUS] = 0
+            if bonus is not None:
+                x, y = bonus
+                grid[y:y + bonus_food.size, x:x + bonus_food.size, BONUS] = 1
+            self._bonus = bonus
+
+    def _crop(self):
+        """Copy the window around the head into crop, without temporaries."""
+        x, y = self.engine.snake.head
+        rows, cols, cells = self._rows, self._cols, self._cells
+        np.add(self._offsets, y, out=rows)
+        np.remainder(rows, self.board_height, out=rows)
+        np.multiply(rows, self.board_width, out=rows)
+        np.add(self._offsets, x, out=cols)
+        np.remainder(cols, self.board_width, out=cols)
+        np.add(rows[:, None], cols[None, :], out=cells)
+        flat = self.grid.reshape(-1, len(CHANNELS))
+        np.take(flat, cells.reshape(-1), axis=0, out=self.crop.reshape(-1, len(CHANNELS)))
+
+
+def _layout(num_envs, board_width, board_height, crop_radius):
+    """[(name, shape, dtype, offset)] of a vector env's arrays, and their total bytes."""
+    n, channels = num_envs, len(CHANNELS)
+    arrays = [('grid', (n, board_height, board_width, channels), np.uint8)]
+    if crop_radius is not None:
+        size = 2 * crop_radius + 1
+        arrays.append(('crop', (n, size, size, channels), np.uint8))
+    arrays += [
+        ('actions', (n,), np.int64),
+        ('rewards', (n,), np.float32),
+        ('terminated', (n,), np.bool_),
+        ('truncated', (n,), np.bool_),
+        ('score', (n,), np.int64),
+        ('final_score', (n,), np.int64),  # -1 unless the episode ended this step
+    ]
+    layout, offset = [], 0
+    for name, shape, dtype in arrays:
+        layout.append((name, shape, dtype, offset))
+        offset += (int(np.prod(shape)) * np.dtype(dtype).itemsize + 7) & ~7
+    return layout, offset
+
+
+def _arrays(layout, buffer=None):
+    """Arrays for a layout, as views into buffer or freshly allocated."""
+    if buffer is None:
+        return {name: np.zeros(shape, dtype) for name, shape, dtype, _ in layout}
+    return {name: np.ndarray(shape, dtype, buffer=buffer, offset=offset)
+            for name, shape, dtype, offset in layout}
+
+
+def _make_envs(arrays, first, count, board_width, board_height, crop_radius, max_steps):
+    """Environments first .. first + count - 1, each filling its slice of arrays."""
+    crops = arrays.get('crop')
+    return [SnakeEnv(board_width, board_height, crop_radius, max_steps, grid=arrays['grid'][i],
+                     crop=None if crops is None else crops[i])
+            for i in range(first, first + count)]
+
+
+def _reset_envs(envs, arrays, first, seed):
+    for i, env in enumerate(envs, first):
+        env.reset(None if seed is None else seed + i)
+        arrays['score'][i] = 0
+        arrays['final_score'][i] = -1
+
+
+def _step_envs(envs, arrays, first):
+    actions, rewards = arrays['actions'], arrays['rewards']
+    terminated, truncated = arrays['terminated'], arrays['truncated']
+    scores, final_scores = arrays['score'], arrays['final_score']
+    for i, env in enumerate(envs, first):
+        _, rewards[i], terminated[i], truncated[i], _ = env.step(actions[i])
+        final_scores[i] = -1
+        if terminated[i] or truncated[i]:
+            final_scores[i] = env.engine.score
+            env.reset()
+        scores[i] = env.engine.score
+
+
+class _VectorEnv:
+    """Batch buffers and the step/reset interface shared by both vector modes."""
+
+    num_actions = len(ACTIONS)
+
+    def _bind(self, arrays):
+        self.arrays = arrays
+        self.observation = {name: arrays[name] for name in ('grid', 'crop') if name in arrays}
+        self.info = {'score': arrays['score'], 'final_score': arrays['final_score']}
+
+    def reset(self, seed=None):
+        """Reset every environment; environment i is seeded with seed + i."""
+        self._reset(seed)
+        return self.observation, self.info
+
+    def step(self, actions):
+        """Step every environment with its action; returns batched arrays (reused)."""
+        self.arrays['actions'][:] = actions
+        self._step()
+        arrays = self.arrays
+        return (self.observation, arrays['rewards'], arrays['terminated'],
+                arrays['truncated'], self.info)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SyncVectorEnv(_VectorEnv):
+    """num_envs environments stepped one after another in this process."""
+
+    def __init__(self, num_envs, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 crop_radius=None, max_steps=None):
+        self.num_envs = num_envs
+        layout, _ = _layout(num_envs, board_width, board_height, crop_radius)
+        self._bind(_arrays(layout))
+        self.envs = _make_envs(self.arrays, 0, num_envs, board_width, board_height,
+                               crop_radius, max_steps)
+
+    def _reset(self, seed):
+        _reset_envs(self.envs, self.arrays, 0, seed)
+
+    def _step(self):
+        _step_envs(self.envs, self.arrays, 0)
+
+    def close(self):
+        pass
+
+
+def _worker(conn, name, layout, first, count, board_width, board_height, crop_radius, max_steps):
+    shm = attach(name)  # The parent owns the segment and unlinks it on close
+    arrays = _arrays(layout, shm.buf)
+    envs = _make_envs(arrays, first, count, board_width, board_height, crop_radius, max_steps)
+    try:
+        while True:
+            command, seed = conn.recv()
+            if command == 'step':
+                _step_envs(envs, arrays, first)
+            elif command == 'reset':
+                _reset_envs(envs, arrays, first, seed)
+            else:
+                break
+            conn.send(None)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del envs, arrays
+        shm.close()
+
+
+class AsyncVectorEnv(_VectorEnv):
+    """num_envs environments split across worker processes (default: one per CPU).
+
+    Observations and results live in shared memory, so nothing is pickled
+    per step but a command to each worker and an acknowledgement back.
+    Call close() (or use it as a context manager) to stop the workers.
+    """
+
+    def __init__(self, num_envs, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 crop_radius=None, max_steps=None, workers=None):
+        self.num_envs = num_envs
+        workers = max(1, min(workers or os.cpu_count() or 1, num_envs))
+        layout, size = _layout(num_envs, board_width, board_height, crop_radius)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._bind(_arrays(layout, self._shm.buf))
+
+        self._conns, self._processes = [], []
+        for w in range(workers):
+            first = num_envs * w // workers
+            count = num_envs * (w + 1) // workers - first
+            parent, child = Pipe()
+            process = Process(target=_worker, daemon=True,
+                              args=(child, self._shm.name, layout, first, count,
+                                    board_width, board_height, crop_radius, max_steps))
+            process.start()
+            child.close()
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def _send(self, command, seed=None):
+        for conn in self._conns:
+            conn.send((command, seed))
+        for conn in self._conns:
+            conn.recv()
+
+    def _reset(self, seed):
+        self._send('reset', seed)
+
+    def _step(self):
+        self._send('step')
+
+    def close(self):
+        """Stop the workers and free the shared buffers."""
+        if self._shm is None:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(('close', None))
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join()
+        self.arrays = self.observation = self.info = None
+        self._shm.unlink()
+        try:
+            self._shm.close()
+        except BufferError:  # The caller still holds observation arrays
+            pass
+        self._shm = None
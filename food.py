@@ -1,25 +1,36 @@
 import random
 import time
 
-from config import BONUS_FOOD_DURATION, BONUS_MAX_SCORE, BONUS_MIN_SCORE
+from config import BONUS_FOOD_DURATION, BONUS_FOOD_SIZE, BONUS_MAX_SCORE, BONUS_MIN_SCORE
 
 
 class Food:
+    __slots__ = ('position',)
+
     def __init__(self):
         self.position = None
 
-    def spawn(self, snake_body, board_width, board_height, excluded_positions=None):
-        """Spawn food at a random position not occupied by the snake."""
-        available_positions = []
+    def spawn(self, snake_body, board_width, board_height, excluded_positions=None,
+              free_cells=None, rng=random):
+        """Spawn food at a random position not occupied by the snake.
+
+        If a FreeCells index is given, it is used instead of scanning the board.
+        """
         excluded = excluded_positions or []
 
+        if free_cells is not None:
+            self.position = free_cells.choice(excluded, rng)
+            return self.position
+
+        available_positions = []
+
         for x in range(board_width):
             for y in range(board_height):
                 if (x, y) not in snake_body and (x, y) not in excluded:
                     available_positions.append((x, y))
 
         if available_positions:
-            self.position = random.choice(available_positions)
+            self.position = rng.choice(available_positions)
         else:
             # No space left - snake wins!
             self.position = None
@@ -32,27 +43,41 @@ class Food:
 
 
 class BonusFood:
-    def __init__(self):
-        self.position = None  # Top-left of 2x2 bonus food
+    __slots__ = ('position', 'size', 'spawn_time', 'active')
+
+    def __init__(self, size=BONUS_FOOD_SIZE):
+        self.position = None  # Top-left of the size x size bonus food
+        self.size = size
         self.spawn_time = None
         self.active = False
 
-    def spawn(self, snake_body, board_width, board_height, regular_food_pos=None):
-        """Spawn bonus food (2x2) at a random position."""
-        available_positions = []
+    def spawn(self, snake_body, board_width, board_height, regular_food_pos=None,
+              free_blocks=None, rng=random, now=None):
+        """Spawn bonus food (size x size) at a random position.
+
+        If a FreeBlocks index of matching size is given, it is used instead of
+        scanning the board. `now` is the spawn time in seconds on the caller's
+        clock (wall-clock time if omitted).
+        """
         excluded = [regular_food_pos] if regular_food_pos else []
 
-        # Need space for 2x2, so limit range
-        for x in range(board_width - 1):
-            for y in range(board_height - 1):
-                # Check all 4 cells of the 2x2 area
-                cells = [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
-                if all(cell not in snake_body and cell not in excluded for cell in cells):
-                    available_positions.append((x, y))
+        if free_blocks is not None:
+            position = free_blocks.choice(excluded, rng)
+        else:
+            available_positions = []
 
-        if available_positions:
-            self.position = random.choice(available_positions)
-            self.spawn_time = time.time()
+            # Need space for the whole block, so limit range
+            for x in range(board_width - self.size + 1):
+                for y in range(board_height - self.size + 1):
+                    cells = self._block_cells(x, y)
+                    if all(cell not in snake_body and cell not in excluded for cell in cells):
+                        available_positions.append((x, y))
+
+            position = rng.choice(available_positions) if available_positions else None
+
+        if position is not None:
+            self.position = position
+            self.spawn_time = time.time() if now is None else now
             self.active = True
         else:
             self.position = None
@@ -60,36 +85,53 @@ class BonusFood:
 
         return self.position
 
+    def _block_cells(self, x, y):
+        return [(x + dx, y + dy) for dy in range(self.size) for dx in range(self.size)]
+
     def get_all_positions(self):
-        """Get all 4 positions occupied by the 2x2 bonus food."""
+        """Get all positions occupied by the bonus food."""
         if not self.position:
             return []
-        x, y = self.position
-        return [(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)]
+        return self._block_cells(*self.position)
 
     def is_eaten(self, snake_head):
         """Check if snake head touched any part of the bonus food."""
         return self.active and snake_head in self.get_all_positions()
 
-    def is_expired(self):
+    def is_expired(self, now=None):
         """Check if bonus food has timed out."""
-        if not self.active or not self.spawn_time:
+        if not self.active or self.spawn_time is None:
             return False
-        return time.time() - self.spawn_time > BONUS_FOOD_DURATION
-
-    def get_time_remaining(self):
+        now = time.time() if now is None else now
+        return now - self.spawn_time > BONUS_FOOD_DURATION
+
+    @staticmethod
+    def expiry_clock(spawned):
+        """First game-clock time (ms) at which bonus food spawned at `spawned` ms has expired.
+
+        Uses is_expired's own arithmetic in seconds, so an expiry scheduled
+        for this time fires on exactly the tick a per-tick check would have.
+        """
+        due = spawned + BONUS_FOOD_DURATION * 1000
+        while not due / 1000 - spawned / 1000 > BONUS_FOOD_DURATION:
+            due += 1
+        return due
+
+    def get_time_remaining(self, now=None):
         """Get seconds remaining before bonus expires."""
-        if not self.active or not self.spawn_time:
+        if not self.active or self.spawn_time is None:
             return 0
-        remaining = BONUS_FOOD_DURATION - (time.time() - self.spawn_time)
+        now = time.time() if now is None else now
+        remaining = BONUS_FOOD_DURATION - (now - self.spawn_time)
         return max(0, remaining)
 
-    def calculate_bonus_score(self):
+    def calculate_bonus_score(self, now=None):
         """Calculate bonus score based on how quickly it was eaten."""
-        if not self.spawn_time:
+        if self.spawn_time is None:
             return BONUS_MIN_SCORE
 
-        elapsed = time.time() - self.spawn_time
+        now = time.time() if now is None else now
+        elapsed = now - self.spawn_time
         # Linear interpolation: fast = max score, slow = min score
         ratio = 1 - (elapsed / BONUS_FOOD_DURATION)
         ratio = max(0, min(1, ratio))  # Clamp between 0 and 1
@@ -0,0 +1,99 @@
+from collections import deque
+
+from config import SNAKE_HEAD, SNAKE_BODY, FOOD_CHAR, BONUS_FOOD_CHAR
+
+EMPTY_CHAR = ' '
+
+
+class BoardFrame:
+    """Retained copy of the board as last drawn, used to emit only changed cells.
+
+    The frame mirrors the snake in its own deque, so a normal tick only
+    looks at the new head, the old head (now body), the vacated tail and
+    any food changes. Anything it cannot follow incrementally (a new game,
+    a jump of more than one cell) falls back to a full redraw.
+    """
+
+    def __init__(self):
+        self.cells = {}  # (x, y) -> glyph for every non-empty cell on screen
+        self._snake = deque()
+        self._food = None
+        self._bonus = []
+        self.valid = False
+
+    def invalidate(self):
+        """Force the next diff to repaint the whole board."""
+        self.valid = False
+
+    def diff(self, snake, food, bonus_food=None, on_change=None):
+        """Return [((x, y), glyph), ...] for cells that changed since last call.
+
+        `on_change(cell, old_glyph, new_glyph)` is called for each change, for
+        views that mirror the frame (such as the minimap).
+        """
+        body = snake.body
+        bonus = bonus_food.get_all_positions() if bonus_food and bonus_food.active else []
+
+        dirty = self._incremental_dirty(body) if self.valid else None
+        if dirty is None:
+            # Repaint: clear everything previously drawn and draw everything now
+            dirty = set(self.cells)
+            dirty.update(body)
+            self._snake = deque(body)
+            self._food = None
+            self._bonus = []
+            self.valid = True
+
+        if food.position != self._food:
+            dirty.add(self._food)
+            dirty.add(food.position)
+            self._food = food.position
+        if bonus != self._bonus:
+            dirty.update(self._bonus)
+            dirty.update(bonus)
+            self._bonus = bonus
+        dirty.discard(None)
+
+        changes = []
+        for cell in dirty:
+            glyph = self._glyph(cell, snake, food, bonus)
+            old = self.cells.get(cell, EMPTY_CHAR)
+            if old == glyph:
+                continue
+            if on_change is not None:
+                on_change(cell, old, glyph)
+            if glyph == EMPTY_CHAR:
+                del self.cells[cell]
+            else:
+                self.cells[cell] = glyph
+            changes.append((cell, glyph))
+        return changes
+
+    def _incremental_dirty(self, body):
+        """Advance the mirrored snake by one tick, or return None to repaint."""
+        shadow = self._snake
+        dirty = set()
+
+        if body[0] != shadow[0]:
+            dirty.add(shadow[0])  # Old head is now body
+            shadow.appendleft(body[0])
+            dirty.add(body[0])
+        while len(shadow) > len(body):
+            dirty.add(shadow.pop())
+
+        if (len(shadow) != len(body) or shadow[-1] != body[-1]
+                or (len(body) > 1 and shadow[1] != body[1])):
+            return None
+        return dirty
+
+    @staticmethod
+    def _glyph(cell, snake, food, bonus):
+        if cell == snake.head:
+            return SNAKE_HEAD
+        if snake.occupies(cell):
+            return SNAKE_BODY
+        if cell == food.position:
+            return FOOD_CHAR
+        if cell in bonus:
+            return BONUS_FOOD_CHAR
+        return EMPTY_CHAR
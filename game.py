@@ -1,131 +1,185 @@
 import curses
+import os
 import time
+from collections import deque
 
-from config import (
-    BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED,
-    SPEED_INCREMENT, MIN_SPEED, UP, DOWN, LEFT, RIGHT,
-    BONUS_FOOD_INTERVAL
-)
-from snake import Snake
-from food import Food, BonusFood
+from config import BOARD_WIDTH, BOARD_HEIGHT, UP, DOWN, LEFT, RIGHT
+from engine import Engine
+from replay import Recorder
 from ui import UI
-from leaderboard import save_score, is_high_score
+
+# Key-to-direction dispatch table
+KEY_DIRECTIONS = {
+    curses.KEY_UP: UP, ord('w'): UP, ord('W'): UP,
+    curses.KEY_DOWN: DOWN, ord('s'): DOWN, ord('S'): DOWN,
+    curses.KEY_LEFT: LEFT, ord('a'): LEFT, ord('A'): LEFT,
+    curses.KEY_RIGHT: RIGHT, ord('d'): RIGHT, ord('D'): RIGHT,
+}
+QUIT_KEYS = {ord('q'), ord('Q')}
+
+INPUT_QUEUE_SIZE = 3  # Turns buffered ahead; one is applied per tick
+MAX_CATCHUP_TICKS = 5  # Ticks run back-to-back after a stall before dropping time
 
 
 class Game:
-    def __init__(self, stdscr, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT):
+    """Interactive shell around Engine: keyboard input, rendering and timing."""
+
+    def __init__(self, stdscr, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 record_dir=None, profiler=None, stream=None, autopilot=None, publisher=None):
         self.stdscr = stdscr
         self.board_width = board_width
         self.board_height = board_height
+        self.record_dir = record_dir
+        self.profiler = profiler
+        self.stream = stream  # Optional AnsiStream mirroring every rendered frame
+        self.autopilot = autopilot  # Optional policy steering instead of the keyboard
+        self.publisher = publisher  # Optional BoardPublisher exporting every tick
+        self.quit = False
+        self.engine = Engine(board_width, board_height)
+        self.engine.profiler = profiler
         self.ui = UI(stdscr, board_width, board_height)
         self.reset()
 
-    def reset(self):
+    def reset(self, seed=None):
         """Reset game state for a new game."""
-        self.snake = Snake(self.board_width // 2, self.board_height // 2)
-        self.food = Food()
-        self.food.spawn(self.snake.body, self.board_width, self.board_height)
-        self.bonus_food = BonusFood()
-        self.food_count = 0  # Track regular foods eaten for bonus spawning
-        self.score = 0
-        self.game_over = False
-        self.speed = INITIAL_SPEED
+        self.engine.reset(seed)
+        self.recorder = Recorder(self.engine)
+        self.input_queue = deque(maxlen=INPUT_QUEUE_SIZE)
+        if self.publisher:
+            self.publisher.publish(self.engine)
+
+    @property
+    def snake(self):
+        return self.engine.snake
+
+    @property
+    def food(self):
+        return self.engine.food
+
+    @property
+    def bonus_food(self):
+        return self.engine.bonus_food
+
+    @property
+    def score(self):
+        return self.engine.score
+
+    @property
+    def speed(self):
+        return self.engine.speed
+
+    @property
+    def game_over(self):
+        return self.engine.game_over
+
+    @game_over.setter
+    def game_over(self, value):
+        self.engine.game_over = value
 
     def handle_input(self):
-        """Process keyboard input."""
-        key = self.ui.get_input()
-
-        if key in [curses.KEY_UP, ord('w'), ord('W')]:
-            self.snake.change_direction(UP)
-        elif key in [curses.KEY_DOWN, ord('s'), ord('S')]:
-            self.snake.change_direction(DOWN)
-        elif key in [curses.KEY_LEFT, ord('a'), ord('A')]:
-            self.snake.change_direction(LEFT)
-        elif key in [curses.KEY_RIGHT, ord('d'), ord('D')]:
-            self.snake.change_direction(RIGHT)
-        elif key in [ord('q'), ord('Q')]:
-            self.game_over = True
-            return False  # Signal to quit without game over screen
+        """Drain pending keys into the per-tick direction queue."""
+        for key in self.ui.get_inputs():
+            direction = KEY_DIRECTIONS.get(key)
+            if direction is not None:
+                self.queue_direction(direction)
+            elif key in QUIT_KEYS:
+                self.game_over = True
+                return False  # Signal to quit without game over screen
 
         return True
 
+    def queue_direction(self, direction):
+        """Buffer a turn so quick double turns land on consecutive ticks."""
+        last = self.input_queue[-1] if self.input_queue else self.snake.direction
+        if direction != last and len(self.input_queue) < INPUT_QUEUE_SIZE:
+            self.input_queue.append(direction)
+
     def update(self):
-        """Update game state."""
-        # Move snake with wall wrapping
-        self.snake.move(self.board_width, self.board_height)
-
-        # Check self collision only (walls wrap around)
-        if self.snake.check_self_collision():
-            self.game_over = True
-            return
-
-        # Check bonus food expiration
-        if self.bonus_food.is_expired():
-            self.bonus_food.despawn()
-
-        # Check bonus food collision
-        if self.bonus_food.is_eaten(self.snake.head):
-            bonus_score = self.bonus_food.calculate_bonus_score()
-            self.score += bonus_score
-            self.snake.grow()
-            self.bonus_food.despawn()
-
-        # Check regular food collision
-        if self.food.is_eaten(self.snake.head):
-            self.snake.grow()
-            self.score += 10
-            self.food_count += 1
-
-            # Spawn bonus food after every BONUS_FOOD_INTERVAL regular foods
-            if self.food_count % BONUS_FOOD_INTERVAL == 0 and not self.bonus_food.active:
-                self.bonus_food.spawn(
-                    self.snake.body,
-                    self.board_width,
-                    self.board_height,
-                    self.food.position
-                )
-
-            # Spawn new regular food (exclude bonus food positions)
-            excluded = self.bonus_food.get_all_positions() if self.bonus_food.active else []
-            self.food.spawn(self.snake.body, self.board_width, self.board_height, excluded)
-
-            # Increase speed
-            self.speed = max(MIN_SPEED, INITIAL_SPEED - (self.score // 50) * SPEED_INCREMENT)
-
-            # Check win condition (filled the board)
-            if self.food.position is None:
-                self.score += 100  # Bonus for winning
-                self.game_over = True
+        """Update game state by one tick."""
+        if self.autopilot:
+            self.engine.step(self.autopilot(self.engine))
+        else:
+            if self.input_queue:
+                self.snake.change_direction(self.input_queue.popleft())
+            self.engine.step()
+        self.recorder.record(self.engine)
+        if self.publisher:
+            self.publisher.publish(self.engine)
+
+    def save_replay(self):
+        """Write the finished game's replay into record_dir, if set."""
+        if not self.record_dir:
+            return None
+        self.recorder.finish(self.engine)
+        os.makedirs(self.record_dir, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.engine.seed:016x}-{self.score}.snkr"
+        path = os.path.join(self.record_dir, name)
+        self.recorder.save(path)
+        return path
 
     def run(self):
-        """Main game loop."""
+        """Main game loop.
+
+        Runs on a fixed timestep: elapsed time from a monotonic clock is
+        accumulated and spent in whole ticks of `speed` ms, so the tick
+        rate does not drift when a frame takes longer than expected.
+        """
         show_game_over = True
+        profiler = self.profiler
+        lag = 0.0
+        previous = time.perf_counter()
 
         while not self.game_over:
-            start_time = time.time()
+            now = time.perf_counter()
+            lag += now - previous
+            previous = now
+            t0 = time.perf_counter_ns()
 
             # Handle input
             if not self.handle_input():
                 show_game_over = False
+                self.quit = True
                 break
-
-            # Update game state
-            self.update()
+            t1 = time.perf_counter_ns()
+
+            # Update game state, catching up on ticks missed during a stall
+            ticks = 0
+            while lag >= self.speed / 1000 and not self.game_over:
+                lag -= self.speed / 1000
+                self.update()
+                ticks += 1
+                if ticks == MAX_CATCHUP_TICKS:
+                    lag = min(lag, self.speed / 1000)
+                    break
+            t2 = time.perf_counter_ns()
 
             # Render
-            if not self.game_over:
-                self.ui.render(self.snake, self.food, self.score, self.bonus_food)
-
-            # Frame timing
-            elapsed = (time.time() - start_time) * 1000
-            sleep_time = max(0, self.speed - elapsed)
-            time.sleep(sleep_time / 1000)
-
-        # Game over
-        if show_game_over and self.score > 0:
+            rendered = ticks and not self.game_over
+            if rendered:
+                self.ui.render(self.snake, self.food, self.score, self.bonus_food,
+                               now=self.engine.now)
+                if self.stream:
+                    self.stream.render(self.snake, self.food, self.score, self.bonus_food,
+                                       now=self.engine.now)
+            t3 = time.perf_counter_ns()
+
+            # Sleep until the next tick is due
+            time.sleep(max(0.0, self.speed / 1000 - lag - (time.perf_counter() - previous)))
+
+            if profiler:
+                profiler.record_frame(t1 - t0, t2 - t1, t3 - t2, time.perf_counter_ns() - t3,
+                                      ticks, self.speed)
+                if rendered:
+                    profiler.record_draw(self.ui.cells_drawn, self.ui.chars_drawn)
+
+        self.save_replay()
+
+        # Game over (autopilot games skip the prompts so demos run unattended)
+        if show_game_over and self.score > 0 and not self.autopilot:
             self.ui.show_game_over(self.score)
 
-            # Check for high score
+            # Check for high score (the leaderboard loads on first use)
+            from leaderboard import save_score, is_high_score
             if is_high_score(self.score):
                 name = self.ui.get_player_name()
                 save_score(name, self.score)
@@ -133,7 +187,9 @@ class Game:
         return self.score
 
 
-def run_game(stdscr, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT):
+def run_game(stdscr, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT, record_dir=None,
+             profiler=None, stream=None, autopilot=None, publisher=None):
     """Entry point for curses wrapper."""
-    game = Game(stdscr, board_width, board_height)
+    game = Game(stdscr, board_width, board_height, record_dir, profiler, stream, autopilot,
+                publisher)
     return game.run()
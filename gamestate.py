@@ -0,0 +1,487 @@
+"""
+Cloneable game state for lookahead search (MCTS, expectimax, rollouts).
+
+GameState plays by Engine.update's rules, but is built so that a clone
+shares almost everything with its parent and copies only what a step
+mutates:
+
+- The body is the trail of cells the head has entered, a ring indexed by
+  move number whose last `length` entries are the snake. It is stored in
+  chunks of TRAIL_CHUNK cells; chunks are dropped once the tail leaves them.
+- Occupancy is a bitmap in chunks of OCCUPANCY_CHUNK cells, created on
+  first use, so a mostly empty board costs almost nothing.
+- Both hang off a ChunkTrie: a persistent tree of FANOUT-way nodes. A clone
+  shares the whole tree with its parent, and a write copies only the nodes
+  on the path to its chunk that the writer does not own yet.
+- Food spawns sample cells against the bitmap, like board.py's sparse
+  indexes, instead of keeping a free-cell index that would need copying.
+
+Cloning is O(1) whatever the board size or snake length, and a step
+copies at most a few paths of log_FANOUT(board / chunk) small nodes.
+
+Every state owns a random.Random. clone() seeds the child's stream from
+the parent's seed and a key (by default the parent's clone count), so
+food spawns on each branch are reproducible and do not depend on the
+order branches are explored in; pass the action as the key to give the
+same action the same future. Spawns follow Engine's rules but not its
+random stream, so a state taken from a live game cannot foresee that
+game's food.
+
+GameState has the attributes the built-in policies read (snake, food,
+board_width, ...), so policies work as rollout policies:
+
+    state = GameState.from_engine(engine)
+    child = state.clone(key=0)
+    child.step(UP)
+"""
+
+import random
+from array import array
+
+from board import SAMPLE_TRIES
+from config import (
+    BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED, SPEED_INCREMENT, MIN_SPEED,
+    BONUS_FOOD_INTERVAL, RIGHT, OPPOSITES
+)
+from food import Food, BonusFood
+
+TRAIL_CHUNK = 64  # Trail cells per chunk
+OCCUPANCY_CHUNK = 512  # Board cells per occupancy chunk (64 bytes)
+FANOUT_BITS = 5
+FANOUT = 1 << FANOUT_BITS  # Children per ChunkTrie node
+
+MASK64 = (1 << 64) - 1
+
+
+def split_seed(seed, key):
+    """Seed of child stream `key` of `seed` (SplitMix64 mixing)."""
+    z = (seed + (key + 1) * 0x9E3779B97F4A7C15) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+class _Node:
+    __slots__ = ('slots', 'owner')
+
+    def __init__(self, slots, owner):
+        self.slots = slots  # Child nodes, or the chunk itself in a leaf
+        self.owner = owner
+
+
+class ChunkTrie:
+    """Persistent array of chunks (bytearrays or arrays) with an O(1) clone().
+
+    Chunks are the leaves of a tree of FANOUT-way nodes. Every trie carries
+    an owner token and edits in place only the nodes it owns; writing
+    through a node made by someone else copies it first (path copying).
+    clone() gives both tries new tokens, so from then on each copies what
+    it changes and the shared nodes are never modified.
+    """
+
+    __slots__ = ('root', 'owner', '_shifts')
+
+    def __init__(self, size):
+        depth = 1
+        while FANOUT ** depth < size:
+            depth += 1
+        self._shifts = tuple(range((depth - 1) * FANOUT_BITS, -1, -FANOUT_BITS))
+        self.owner = object()
+        self.root = _Node([None] * FANOUT, self.owner)
+
+    def clone(self):
+        child = ChunkTrie.__new__(ChunkTrie)
+        child.root = self.root
+        child._shifts = self._shifts
+        child.owner = object()
+        self.owner = object()
+        return child
+
+    def get(self, index):
+        """Chunk `index` for reading, or None if it was never written."""
+        node = self.root
+        for shift in self._shifts:
+            node = node.slots[index >> shift & FANOUT - 1]
+            if node is None:
+                return None
+        return node.slots
+
+    def _own_parent(self, index):
+        """Owned node whose slots hold leaf `index`, copying the path down to it."""
+        owner = self.owner
+        node = self.root
+        if node.owner is not owner:
+            node = self.root = _Node(node.slots[:], owner)
+        for shift in self._shifts[:-1]:
+            slots = node.slots
+            i = index >> shift & FANOUT - 1
+            child = slots[i]
+            if child is None:
+                child = slots[i] = _Node([None] * FANOUT, owner)
+            elif child.owner is not owner:
+                child = slots[i] = _Node(child.slots[:], owner)
+            node = child
+        return node
+
+    def writable(self, index, new_chunk):
+        """Chunk `index` for writing (copied if shared, new_chunk() if missing)."""
+        slots = self._own_parent(index).slots
+        i = index & FANOUT - 1
+        leaf = slots[i]
+        if leaf is None:
+            leaf = slots[i] = _Node(new_chunk(), self.owner)
+        elif leaf.owner is not self.owner:
+            leaf = slots[i] = _Node(leaf.slots[:], self.owner)
+        return leaf.slots
+
+    def drop(self, index):
+        """Forget chunk `index`."""
+        self._own_parent(index).slots[index & FANOUT - 1] = None
+
+
+def _new_trail_chunk():
+    return array('I', bytes(4 * TRAIL_CHUNK))
+
+
+def _new_occupancy_chunk():
+    return bytearray(OCCUPANCY_CHUNK // 8)
+
+
+class TrailBody:
+    """Read-only sequence view of a PersistentSnake's cells, head first."""
+
+    __slots__ = ('_snake',)
+
+    def __init__(self, snake):
+        self._snake = snake
+
+    def __len__(self):
+        return self._snake.length
+
+    def __getitem__(self, index):
+        snake = self._snake
+        if index < 0:
+            index += snake.length
+        if not 0 <= index < snake.length:
+            raise IndexError('snake body index out of range')
+        return snake.unpack(snake._trail_cell(snake._end - 1 - index))
+
+    def __iter__(self):
+        snake = self._snake
+        for i in range(snake._end - 1, snake._end - 1 - snake.length, -1):
+            yield snake.unpack(snake._trail_cell(i))
+
+    def __contains__(self, cell):
+        return self._snake.occupies(cell)
+
+
+class PersistentSnake:
+    """Snake with the interface of snake.Snake whose clone() is O(1)."""
+
+    __slots__ = ('width', 'height', 'length', 'direction', '_grow_pending', '_self_collision',
+                 '_trail', '_capacity', '_end', '_occupancy', '_head_x', '_head_y', 'body')
+
+    def __init__(self, cells, direction, width, height, growing=False):
+        """Build from body cells, head first."""
+        self.width = width
+        self.height = height
+        self.direction = direction
+        self._grow_pending = growing
+        self._self_collision = False
+        # One spare chunk keeps the head out of the chunk the tail is leaving
+        chunks = -(-width * height // TRAIL_CHUNK) + 1
+        self._trail = ChunkTrie(chunks)
+        self._capacity = chunks * TRAIL_CHUNK
+        self._end = 0  # Trail index after the head
+        self._occupancy = ChunkTrie(-(-width * height // OCCUPANCY_CHUNK))
+        self.length = 0
+        self.body = TrailBody(self)
+        for x, y in reversed(cells):
+            self._push_head(x, y)
+
+    def clone(self):
+        child = PersistentSnake.__new__(PersistentSnake)
+        child.width = self.width
+        child.height = self.height
+        child.length = self.length
+        child.direction = self.direction
+        child._grow_pending = self._grow_pending
+        child._self_collision = self._self_collision
+        child._trail = self._trail.clone()
+        child._capacity = self._capacity
+        child._end = self._end
+        child._occupancy = self._occupancy.clone()
+        child._head_x = self._head_x
+        child._head_y = self._head_y
+        child.body = TrailBody(child)
+        return child
+
+    def pack(self, cell):
+        x, y = cell
+        return y * self.width + x
+
+    def unpack(self, packed):
+        y, x = divmod(packed, self.width)
+        return x, y
+
+    def _trail_cell(self, index):
+        index %= self._capacity
+        return self._trail.get(index // TRAIL_CHUNK)[index % TRAIL_CHUNK]
+
+    def _flag(self, packed):
+        bits = self._occupancy.get(packed // OCCUPANCY_CHUNK)
+        return 0 if bits is None else bits[packed % OCCUPANCY_CHUNK >> 3] >> (packed & 7) & 1
+
+    def _set_flag(self, packed, flag):
+        bits = self._occupancy.writable(packed // OCCUPANCY_CHUNK, _new_occupancy_chunk)
+        offset = packed % OCCUPANCY_CHUNK >> 3
+        if flag:
+            bits[offset] |= 1 << (packed & 7)
+        else:
+            bits[offset] &= ~(1 << (packed & 7))
+
+    @property
+    def head(self):
+        return self._head_x, self._head_y
+
+    @property
+    def tail(self):
+        return self.unpack(self._trail_cell(self._end - self.length))
+
+    @property
+    def growing(self):
+        return self._grow_pending
+
+    def occupies(self, cell):
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self._flag(y * self.width + x))
+
+    def change_direction(self, new_direction):
+        if new_direction in OPPOSITES and OPPOSITES[new_direction] != self.direction:
+            self.direction = new_direction
+
+    def _push_head(self, x, y):
+        packed = y * self.width + x
+        index = self._end % self._capacity
+        self._trail.writable(index // TRAIL_CHUNK, _new_trail_chunk)[index % TRAIL_CHUNK] = packed
+        self._end += 1
+        self.length += 1
+        self._head_x, self._head_y = x, y
+        self._set_flag(packed, 1)
+
+    def move(self):
+        """Move one cell with wall wrapping; returns the vacated tail cell or None."""
+        dx, dy = self.direction
+        new_x = (self._head_x + dx) % self.width
+        new_y = (self._head_y + dy) % self.height
+
+        vacated = None
+        if self._grow_pending:
+            self._grow_pending = False
+        else:
+            tail = (self._end - self.length) % self._capacity
+            packed = self._trail.get(tail // TRAIL_CHUNK)[tail % TRAIL_CHUNK]
+            self.length -= 1
+            self._set_flag(packed, 0)
+            vacated = self.unpack(packed)
+            # Drop a chunk once the tail has left it
+            if tail % TRAIL_CHUNK == TRAIL_CHUNK - 1:
+                self._trail.drop(tail // TRAIL_CHUNK)
+
+        self._self_collision = bool(self._flag(new_y * self.width + new_x))
+        self._push_head(new_x, new_y)
+        return vacated
+
+    def grow(self):
+        self._grow_pending = True
+
+    def check_self_collision(self):
+        return self._self_collision
+
+
+class GameState:
+    """A game position that can be cloned cheaply and stepped like Engine."""
+
+    def __init__(self, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT, seed=None):
+        """Start a new game, laid out as Engine.reset does."""
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        x, y = board_width // 2, board_height // 2
+        cells = [((x - i) % board_width, y) for i in range(3)]
+        self._setup(board_width, board_height, seed,
+                    PersistentSnake(cells, RIGHT, board_width, board_height))
+        self.food.position = self._free_cell(())
+
+    @classmethod
+    def from_engine(cls, engine, seed=None):
+        """Snapshot an Engine's position (O(board) once; clones are cheap after that).
+
+        The default seed is split from the engine's seed and tick.
+        """
+        state = cls.__new__(cls)
+        if seed is None:
+            seed = split_seed(engine.seed, engine.tick)
+        snake = engine.snake
+        state._setup(engine.board_width, engine.board_height, seed,
+                     PersistentSnake(list(snake.body), snake.direction,
+                                     engine.board_width, engine.board_height, snake.growing))
+        state.tick = engine.tick
+        state.clock = engine.clock
+        state.score = engine.score
+        state.speed = engine.speed
+        state.food_count = engine.food_count
+        state.game_over = engine.game_over
+        state.won = engine.won
+        state.food.position = engine.food.position
+        bonus = engine.bonus_food
+        if bonus.active:
+            state.bonus_food.position = bonus.position
+            state.bonus_food.spawn_time = bonus.spawn_time
+            state.bonus_food.active = True
+            state.bonus_due = bonus.expiry_clock(round(bonus.spawn_time * 1000))
+        return state
+
+    def _setup(self, board_width, board_height, seed, snake):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.seed = seed
+        self._rng = None
+        self._policy_rng = None
+        self.clones = 0  # Clones made so far, the default key of the next one
+        self.snake = snake
+        self.food = Food()
+        self.bonus_food = BonusFood()
+        self.bonus_due = None  # Clock (ms) the bonus food expires at
+        self.tick = 0
+        self.clock = 0
+        self.score = 0
+        self.speed = INITIAL_SPEED
+        self.food_count = 0
+        self.game_over = False
+        self.won = False
+
+    def clone(self, key=None):
+        """Copy-on-write copy with its own random stream split off by key."""
+        if key is None:
+            key = self.clones
+            self.clones += 1
+        child = GameState.__new__(GameState)
+        child.__dict__.update(self.__dict__)
+        child.seed = split_seed(self.seed, key)
+        child._rng = None
+        child._policy_rng = None
+        child.clones = 0
+        child.snake = self.snake.clone()
+        child.food = Food()
+        child.food.position = self.food.position
+        bonus = child.bonus_food = BonusFood(self.bonus_food.size)
+        bonus.position = self.bonus_food.position
+        bonus.spawn_time = self.bonus_food.spawn_time
+        bonus.active = self.bonus_food.active
+        return child
+
+    @property
+    def rng(self):
+        """This state's random stream, seeded on first use (most steps spawn nothing)."""
+        if self._rng is None:
+            self._rng = random.Random(self.seed)
+        return self._rng
+
+    @property
+    def policy_rng(self):
+        """Random stream for rollout policies, like Engine.policy_rng."""
+        if self._policy_rng is None:
+            self._policy_rng = random.Random(f'{self.seed}/policy')
+        return self._policy_rng
+
+    @property
+    def now(self):
+        """Current game time in seconds."""
+        return self.clock / 1000
+
+    def _free_cell(self, excluded):
+        """A random cell that is neither snake nor excluded, or None if the board is full."""
+        snake, rng = self.snake, self.rng
+        width, height = self.board_width, self.board_height
+        for _ in range(SAMPLE_TRIES):
+            cell = (rng.randrange(width), rng.randrange(height))
+            if not snake.occupies(cell) and cell not in excluded:
+                return cell
+        free = [(x, y) for y in range(height) for x in range(width)
+                if not snake.occupies((x, y)) and (x, y) not in excluded]
+        return rng.choice(free) if free else None
+
+    def _free_block(self):
+        """Top-left of a random bonus-sized block clear of snake and food, or None."""
+        size, rng = self.bonus_food.size, self.rng
+        max_x, max_y = self.board_width - size, self.board_height - size
+        if max_x < 0 or max_y < 0:
+            return None
+
+        def clear(x, y):
+            return not any(self.snake.occupies((x + dx, y + dy)) or
+                           (x + dx, y + dy) == self.food.position
+                           for dy in range(size) for dx in range(size))
+
+        for _ in range(SAMPLE_TRIES):
+            x, y = rng.randint(0, max_x), rng.randint(0, max_y)
+            if clear(x, y):
+                return x, y
+        free = [(x, y) for y in range(max_y + 1) for x in range(max_x + 1) if clear(x, y)]
+        return rng.choice(free) if free else None
+
+    def step(self, action=None):
+        """Apply a direction (or None to keep going) and advance one tick, as Engine.step."""
+        if action is not None:
+            self.snake.change_direction(action)
+        score = self.score
+        self.update()
+        return self, self.score - score, self.game_over
+
+    def update(self):
+        """Advance one tick by Engine.update's rules."""
+        if self.game_over:
+            return
+
+        self.tick += 1
+        self.clock += self.speed
+        snake = self.snake
+        snake.move()
+        if snake.check_self_collision():
+            self.game_over = True
+            return
+
+        bonus = self.bonus_food
+        if bonus.active and self.clock >= self.bonus_due:
+            bonus.despawn()
+
+        head = snake.head
+        if bonus.is_eaten(head):
+            self.score += bonus.calculate_bonus_score(self.now)
+            snake.grow()
+            bonus.despawn()
+
+        if head == self.food.position:
+            snake.grow()
+            self.score += 10
+            self.food_count += 1
+
+            if self.food_count % BONUS_FOOD_INTERVAL == 0 and not bonus.active:
+                position = self._free_block()
+                if position is not None:
+                    bonus.position = position
+                    bonus.spawn_time = self.now
+                    bonus.active = True
+                    self.bonus_due = bonus.expiry_clock(self.clock)
+
+            excluded = bonus.get_all_positions() if bonus.active else ()
+            self.food.position = self._free_cell(excluded)
+
+            self.speed = max(MIN_SPEED, INITIAL_SPEED - (self.score // 50) * SPEED_INCREMENT)
+
+            if self.food.position is None:
+                self.score += 100
+                self.game_over = True
+                self.won = True
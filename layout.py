@@ -0,0 +1,80 @@
+"""
+Screen layout shared by the curses UI and the ANSI stream.
+
+Everything here is plain text and (row, column) positions, so it can be
+used without curses. Styles name a color role: 'ui' for the frame and
+text, 'border' for the game area wall.
+"""
+
+from functools import lru_cache
+
+from config import BORDER_CHAR
+
+OFFSET_X = 2  # Column of the game area's left wall
+OFFSET_Y = 3  # Row of the game area's top wall
+
+CONTROLS = "  WASD or Arrows to move   Q to quit"
+
+
+def cell_position(x, y):
+    """Screen (row, column) of a board cell."""
+    return OFFSET_Y + 1 + y, OFFSET_X + 1 + x
+
+
+def screen_size(board_width, board_height):
+    """(rows, columns) the whole layout needs."""
+    return board_height + 8, board_width + 6
+
+
+@lru_cache(maxsize=8)
+def chrome(board_width, board_height):
+    """Static frame as ((row, column, text, style), ...), drawn once per screen.
+
+    Built once per size and cached, so repaints after a resize or a new
+    spectator reuse the same strings.
+    """
+    segments = [
+        # Top UI border
+        (0, 0, '┌' + '─' * (board_width + 4) + '┐', 'ui'),
+        (1, 0, '│', 'ui'),
+        (2, 0, '├' + '─' * (board_width + 4) + '┤', 'ui'),
+    ]
+
+    # Game area border
+    for y in range(board_height + 2):
+        segments.append((OFFSET_Y + y, 0, '│ ', 'ui'))
+        segments.append((OFFSET_Y + y, board_width + 5, ' │', 'ui'))
+
+    segments.append((OFFSET_Y, OFFSET_X, BORDER_CHAR * (board_width + 2), 'border'))
+    for y in range(board_height):
+        segments.append((OFFSET_Y + 1 + y, OFFSET_X, BORDER_CHAR, 'border'))
+        segments.append((OFFSET_Y + 1 + y, OFFSET_X + board_width + 1, BORDER_CHAR, 'border'))
+    segments.append((OFFSET_Y + board_height + 1, OFFSET_X,
+                     BORDER_CHAR * (board_width + 2), 'border'))
+
+    # Bottom UI borders
+    bottom = OFFSET_Y + board_height + 2
+    segments.append((bottom, 0, '├' + '─' * (board_width + 4) + '┤', 'ui'))
+    segments.append((bottom + 1, 0, '│', 'ui'))
+    segments.append((bottom + 1, board_width + 5, '│', 'ui'))
+    segments.append((bottom + 2, 0, '└' + '─' * (board_width + 4) + '┘', 'ui'))
+    return tuple(segments)
+
+
+def score_line(board_width, score):
+    """(row, column, text) of the title and score header."""
+    title = "  SNAKE"
+    score_text = f"Score: {score}"
+    padding = board_width + 4 - len(title) - len(score_text)
+    return 1, 1, title + ' ' * padding + score_text + ' '
+
+
+def controls_line(board_width, board_height):
+    """(row, column, text) of the control hints below the board."""
+    padding = board_width + 4 - len(CONTROLS)
+    return OFFSET_Y + board_height + 3, 1, CONTROLS + ' ' * max(0, padding)
+
+
+def bonus_timer(board_width, remaining):
+    """(row, column, text) of the bonus countdown in the header."""
+    return 1, board_width - 5, f"BONUS: {remaining:.1f}s"
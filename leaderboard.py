@@ -1,46 +1,220 @@
 import json
 import os
+import sqlite3
+import time
+import uuid
 
-SCORES_FILE = os.path.join(os.path.dirname(__file__), 'scores.json')
+SCORES_FILE = os.path.join(os.path.dirname(__file__), 'scores.json')  # Legacy, migrated
+SCORES_DB = os.environ.get('SNAKE_SCORES_DB', os.path.join(os.path.dirname(__file__), 'scores.db'))
+TOP_N = 10
 
+# Unix socket of the leaderboard service (leaderboard_service.py). When it is
+# running, submissions go through it; otherwise they are written directly.
+SOCKET_PATH = os.environ.get(
+    'SNAKE_LEADERBOARD_SOCKET', os.path.join(os.path.dirname(__file__), 'leaderboard.sock')
+)
 
-def load_scores():
-    """Load scores from file."""
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    submission TEXT  -- Client-generated id; a submission sent twice is stored once
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, created_at, id);
+CREATE INDEX IF NOT EXISTS scores_by_time ON scores (created_at);
+"""
+
+_ORDER = 'ORDER BY score DESC, created_at, id'
+
+_connection = None
+_connection_path = None
+_cache_version = None  # PRAGMA data_version the cached top scores were read at
+_cache_top = None
+
+
+def _connect():
+    """Open (once per database path) the scores database, migrating scores.json."""
+    global _connection, _connection_path, _cache_version
+    if _connection is None or _connection_path != SCORES_DB:
+        conn = sqlite3.connect(SCORES_DB, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(_SCHEMA)
+        _add_submission_ids(conn)
+        _migrate_json(conn)
+        _connection, _connection_path = conn, SCORES_DB
+        _cache_version = None
+    return _connection
+
+
+def _add_submission_ids(conn):
+    """Add the submission column to databases created before it existed."""
+    def missing():
+        return 'submission' not in [row[1] for row in conn.execute('PRAGMA table_info(scores)')]
+
+    if missing():
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if missing():  # Checked again under the write lock, as in _migrate_json
+                conn.execute('ALTER TABLE scores ADD COLUMN submission TEXT')
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS scores_by_submission ON scores (submission)')
+
+
+def _migrate_json(conn):
+    """Import a legacy scores.json once, then rename it out of the way.
+
+    The file is checked again and read under the write lock, so when several
+    processes start at once only the first imports it.
+    """
     if not os.path.exists(SCORES_FILE):
-        return []
+        return
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        if not os.path.exists(SCORES_FILE):  # Another process migrated it first
+            conn.execute('ROLLBACK')
+            return
+        try:
+            with open(SCORES_FILE, 'r') as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            entries = []
+        created_at = os.path.getmtime(SCORES_FILE)
+        conn.executemany(
+            'INSERT INTO scores (name, score, created_at) VALUES (?, ?, ?)',
+            [(e['name'], int(e['score']), created_at) for e in entries
+             if isinstance(e, dict) and 'name' in e and 'score' in e]
+        )
+        os.replace(SCORES_FILE, SCORES_FILE + '.migrated')
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+
 
+def _top_scores():
+    """Top TOP_N scores, re-read only when the database has changed."""
+    global _cache_version, _cache_top
+    conn = _connect()
+    version = conn.execute('PRAGMA data_version').fetchone()[0]
+    if version != _cache_version or _cache_top is None:
+        rows = conn.execute(f'SELECT name, score FROM scores {_ORDER} LIMIT ?', (TOP_N,))
+        _cache_top = [{'name': name, 'score': score} for name, score in rows]
+        _cache_version = version
+    return _cache_top
+
+
+def _invalidate():
+    global _cache_top
+    _cache_top = None
+
+
+def load_scores():
+    """Load the full score history, best first."""
+    rows = _connect().execute(f'SELECT name, score FROM scores {_ORDER}')
+    return [{'name': name, 'score': score} for name, score in rows]
+
+
+def insert_scores(entries):
+    """Write (name, score, submission) entries to the database in one transaction.
+
+    An entry whose submission id is already stored is skipped; entries
+    without one (None) are always written.
+    """
+    conn = _connect()
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
     try:
-        with open(SCORES_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return []
+        conn.executemany('INSERT INTO scores (name, score, created_at, submission) '
+                         'VALUES (?, ?, ?, ?) ON CONFLICT (submission) DO NOTHING',
+                         [(name, score, now, submission) for name, score, submission in entries])
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    finally:
+        _invalidate()
+
+
+_service = None  # (socket, file) connection to the leaderboard service
+
+
+def _service_request(request):
+    """Send a request to the leaderboard service; None if it is not running."""
+    global _service
+    for _ in range(2):  # Retry once on a dropped connection
+        if _service is None:
+            if not os.path.exists(SOCKET_PATH):
+                return None
+            import socket  # Only needed with the service running
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(SOCKET_PATH)
+            except OSError:
+                return None
+            _service = (sock, sock.makefile('rwb'))
+        sock, stream = _service
+        try:
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+            if line:
+                return json.loads(line)
+        except OSError:
+            pass
+        sock.close()
+        _service = None
+    return None
 
 
 def save_score(name, score):
-    """Save a new score to the leaderboard."""
-    scores = load_scores()
-    scores.append({'name': name, 'score': score})
+    """Save a new score to the leaderboard.
+
+    The submission carries a fresh id, so resending it (after a lost reply
+    from the service, or by writing directly when the service fails)
+    never stores the score twice.
+    """
+    submission = uuid.uuid4().hex
+    reply = _service_request({'op': 'submit', 'name': name, 'score': score, 'id': submission})
+    if reply is not None and reply.get('ok'):
+        return reply['top']
+
+    insert_scores([(name, score, submission)])
+    return get_top_scores()
 
-    # Sort by score descending and keep top 10
-    scores.sort(key=lambda x: x['score'], reverse=True)
-    scores = scores[:10]
 
-    with open(SCORES_FILE, 'w') as f:
-        json.dump(scores, f, indent=2)
+def watch_top_scores():
+    """Yield the top scores each time the leaderboard service reports a change.
 
-    return scores
+    Requires the service to be running; raises OSError otherwise.
+    """
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(SOCKET_PATH)
+        stream = sock.makefile('rwb')
+        stream.write(b'{"op": "subscribe"}\n')
+        stream.flush()
+        for line in stream:
+            yield json.loads(line)['top']
 
 
 def get_top_scores(limit=10):
     """Get top scores from the leaderboard."""
-    scores = load_scores()
-    scores.sort(key=lambda x: x['score'], reverse=True)
-    return scores[:limit]
+    if limit <= TOP_N:
+        return [dict(entry) for entry in _top_scores()[:limit]]
+    rows = _connect().execute(f'SELECT name, score FROM scores {_ORDER} LIMIT ?', (limit,))
+    return [{'name': name, 'score': score} for name, score in rows]
 
 
 def is_high_score(score):
     """Check if score qualifies for leaderboard."""
-    scores = load_scores()
-    if len(scores) < 10:
+    top = _top_scores()
+    if len(top) < TOP_N:
         return True
-    return score > min(s['score'] for s in scores)
+    return score > top[-1]['score']
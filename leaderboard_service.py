@@ -0,0 +1,182 @@
+"""
+Leaderboard service for many concurrent players.
+
+A small asyncio daemon on a Unix socket that owns all leaderboard writes.
+Submissions from every connected client are queued and committed in
+batches (one SQLite transaction per batch, on a database thread so the
+event loop keeps accepting clients meanwhile), and each submitter gets its
+reply only after its score is committed. Subscribed clients are pushed the
+new top 10 whenever it changes, so they never need to poll.
+
+Protocol: newline-delimited JSON requests, one reply line each.
+
+    {"op": "submit", "name": ..., "score": ..., "id": ...}  -> {"ok": true, "top": [...]}
+    {"op": "top", "limit": 10}                              -> {"ok": true, "top": [...]}
+    {"op": "subscribe"}                                     -> {"top": [...]} now and on every change
+
+"id" is optional: a submission whose id is already stored is acknowledged
+without being stored again, so clients can safely resend after a lost reply.
+
+A malformed request, or a submission whose batch failed to commit, gets
+{"ok": false, "error": ...} and the connection stays open.
+
+Clients normally submit through leaderboard.save_score, which talks to
+the service whenever its socket exists and falls back to writing the
+database directly otherwise; leaderboard.get_top_scores always reads the
+database itself. Server and clients find the socket through
+leaderboard.SOCKET_PATH, so a non-default $SNAKE_LEADERBOARD_SOCKET must be
+set for both.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import leaderboard
+
+MAX_BATCH = 5000  # Submissions committed per transaction at most
+SCORE_LIMIT = 2 ** 63  # SQLite integers are signed 64-bit
+
+
+def _submission(request):
+    """(name, score, id) of a submit request; raises ValueError, KeyError or TypeError."""
+    name, score, submission = request['name'], request['score'], request.get('id')
+    if not isinstance(name, str) or isinstance(score, bool) or not isinstance(score, int):
+        raise TypeError('name must be a string and score an integer')
+    if submission is not None and not isinstance(submission, str):
+        raise TypeError('id must be a string')
+    if not -SCORE_LIMIT <= score < SCORE_LIMIT:
+        raise ValueError('score out of range')
+    return name, score, submission
+
+
+def _commit(entries):
+    """Insert a batch and return the new top scores (on the database thread)."""
+    leaderboard.insert_scores(entries)
+    return leaderboard.get_top_scores()
+
+
+class LeaderboardService:
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or leaderboard.SOCKET_PATH
+        self.queue = None
+        self.subscribers = set()
+        self.top = []
+        self.batches = 0
+        self.committed = 0
+        # All database work runs on this one thread (which owns the SQLite
+        # connection), so commits never block the event loop
+        self.database = ThreadPoolExecutor(max_workers=1, thread_name_prefix='leaderboard-db')
+
+    async def _run_db(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.database, fn, *args)
+
+    async def serve(self):
+        """Run until cancelled."""
+        self.queue = asyncio.Queue()
+        self.top = await self._run_db(leaderboard.get_top_scores)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Stale socket from a previous run
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        writer = asyncio.create_task(self._write_batches())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            writer.cancel()
+            self.database.shutdown(wait=False)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request['op']
+                except (ValueError, KeyError, TypeError):
+                    await self._send(writer, {'ok': False, 'error': 'bad request'})
+                    continue
+
+                try:
+                    if op == 'submit':
+                        entry = _submission(request)
+                    elif op == 'top':
+                        limit = int(request.get('limit', leaderboard.TOP_N))
+                except (ValueError, KeyError, TypeError, OverflowError):
+                    await self._send(writer, {'ok': False, 'error': f'bad {op} request'})
+                    continue
+
+                if op == 'submit':
+                    done = loop.create_future()
+                    await self.queue.put((entry, done))
+                    try:
+                        await done
+                    except Exception as e:  # The batch failed to commit
+                        await self._send(writer, {'ok': False, 'error': f'not saved: {e}'})
+                        continue
+                    await self._send(writer, {'ok': True, 'top': self.top})
+                elif op == 'top':
+                    await self._send(writer, {'ok': True, 'top': self.top[:limit]})
+                elif op == 'subscribe':
+                    self.subscribers.add(writer)
+                    await self._send(writer, {'top': self.top})
+                else:
+                    await self._send(writer, {'ok': False, 'error': f'unknown op {op!r}'})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def _send(self, writer, message):
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+
+    async def _write_batches(self):
+        """Commit queued submissions in batches and push top-10 changes."""
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < MAX_BATCH and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                top = await self._run_db(_commit, [entry for entry, _ in batch])
+            except Exception as e:
+                for _, done in batch:
+                    if not done.done():  # Its client may have gone
+                        done.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.committed += len(batch)
+            changed = top != self.top
+            self.top = top
+            for _, done in batch:
+                if not done.done():
+                    done.set_result(None)
+            if changed:
+                self._broadcast({'top': top})
+
+    def _broadcast(self, message):
+        data = json.dumps(message).encode() + b'\n'
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+            else:
+                writer.write(data)
+
+
+def run(socket_path=None):
+    """Run the service in the foreground until interrupted."""
+    service = LeaderboardService(socket_path)
+    print(f"Leaderboard service listening on {service.socket_path}")
+    try:
+        asyncio.run(service.serve())
+    except KeyboardInterrupt:
+        pass
@@ -7,21 +7,33 @@ Controls:
     Q - Quit game
 
 Usage:
-    python main.py [--width WIDTH] [--height HEIGHT] [--speed SPEED]
+    python main.py [--width WIDTH] [--height HEIGHT] [--speed SPEED] [--autopilot]
+    python main.py tournament [--policy NAME ...] [--board WxH ...] [--games N]
+    python main.py arena [--snakes N] [--board WxH] [--policy NAME ...] [--ticks N]
+    python main.py replay FILE [--headless] [--rate RATE] [--seek TICK] [--stream TARGET]
+    python main.py --stream tcp:PORT         # let spectators watch with `nc HOST PORT`
+    python main.py --publish NAME            # export the live board to shared memory
+    python main.py scores [--limit N] [--json]
+    python main.py scores-server             # socket: $SNAKE_LEADERBOARD_SOCKET
+    python main.py serve [--port PORT] [--players N]
+    python main.py join [--host HOST] [--port PORT] [--name NAME]
 """
 
 import argparse
-import curses
 import sys
+import time
 
+# Everything else, curses included, is imported where it is used, so headless
+# subcommands (scores, replay --headless, tournament) start without it.
 from config import BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED
-from game import Game
-from ui import UI
-from leaderboard import get_top_scores
 
 
 def main(stdscr, args):
     """Main application loop."""
+    from game import Game
+    from ui import UI
+    from leaderboard import get_top_scores
+
     # Initialize UI for menu
     ui = UI(stdscr, args.width, args.height)
 
@@ -29,8 +41,17 @@ def main(stdscr, args):
         choice = ui.show_menu()
 
         if choice == 0:  # New Game
-            game = Game(stdscr, args.width, args.height)
+            autopilot = None
+            if args.autopilot:
+                from autopilot import Autopilot
+                autopilot = Autopilot()
+            game = Game(stdscr, args.width, args.height, record_dir=args.record,
+                        profiler=args.profiler, stream=args.spectators, autopilot=autopilot,
+                        publisher=args.publisher)
             game.run()
+            while autopilot and not game.quit:  # Attract mode: play until Q
+                game.reset()
+                game.run()
         elif choice == 1:  # Leaderboard
             scores = get_top_scores()
             ui.show_leaderboard(scores)
@@ -38,6 +59,135 @@ def main(stdscr, args):
             break
 
 
+def parse_board(value):
+    """Parse a WIDTHxHEIGHT board size."""
+    try:
+        width, height = (int(v) for v in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid board size '{value}' (expected WxH)")
+    return width, height
+
+
+def run_replay_command(args):
+    """Re-simulate a recorded game, headlessly or on screen."""
+    from replay import Replay, Player
+
+    player = Player(Replay.load(args.file))
+
+    if args.headless:
+        start = time.perf_counter()
+        engine = player.run()
+        elapsed = time.perf_counter() - start
+        print(f"Score: {engine.score}  Ticks: {engine.tick}  "
+              f"Board: {engine.board_width}x{engine.board_height}  Seed: {engine.seed}")
+        print(f"Re-simulated in {elapsed * 1000:.1f} ms")
+        return
+
+    if args.stream:
+        from stream import AnsiStream, open_sink
+
+        stream = AnsiStream(open_sink(args.stream), player.replay.board_width,
+                            player.replay.board_height)
+        player.seek(args.seek)
+        try:
+            player.stream(stream, args.rate)
+        finally:
+            stream.close()
+        return
+
+    import curses
+    from ui import UI
+
+    def play(stdscr):
+        ui = UI(stdscr, player.replay.board_width, player.replay.board_height)
+        player.seek(args.seek)
+        player.play(ui, args.rate)
+
+    curses.wrapper(play)
+
+
+def run_tournament_command(args):
+    """Run the policy tournament and print the ranking."""
+    from tournament import run_tournament, format_ranking, save_ranking
+
+    def progress(stats):
+        print(f"  {stats.name}: {stats.games} games", flush=True)
+
+    ranking = run_tournament(
+        args.policy or ['random', 'greedy'],
+        args.board or [(BOARD_WIDTH, BOARD_HEIGHT)],
+        args.seed or [0],
+        args.games,
+        workers=args.workers,
+        max_ticks=args.max_ticks,
+        on_result=progress,
+    )
+    print(format_ranking(ranking))
+    if args.save:
+        save_ranking(ranking)
+
+
+def run_arena_command(args):
+    """Run many AI snakes on one board and print crowd statistics."""
+    from arena import Arena
+    from tournament import resolve_policy
+
+    policies = [resolve_policy(spec) for spec in args.policy or ['greedy']]
+    width, height = args.board
+    arena = Arena([policies[i % len(policies)] for i in range(args.snakes)], width, height,
+                  foods=args.foods, seed=args.seed)
+
+    start = last = time.perf_counter()
+    last_tick = 0
+    for tick in range(1, args.ticks + 1):
+        arena.step()
+        if tick % args.report == 0 or tick == args.ticks:
+            now = time.perf_counter()
+            lengths = [len(p.snake.body) for p in arena.live.values()] or [0]
+            print(f"tick {tick:6}: {len(arena.live):5} alive, {arena.deaths:6} deaths "
+                  f"({arena.head_on} head-on), {arena.eaten:6} eaten, length "
+                  f"mean {sum(lengths) / len(lengths):.1f} max {max(lengths)}, "
+                  f"{(now - last) * 1000 / (tick - last_tick):.2f} ms/tick", flush=True)
+            last, last_tick = now, tick
+    elapsed = time.perf_counter() - start
+    best = max([arena.best_score] + [p.score for p in arena.players])
+    print(f"{args.ticks} ticks of {args.snakes} snakes on {width}x{height} in {elapsed:.2f}s "
+          f"({elapsed / args.ticks * 1e6 / args.snakes:.1f} us per snake per tick), "
+          f"best score {best}")
+
+
+def run_scores_command(args):
+    """Print the top scores without starting the game."""
+    from leaderboard import get_top_scores
+
+    scores = get_top_scores(args.limit)
+    if args.json:
+        import json
+        print(json.dumps(scores))
+        return
+    if not scores:
+        print("No scores yet!")
+        return
+    for i, entry in enumerate(scores):
+        print(f"{i + 1:3}. {entry['name'][:20]:20} {entry['score']:6}")
+
+
+def run_join_command(args):
+    """Play one multiplayer match and print the final scores."""
+    import asyncio
+    import curses
+    from multiplayer import play_client
+
+    scores = curses.wrapper(
+        lambda stdscr: asyncio.run(play_client(stdscr, args.host, args.port, args.name))
+    )
+    if scores is None:
+        print("Disconnected before the match ended")
+        return
+    for player_id, score in sorted(scores.items(), key=lambda item: -item[1]):
+        print(f"Player {player_id}: {score}")
+
+
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(
@@ -62,12 +212,239 @@ def parse_args():
         help=f'Initial speed in ms per frame (default: {INITIAL_SPEED})'
     )
 
+    parser.add_argument(
+        '--record',
+        metavar='DIR',
+        default=None,
+        help='Save a replay of every game into DIR'
+    )
+
+    parser.add_argument(
+        '--autopilot',
+        action='store_true',
+        help='Let the path planner play, game after game, until Q (demo/soak test)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Time every frame phase and print a report on exit'
+    )
+    parser.add_argument(
+        '--profile-json',
+        metavar='PATH',
+        default=None,
+        help='With --profile, also write the profile data as JSON to PATH'
+    )
+
+    parser.add_argument(
+        '--stream',
+        metavar='TARGET',
+        default=None,
+        help='Also stream frames as ANSI text to a file or tcp:[HOST:]PORT for spectators'
+    )
+
+    parser.add_argument(
+        '--publish',
+        metavar='NAME',
+        default=None,
+        help='Export the live board every tick to the shared memory segment NAME'
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    replay = subparsers.add_parser('replay', help='Play back a recorded game')
+    replay.add_argument('file', help='Replay file (.snkr)')
+    replay.add_argument(
+        '--headless',
+        action='store_true',
+        help='Re-simulate at full speed and print the result instead of drawing'
+    )
+    replay.add_argument(
+        '--rate', '-r',
+        type=float,
+        default=1.0,
+        help='Playback speed multiplier (default: 1.0)'
+    )
+    replay.add_argument(
+        '--seek',
+        type=int,
+        default=0,
+        metavar='TICK',
+        help='Start playback at this tick (default: 0)'
+    )
+    replay.add_argument(
+        '--stream',
+        metavar='TARGET',
+        default=argparse.SUPPRESS,
+        help='Play back as ANSI text to - (stdout), a file or tcp:[HOST:]PORT instead of curses'
+    )
+
+    arena = subparsers.add_parser(
+        'arena', help='Run hundreds of AI snakes on one board (headless stress test)'
+    )
+    arena.add_argument(
+        '--snakes', '-n',
+        type=int,
+        default=200,
+        help='Number of snakes (default: 200)'
+    )
+    arena.add_argument(
+        '--board', '-b',
+        type=parse_board,
+        default=(200, 200),
+        help='Board size as WxH (default: 200x200)'
+    )
+    arena.add_argument(
+        '--policy', '-p',
+        action='append',
+        help='Built-in policy name or module:function, assigned round-robin (default: greedy)'
+    )
+    arena.add_argument(
+        '--foods',
+        type=int,
+        default=None,
+        help='Foods on the board (default: one per snake)'
+    )
+    arena.add_argument(
+        '--ticks',
+        type=int,
+        default=1000,
+        help='Ticks to run (default: 1000)'
+    )
+    arena.add_argument(
+        '--report',
+        type=int,
+        default=100,
+        metavar='TICKS',
+        help='Print statistics every TICKS ticks (default: 100)'
+    )
+    arena.add_argument('--seed', type=int, default=0, help='Seed (default: 0)')
+
+    scores = subparsers.add_parser('scores', help='Print the leaderboard')
+    scores.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=10,
+        help='Number of scores to show (default: 10)'
+    )
+    scores.add_argument(
+        '--json',
+        action='store_true',
+        help='Print the scores as JSON'
+    )
+
+    subparsers.add_parser(
+        'scores-server',
+        help='Run the shared leaderboard service for concurrent players '
+             '(socket: $SNAKE_LEADERBOARD_SOCKET, default ./leaderboard.sock)'
+    )
+
+    serve = subparsers.add_parser('serve', help='Host multiplayer matches')
+    serve.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    serve.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    serve.add_argument(
+        '--players', '-n',
+        type=int,
+        default=2,
+        help='Players per match (default: 2)'
+    )
+
+    join = subparsers.add_parser('join', help='Join a multiplayer match')
+    join.add_argument('--host', default='127.0.0.1', help='Server address')
+    join.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765)')
+    join.add_argument('--name', default='Player', help='Name shown to other players')
+
+    tournament = subparsers.add_parser(
+        'tournament', help='Compare autopilot policies over many headless games'
+    )
+    tournament.add_argument(
+        '--policy', '-p',
+        action='append',
+        help='Built-in policy name or module:function (repeatable, default: random, greedy)'
+    )
+    tournament.add_argument(
+        '--board', '-b',
+        action='append',
+        type=parse_board,
+        help=f'Board size as WxH (repeatable, default: {BOARD_WIDTH}x{BOARD_HEIGHT})'
+    )
+    tournament.add_argument(
+        '--seed',
+        action='append',
+        type=int,
+        help='Base seed (repeatable, default: 0)'
+    )
+    tournament.add_argument(
+        '--games', '-n',
+        type=int,
+        default=100,
+        help='Games per policy, board and seed (default: 100)'
+    )
+    tournament.add_argument(
+        '--workers', '-j',
+        type=int,
+        default=None,
+        help='Worker processes (default: CPU count)'
+    )
+    tournament.add_argument(
+        '--max-ticks',
+        type=int,
+        default=None,
+        help='Cut games off after this many ticks (default: 50 per board cell)'
+    )
+    tournament.add_argument(
+        '--save',
+        action='store_true',
+        help='Record each policy\'s mean score on the leaderboard'
+    )
+
     return parser.parse_args()
 
 
 if __name__ == '__main__':
     args = parse_args()
 
+    if args.command == 'tournament':
+        run_tournament_command(args)
+        sys.exit(0)
+    if args.command == 'arena':
+        try:
+            run_arena_command(args)
+        except (ImportError, ValueError) as e:
+            print(f"Arena error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    if args.command == 'scores':
+        run_scores_command(args)
+        sys.exit(0)
+    if args.command == 'scores-server':
+        from leaderboard_service import run
+        run()
+        sys.exit(0)
+    if args.command == 'serve':
+        from multiplayer import serve
+        try:
+            serve(args.host, args.port, args.players, args.width, args.height, args.speed)
+        except ValueError as e:
+            print(f"Serve error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    if args.command == 'join':
+        try:
+            run_join_command(args)
+        except OSError as e:
+            print(f"Connection error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    if args.command == 'replay':
+        try:
+            run_replay_command(args)
+        except (OSError, ValueError) as e:
+            print(f"Replay error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
     # Validate arguments
     if args.width < 10:
         print("Error: Width must be at least 10")
@@ -79,6 +456,35 @@ if __name__ == '__main__':
         print("Error: Speed must be at least 10ms")
         sys.exit(1)
 
+    if args.stream == '-':
+        print("Error: --stream - needs a replay; the game itself draws on stdout")
+        sys.exit(1)
+
+    args.profiler = None
+    if args.profile or args.profile_json:
+        from profiler import FrameProfiler
+        args.profiler = FrameProfiler()
+
+    args.spectators = None
+    if args.stream:
+        from stream import AnsiStream, open_sink
+        try:
+            args.spectators = AnsiStream(open_sink(args.stream), args.width, args.height)
+        except (OSError, ValueError) as e:
+            print(f"Stream error: {e}")
+            sys.exit(1)
+
+    args.publisher = None
+    if args.publish:
+        from shared_board import BoardPublisher
+        try:
+            args.publisher = BoardPublisher(args.width, args.height, args.publish)
+        except (OSError, ValueError) as e:
+            print(f"Publish error: {e}")
+            sys.exit(1)
+
+    import curses
+
     try:
         curses.wrapper(lambda stdscr: main(stdscr, args))
     except KeyboardInterrupt:
@@ -87,3 +493,12 @@ if __name__ == '__main__':
         print(f"Terminal error: {e}")
         print("Make sure your terminal window is large enough.")
         sys.exit(1)
+    finally:
+        if args.spectators:
+            args.spectators.close()
+        if args.publisher:
+            args.publisher.close()
+        if args.profiler:
+            print(args.profiler.report())
+            if args.profile_json:
+                args.profiler.dump_json(args.profile_json)
@@ -0,0 +1,427 @@
+"""
+Multiplayer matches over TCP with delta-compressed state broadcast.
+
+One asyncio server hosts many matches. Each match runs the authoritative
+tick loop: snakes move with Snake.move on a wrap-around board, and cell
+ownership lives in one shared sparse map so cross-snake collisions are a
+dict lookup, and each snake keeps sparse flags for its own cells instead of
+a board-sized bitmap. Every tick the server broadcasts only what changed (new
+heads, vacated tails, deaths, food moves, scores), so per-tick cost and
+bandwidth depend on the number of players, not the board size.
+
+Wire format: every frame is a little-endian u16 length followed by the
+payload, whose first byte is the frame type.
+
+    client -> server   HELLO  name (utf-8)
+                       TURN   u8 direction index (UP, DOWN, LEFT, RIGHT)
+    server -> client   WELCOME u8 player id, u16 width, u16 height, u8 players
+                       TICK    u32 tick, then events of (u8 kind, u8 player, u32 cell)
+                       END     (u8 player, u32 score) for every player
+
+Cells are packed as y * width + x (NO_CELL for "none"); SCORE events
+carry the new score in the cell field. The first TICK of a match carries
+every initial snake cell and food as HEAD/FOOD events.
+"""
+
+import asyncio
+import random
+import struct
+import time
+from collections import deque
+
+from config import (
+    UP, DOWN, LEFT, RIGHT, BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SPEED,
+    SNAKE_HEAD, SNAKE_BODY, FOOD_CHAR
+)
+from food import Food
+from frame import EMPTY_CHAR
+from snake import Snake, SparseFlags
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Frame types
+HELLO, TURN, WELCOME, TICK, END = range(5)
+
+# TICK event kinds
+EV_HEAD, EV_TAIL, EV_DEATH, EV_FOOD, EV_SCORE = range(5)
+
+LENGTH = struct.Struct('<H')
+WELCOME_FRAME = struct.Struct('<BBHHB')
+TICK_HEADER = struct.Struct('<BI')
+EVENT = struct.Struct('<BBI')
+END_ENTRY = struct.Struct('<BI')
+NO_CELL = 0xFFFFFFFF
+MAX_SIDE = 0xFFFF  # Board width and height are sent as u16
+MAX_PLAYERS = 0xFF  # Player ids and the player count are sent as u8
+
+SPAWN_TRIES = 32  # Random probes before scanning for a free cell
+INPUT_QUEUE_SIZE = 3
+
+
+def encode_frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_frame(reader):
+    """Read one frame payload; raises IncompleteReadError on disconnect."""
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+class Player:
+    def __init__(self, player_id, name, writer):
+        self.id = player_id
+        self.name = name
+        self.writer = writer
+        self.snake = None
+        self.alive = True
+        self.score = 0
+        self.turns = deque(maxlen=INPUT_QUEUE_SIZE)
+        self.match = None
+
+
+class Match:
+    """Authoritative state and tick loop of one multiplayer match."""
+
+    def __init__(self, players, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 seed=None):
+        self.players = players
+        self.board_width = board_width
+        self.board_height = board_height
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.owners = {}  # (x, y) -> player id, for every snake cell on the board
+        self.foods = [Food() for _ in players]
+        self.food_cells = {}  # (x, y) -> index into foods
+        self.events = []  # Events of the tick being built
+
+        for i, player in enumerate(players):
+            y = (i + 1) * board_height // (len(players) + 1)
+            # Collisions are decided by owners, so the snake only needs flags for
+            # its own cells, not a bitmap the size of the board
+            player.snake = Snake(board_width // 2, y, board_width, board_height,
+                                 occupancy=SparseFlags())
+            for cell in reversed(player.snake.body):
+                self.owners[cell] = player.id
+                self._cell_event(EV_HEAD, player.id, cell)
+        for i in range(len(self.foods)):
+            self._respawn_food(i)
+
+    @property
+    def finished(self):
+        alive = sum(p.alive for p in self.players)
+        return alive == 0 or (alive == 1 and len(self.players) > 1)
+
+    def _event(self, kind, player_id, value):
+        self.events.append(EVENT.pack(kind, player_id, value))
+
+    def _cell_event(self, kind, player_id, cell):
+        self._event(kind, player_id,
+                    NO_CELL if cell is None else cell[1] * self.board_width + cell[0])
+
+    def _free_cell(self):
+        """Random cell not covered by a snake or food, or None if the board is full."""
+        for _ in range(SPAWN_TRIES):
+            cell = (self.rng.randrange(self.board_width), self.rng.randrange(self.board_height))
+            if cell not in self.owners and cell not in self.food_cells:
+                return cell
+        free = [(x, y) for y in range(self.board_height) for x in range(self.board_width)
+                if (x, y) not in self.owners and (x, y) not in self.food_cells]
+        return self.rng.choice(free) if free else None
+
+    def _respawn_food(self, index):
+        food = self.foods[index]
+        if food.position is not None:
+            del self.food_cells[food.position]
+        food.position = self._free_cell()
+        if food.position is not None:
+            self.food_cells[food.position] = index
+        self._cell_event(EV_FOOD, index, food.position)
+
+    def turn(self, player, direction):
+        last = player.turns[-1] if player.turns else player.snake.direction
+        if direction != last and len(player.turns) < INPUT_QUEUE_SIZE:
+            player.turns.append(direction)
+
+    def remove(self, player):
+        """Kill a player's snake and free its cells (also used on disconnect)."""
+        if not player.alive:
+            return
+        player.alive = False
+        for cell in player.snake.body:
+            if self.owners.get(cell) == player.id:
+                del self.owners[cell]
+        self._event(EV_DEATH, player.id, NO_CELL)
+
+    def step(self):
+        """Advance one tick and return the encoded TICK payload."""
+        self.tick += 1
+        alive = [p for p in self.players if p.alive]
+
+        # Move every snake; tails leave before any head arrives
+        heads = {}
+        for player in alive:
+            if player.turns:
+                player.snake.change_direction(player.turns.popleft())
+            vacated = player.snake.move(self.board_width, self.board_height)
+            if vacated is not None:
+                if self.owners.get(vacated) == player.id:
+                    del self.owners[vacated]
+                self._cell_event(EV_TAIL, player.id, vacated)
+            heads.setdefault(player.snake.head, []).append(player)
+
+        # Resolve collisions: into any body, or head-on into another head
+        dead = {
+            p for p in alive
+            if p.snake.head in self.owners or len(heads[p.snake.head]) > 1
+        }
+        for player in alive:
+            if player in dead:
+                self.remove(player)
+            else:
+                self.owners[player.snake.head] = player.id
+                self._cell_event(EV_HEAD, player.id, player.snake.head)
+
+        # Food
+        for player in alive:
+            index = self.food_cells.get(player.snake.head) if player.alive else None
+            if index is not None:
+                player.snake.grow()
+                player.score += 10
+                self._event(EV_SCORE, player.id, player.score)
+                self._respawn_food(index)
+
+        payload = TICK_HEADER.pack(TICK, self.tick) + b''.join(self.events)
+        self.events.clear()
+        return payload
+
+    def end_payload(self):
+        return bytes([END]) + b''.join(END_ENTRY.pack(p.id, p.score) for p in self.players)
+
+
+class MatchServer:
+    """Accepts clients, groups them into matches and runs every match's tick loop."""
+
+    def __init__(self, players_per_match=2, board_width=BOARD_WIDTH, board_height=BOARD_HEIGHT,
+                 tick_ms=INITIAL_SPEED):
+        if not 1 <= players_per_match <= MAX_PLAYERS:
+            raise ValueError(f"players per match must be between 1 and {MAX_PLAYERS}")
+        if not (1 <= board_width <= MAX_SIDE and 1 <= board_height <= MAX_SIDE):
+            raise ValueError(f"board width and height must be between 1 and {MAX_SIDE}")
+        self.players_per_match = players_per_match
+        self.board_width = board_width
+        self.board_height = board_height
+        self.tick_ms = tick_ms
+        self.lobby = []
+        self.matches = set()
+        self.ticks = 0
+        self.tick_seconds = 0.0  # Time spent stepping and broadcasting, for load tests
+        self.bytes_sent = 0
+
+    async def start(self, host='127.0.0.1', port=0):
+        self.server = await asyncio.start_server(self._handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _handle_client(self, reader, writer):
+        player = None
+        try:
+            payload = await read_frame(reader)
+            if not payload or payload[0] != HELLO:
+                return
+            player = Player(0, payload[1:].decode('utf-8', 'replace'), writer)
+            self.lobby.append(player)
+            if len(self.lobby) >= self.players_per_match:
+                players = self.lobby[:self.players_per_match]
+                del self.lobby[:self.players_per_match]
+                asyncio.create_task(self._run_match(players))
+
+            while True:
+                payload = await read_frame(reader)
+                if len(payload) < 2:
+                    return  # Malformed frame: drop the client
+                if payload[0] == TURN and player.match and payload[1] < len(DIRECTIONS):
+                    player.match.turn(player, DIRECTIONS[payload[1]])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if player is not None:
+                if player in self.lobby:
+                    self.lobby.remove(player)
+                elif player.match:
+                    player.match.remove(player)
+            writer.close()
+
+    def _send(self, players, payload):
+        frame = encode_frame(payload)
+        for player in players:
+            if not player.writer.is_closing():
+                player.writer.write(frame)
+                self.bytes_sent += len(frame)
+
+    async def _run_match(self, players):
+        for i, player in enumerate(players):
+            player.id = i
+        match = Match(players, self.board_width, self.board_height)
+        for player in players:
+            player.match = match
+            self._send([player], WELCOME_FRAME.pack(WELCOME, player.id, self.board_width,
+                                                    self.board_height, len(players)))
+        self.matches.add(match)
+
+        loop = asyncio.get_running_loop()
+        interval = self.tick_ms / 1000
+        deadline = loop.time()
+        try:
+            while not match.finished:
+                deadline += interval
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
+                start = time.perf_counter()
+                self._send(players, match.step())
+                self.tick_seconds += time.perf_counter() - start
+                self.ticks += 1
+            self._send(players, match.end_payload())
+        finally:
+            self.matches.discard(match)
+            for player in players:
+                player.match = None
+                player.writer.close()
+
+
+class ClientState:
+    """Client-side mirror of a match, rebuilt from TICK deltas."""
+
+    def __init__(self, player_id, board_width, board_height):
+        self.player_id = player_id
+        self.board_width = board_width
+        self.board_height = board_height
+        self.snakes = {}  # player id -> deque of cells, head first
+        self.owners = {}  # (x, y) -> player id
+        self.foods = {}  # food index -> (x, y)
+        self.food_cells = {}  # (x, y) -> food index
+        self.scores = {}
+        self.tick = 0
+
+    def _cell(self, packed):
+        if packed == NO_CELL:
+            return None
+        return (packed % self.board_width, packed // self.board_width)
+
+    def glyph(self, cell):
+        """Glyph to draw at a cell in the current state."""
+        owner = self.owners.get(cell)
+        if owner is not None:
+            return SNAKE_HEAD if self.snakes[owner][0] == cell else SNAKE_BODY
+        if cell in self.food_cells:
+            return FOOD_CHAR
+        return EMPTY_CHAR
+
+    def cells(self):
+        """Every non-empty cell with its glyph, for a full repaint."""
+        return [(cell, self.glyph(cell)) for cell in (*self.owners, *self.food_cells)]
+
+    def apply(self, payload):
+        """Apply a TICK payload and return the set of cells that changed."""
+        _, self.tick = TICK_HEADER.unpack_from(payload)
+        dirty = set()
+        for offset in range(TICK_HEADER.size, len(payload), EVENT.size):
+            kind, pid, packed = EVENT.unpack_from(payload, offset)
+            if kind == EV_SCORE:
+                self.scores[pid] = packed
+                continue
+
+            cell = self._cell(packed)
+            if kind == EV_HEAD:
+                body = self.snakes.setdefault(pid, deque())
+                if body:
+                    dirty.add(body[0])
+                body.appendleft(cell)
+                self.owners[cell] = pid
+            elif kind == EV_TAIL:
+                self.snakes[pid].pop()
+                if self.owners.get(cell) == pid:
+                    del self.owners[cell]
+            elif kind == EV_DEATH:
+                for body_cell in self.snakes.pop(pid, ()):
+                    if self.owners.get(body_cell) == pid:
+                        del self.owners[body_cell]
+                    dirty.add(body_cell)
+            elif kind == EV_FOOD:
+                old = self.foods.pop(pid, None)
+                if old is not None:
+                    self.food_cells.pop(old, None)
+                    dirty.add(old)
+                if cell is not None:
+                    self.foods[pid] = cell
+                    self.food_cells[cell] = pid
+            dirty.add(cell)
+        dirty.discard(None)
+        return dirty
+
+
+async def connect(host, port, name):
+    """Connect and send HELLO; returns (reader, writer)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode_frame(bytes([HELLO]) + name.encode('utf-8')))
+    await writer.drain()
+    return reader, writer
+
+
+def send_turn(writer, direction):
+    writer.write(encode_frame(bytes([TURN, DIRECTIONS.index(direction)])))
+
+
+async def play_client(stdscr, host, port, name):
+    """Join a match and play it on the terminal; returns {player id: score}."""
+    from game import KEY_DIRECTIONS, QUIT_KEYS
+    from ui import UI
+
+    reader, writer = await connect(host, port, name)
+    try:
+        payload = await read_frame(reader)
+        _, player_id, width, height, _ = WELCOME_FRAME.unpack(payload)
+        state = ClientState(player_id, width, height)
+        ui = UI(stdscr, width, height)
+
+        async def read_keys():
+            while True:
+                for key in ui.get_inputs():
+                    if key in QUIT_KEYS:
+                        writer.close()
+                        return
+                    if key in KEY_DIRECTIONS:
+                        send_turn(writer, KEY_DIRECTIONS[key])
+                await asyncio.sleep(0.01)
+
+        keys = asyncio.create_task(read_keys())
+        try:
+            while True:
+                payload = await read_frame(reader)
+                if payload[0] == END:
+                    return dict(END_ENTRY.iter_unpack(payload[1:]))
+                dirty = state.apply(payload)
+                ui.render_cells([(cell, state.glyph(cell)) for cell in dirty],
+                                state.scores.get(player_id, 0), state.cells)
+        finally:
+            keys.cancel()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    finally:
+        writer.close()
+
+
+def serve(host='127.0.0.1', port=8765, players_per_match=2, board_width=BOARD_WIDTH,
+          board_height=BOARD_HEIGHT, tick_ms=INITIAL_SPEED):
+    """Run a match server in the foreground until interrupted."""
+    server = MatchServer(players_per_match, board_width, board_height, tick_ms)
+
+    async def main():
+        port_bound = await server.start(host, port)
+        print(f"Multiplayer server on {host}:{port_bound}, "
+              f"{players_per_match} players per match")
+        async with server.server:
+            await server.server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
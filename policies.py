@@ -0,0 +1,71 @@
+"""
+Built-in autopilot policies.
+
+A policy is any callable taking an Engine and returning a direction from
+config (or None to keep going). Policies must not draw from engine.rng, so
+that food spawns stay reproducible from the game seed; engine.policy_rng
+is a separate stream for them, seeded from the game seed too.
+"""
+
+from config import UP, DOWN, LEFT, RIGHT, OPPOSITES
+
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+
+
+def next_cell(engine, direction):
+    """Cell the head would enter moving in direction (with wall wrapping)."""
+    x, y = engine.snake.head
+    dx, dy = direction
+    return ((x + dx) % engine.board_width, (y + dy) % engine.board_height)
+
+
+def safe_directions(engine):
+    """Directions whose next cell is not covered by the snake."""
+    snake = engine.snake
+    return [
+        d for d in DIRECTIONS
+        if d != OPPOSITES[snake.direction] and not snake.occupies(next_cell(engine, d))
+    ]
+
+
+def torus_distance(engine, a, b):
+    """Manhattan distance between two cells on the wrap-around board."""
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return min(dx, engine.board_width - dx) + min(dy, engine.board_height - dy)
+
+
+def random_policy(engine):
+    """Move in a random direction that does not collide immediately."""
+    choices = safe_directions(engine)
+    return engine.policy_rng.choice(choices) if choices else None
+
+
+def greedy_policy(engine):
+    """Take the safe step that gets closest to the food."""
+    choices = safe_directions(engine)
+    if not choices:
+        return None
+    food = engine.food.position
+    if food is None:
+        return choices[0]
+    return min(choices, key=lambda d: torus_distance(engine, next_cell(engine, d), food))
+
+
+_autopilot = None
+
+
+def autopilot_policy(engine):
+    """Plan safe paths to the food (see autopilot.py)."""
+    global _autopilot
+    if _autopilot is None:
+        from autopilot import Autopilot
+        _autopilot = Autopilot()
+    return _autopilot(engine)
+
+
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'autopilot': autopilot_policy,
+}
@@ -0,0 +1,164 @@
+"""
+Per-phase frame profiler.
+
+Timings go into fixed-size log-linear histograms (4 sub-buckets per power
+of two), so recording a sample never allocates and percentiles are
+accurate to within about 19%.
+"""
+
+import json
+import time
+
+SUB_BUCKETS = 4
+NUM_BUCKETS = 64 * SUB_BUCKETS
+
+PHASES = ('input', 'update', 'render', 'sleep')
+
+
+def _bucket(value):
+    if value < SUB_BUCKETS:
+        return max(0, value)
+    exponent = value.bit_length() - 1
+    sub = (value >> (exponent - 2)) & (SUB_BUCKETS - 1)
+    return min(NUM_BUCKETS - 1, exponent * SUB_BUCKETS + sub)
+
+
+def _bucket_upper(index):
+    if index < SUB_BUCKETS:
+        return index
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return ((SUB_BUCKETS + sub + 1) << (exponent - 2)) - 1
+
+
+class Histogram:
+    """Fixed-size histogram of non-negative integer samples."""
+
+    def __init__(self):
+        self.buckets = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        self.buckets[_bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile sample."""
+        if not self.count:
+            return 0
+        target = pct / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target and n:
+                return min(_bucket_upper(i), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class _Timer:
+    """Reusable context manager timing a block into a histogram."""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc):
+        self.histogram.add(time.perf_counter_ns() - self.start)
+
+
+class FrameProfiler:
+    """Collects per-phase frame timings, spawn costs and draw counts."""
+
+    def __init__(self):
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.frame = Histogram()  # Input + update + render, without sleep
+        self.spans = {}  # name -> Histogram, for measure()
+        self._timers = {}
+        self.cells_drawn = Histogram()
+        self.chars_drawn = Histogram()
+        self.frames = 0
+        self.ticks = 0
+        self.overruns = 0
+
+    def measure(self, name):
+        """Context manager timing a block under `name` (e.g. 'food_spawn')."""
+        timer = self._timers.get(name)
+        if timer is None:
+            self.spans[name] = Histogram()
+            timer = self._timers[name] = _Timer(self.spans[name])
+        return timer
+
+    def record_frame(self, input_ns, update_ns, render_ns, sleep_ns, ticks, budget_ms):
+        """Record one loop iteration; it overran if its work exceeded budget_ms."""
+        self.phases['input'].add(input_ns)
+        self.phases['update'].add(update_ns)
+        self.phases['render'].add(render_ns)
+        self.phases['sleep'].add(sleep_ns)
+        work = input_ns + update_ns + render_ns
+        self.frame.add(work)
+        self.frames += 1
+        self.ticks += ticks
+        if work > budget_ms * 1_000_000:
+            self.overruns += 1
+
+    def record_draw(self, cells, chars):
+        """Record how many board cells and text characters a render emitted."""
+        self.cells_drawn.add(cells)
+        self.chars_drawn.add(chars)
+
+    def to_dict(self):
+        return {
+            'frames': self.frames,
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'phases_ns': {name: h.summary() for name, h in self.phases.items()},
+            'frame_ns': self.frame.summary(),
+            'spans_ns': {name: h.summary() for name, h in self.spans.items()},
+            'cells_drawn': self.cells_drawn.summary(),
+            'chars_drawn': self.chars_drawn.summary(),
+        }
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self):
+        """Format a text report of the collected data."""
+        def ms(ns):
+            return f"{ns / 1_000_000:9.3f}"
+
+        lines = [
+            f"Frames: {self.frames}  Ticks: {self.ticks}  "
+            f"Overruns: {self.overruns} ({self.overruns / max(1, self.frames) * 100:.1f}%)",
+            '',
+            f"{'phase (ms)':<14}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        rows = list(self.phases.items()) + [('frame work', self.frame)]
+        rows += sorted(self.spans.items())
+        for name, h in rows:
+            s = h.summary()
+            lines.append(f"{name:<14}{ms(s['p50'])} {ms(s['p95'])} {ms(s['p99'])} {ms(s['max'])}"
+                         + (f"   ({s['count']} calls)" if name in self.spans else ''))
+        lines.append('')
+        for name, h in (('cells/frame', self.cells_drawn), ('chars/frame', self.chars_drawn)):
+            s = h.summary()
+            lines.append(f"{name:<14}{s['p50']:>10}{s['p95']:>10}{s['p99']:>10}{s['max']:>10}"
+                         f"   (mean {s['mean']:.1f})")
+        return '\n'.join(lines)
@@ -0,0 +1,200 @@
+"""
+Compact, deterministic game replays.
+
+A game is fully determined by its seed, board size and the ticks on which
+the snake changed direction, so that is all a replay stores:
+
+    header   magic b'SNKR', version, width, height, seed   (struct HEADER)
+    events   varint((tick - previous_tick) << 2 | direction_index) ...
+    footer   varint(0), varint(final_tick)
+
+Tick deltas are always >= 1, so a zero varint unambiguously marks the end.
+"""
+
+import struct
+import time
+
+from config import UP, DOWN, LEFT, RIGHT
+from engine import Engine
+
+MAGIC = b'SNKR'
+VERSION = 1
+HEADER = struct.Struct('<4sBHHQ')
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+DIRECTION_INDEX = {d: i for i, d in enumerate(DIRECTIONS)}
+
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Recorder:
+    """Records the direction changes of a game played on an Engine."""
+
+    def __init__(self, engine):
+        self.board_width = engine.board_width
+        self.board_height = engine.board_height
+        self.seed = engine.seed
+        self._events = bytearray()
+        self._last_tick = engine.tick
+        self._direction = engine.snake.direction
+        self.final_tick = None
+
+    def record(self, engine):
+        """Call after every engine tick."""
+        direction = engine.snake.direction
+        if direction != self._direction:
+            _write_varint(self._events, (engine.tick - self._last_tick) << 2
+                          | DIRECTION_INDEX[direction])
+            self._last_tick = engine.tick
+            self._direction = direction
+
+    def finish(self, engine):
+        """Mark the end of the game (including games quit early)."""
+        self.final_tick = engine.tick
+
+    def to_bytes(self):
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self.board_width,
+                                     self.board_height, self.seed))
+        data += self._events
+        _write_varint(data, 0)
+        _write_varint(data, self.final_tick or 0)
+        return bytes(data)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    """A parsed replay: seed, board size and the list of (tick, direction) events."""
+
+    def __init__(self, board_width, board_height, seed, events, final_tick):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.seed = seed
+        self.events = events
+        self.final_tick = final_tick
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            magic, version, width, height, seed = HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError('Replay is truncated')
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a snake replay (or unsupported version)')
+
+        events = []
+        pos = HEADER.size
+        tick = 0
+        try:
+            while True:
+                value, pos = _read_varint(data, pos)
+                if value == 0:
+                    break
+                tick += value >> 2
+                events.append((tick, DIRECTIONS[value & 3]))
+            final_tick, _ = _read_varint(data, pos)
+        except IndexError:
+            raise ValueError('Replay is truncated')
+        return cls(width, height, seed, events, final_tick)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class Player:
+    """Re-simulates a replay on a fresh Engine, with seeking."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.restart()
+
+    def restart(self):
+        self.engine = Engine(self.replay.board_width, self.replay.board_height,
+                             seed=self.replay.seed)
+        self._next_event = 0
+
+    @property
+    def done(self):
+        return self.engine.game_over or self.engine.tick >= self.replay.final_tick
+
+    def step(self):
+        """Advance one tick, applying any direction change recorded for it."""
+        events = self.replay.events
+        action = None
+        if self._next_event < len(events) and events[self._next_event][0] == self.engine.tick + 1:
+            action = events[self._next_event][1]
+            self._next_event += 1
+        self.engine.step(action)
+
+    def seek(self, tick):
+        """Jump to a tick; seeking backwards re-simulates from the start."""
+        if tick < self.engine.tick:
+            self.restart()
+        while self.engine.tick < tick and not self.done:
+            self.step()
+
+    def run(self):
+        """Re-simulate to the end at full speed and return the final Engine."""
+        while not self.done:
+            self.step()
+        return self.engine
+
+    def play(self, ui, rate=1.0):
+        """Render the replay through UI at `rate` times real speed.
+
+        Keys: SPACE pause, +/- change rate, LEFT/RIGHT seek 50 ticks, Q quit.
+        """
+        import curses
+
+        paused = False
+        while True:
+            key = ui.get_input()
+            if key in (ord('q'), ord('Q')):
+                break
+            elif key == ord(' '):
+                paused = not paused
+            elif key in (ord('+'), ord('=')):
+                rate *= 2
+            elif key == ord('-'):
+                rate /= 2
+            elif key in (curses.KEY_LEFT, curses.KEY_RIGHT):
+                offset = 50 if key == curses.KEY_RIGHT else -50
+                self.seek(max(0, self.engine.tick + offset))
+                ui.invalidate()
+
+            if not paused and not self.done:
+                self.step()
+
+            engine = self.engine
+            ui.render(engine.snake, engine.food, engine.score, engine.bonus_food, now=engine.now)
+            time.sleep(engine.speed / 1000 / rate)
+
+    def stream(self, stream, rate=1.0):
+        """Write the replay to an AnsiStream at `rate` times real speed (no curses)."""
+        while True:
+            engine = self.engine
+            stream.render(engine.snake, engine.food, engine.score, engine.bonus_food,
+                          now=engine.now)
+            if self.done:
+                break
+            time.sleep(engine.speed / 1000 / rate)
+            self.step()
@@ -0,0 +1,68 @@
+"""
+Game-time event scheduler.
+
+Timed things (bonus food expiry, future power-ups) register a callback for
+a time on the engine's game clock instead of being checked every tick.
+Events wait in a heap keyed by due time, so advancing the clock costs one
+comparison when nothing is due and O(log n) per event fired, however many
+timers are pending. Events due at the same time fire in the order they
+were scheduled. Because the clock is game time, timers pause with the
+game, follow fast-forward and seeking, and replay deterministically.
+"""
+
+import heapq
+import itertools
+
+
+class Event:
+    """Handle for a scheduled callback; cancel() stops it from firing."""
+
+    __slots__ = ('due', 'callback', 'cancelled')
+
+    def __init__(self, due, callback):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self._heap = []  # (due, sequence, event)
+        self._sequence = itertools.count()
+
+    def __len__(self):
+        return sum(not event.cancelled for _, _, event in self._heap)
+
+    def schedule(self, due, callback):
+        """Call callback() once the clock reaches due (game ms); returns an Event."""
+        event = Event(due, callback)
+        heapq.heappush(self._heap, (due, next(self._sequence), event))
+        return event
+
+    def next_due(self):
+        """Due time of the earliest pending event, or None."""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def advance(self, clock):
+        """Fire every event due at or before clock, earliest first; returns how many fired.
+
+        Callbacks may schedule further events, including ones already due.
+        """
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= clock:
+            _, _, event = heapq.heappop(heap)
+            if not event.cancelled:
+                event.cancelled = True  # Fired events cannot be cancelled again
+                event.callback()
+                fired += 1
+        return fired
+
+    def clear(self):
+        self._heap.clear()
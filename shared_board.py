@@ -0,0 +1,279 @@
+"""
+Live board export through shared memory.
+
+BoardPublisher owns a `multiprocessing.shared_memory` segment that the game
+rewrites in place every tick; BoardReader attaches to it by name from any
+process on the host. Nothing is pickled, copied or sent over a socket: a
+reader looks at the same pages the game writes.
+
+Layout (native byte order; a segment never leaves the host):
+
+    offset  0   header (HEADER_SIZE bytes, see _HEADER)
+                  magic 'SNKB', layout version, header size,
+                  seq (u64 at offset 8), width, height, ring capacity,
+                  snake length, tick, clock (ms), score, ring index of
+                  the head, food cell, bonus top-left cell, bonus size,
+                  bonus ms remaining, speed (ms/tick), flags
+    offset 128  occupancy bitmap, one bit per board cell (bit cell & 7 of
+                byte cell >> 3), set where the snake's body is
+    after that  snake ring buffer, capacity u32 cells (8-byte aligned);
+                body[i] = ring[(head_index - i) % capacity], head first
+
+Cells are packed as y * width + x, as in snake.py; an absent food or bonus
+is -1. Each tick only the new head, the vacated tail and the header are
+written, so publishing costs the same on any board size.
+
+Consistency is a seqlock: the publisher makes seq odd, writes, then makes
+it even again. A reader notes an even seq, reads what it needs, and keeps
+the result only if seq has not moved meanwhile; otherwise it retries. This
+relies on stores becoming visible in program order, as they do on x86-64.
+"""
+
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+MAGIC = b'SNKB'
+LAYOUT_VERSION = 1
+HEADER_SIZE = 128
+SEQ_OFFSET = 8
+SPIN_LIMIT = 32  # Busy reads while the publisher is writing before yielding the CPU
+
+FLAG_GAME_OVER = 1
+FLAG_WON = 2
+
+_SEQ = struct.Struct('=Q')
+# magic, version, header size, (seq), width, height, capacity, length, tick, clock,
+# score, head index, food, bonus, bonus size, bonus ms, speed, flags
+_HEADER = struct.Struct('=4sHH8xIIIIQQqIiiIIIB')
+_FRAME_OFFSET = 28  # Per-tick fields start at length
+_FRAME = struct.Struct('=IQQqIiiIIIB')
+
+BoardSnapshot = namedtuple('BoardSnapshot', [
+    'seq', 'width', 'height', 'length', 'tick', 'clock', 'score', 'head_index',
+    'food', 'bonus', 'bonus_size', 'bonus_ms', 'speed', 'game_over', 'won',
+])
+
+
+def segment_size(width, height):
+    """Bytes needed for a width x height board."""
+    return _ring_offset(width * height) + width * height * 4
+
+
+def _ring_offset(cells):
+    return (HEADER_SIZE + ((cells + 7) >> 3) + 7) & ~7
+
+
+def _views(buf, width, height):
+    """(occupancy bitmap, ring) memoryviews into a segment's buffer."""
+    cells = width * height
+    ring_offset = _ring_offset(cells)
+    occupancy = buf[HEADER_SIZE:HEADER_SIZE + ((cells + 7) >> 3)]
+    ring = buf[ring_offset:ring_offset + cells * 4].cast('I')
+    return occupancy, ring
+
+
+def attach(name):
+    """Open an existing segment without letting this process unlink it at exit.
+
+    Also used by env.py's workers, which attach to their parent's buffers.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 attaching registers the segment with the resource
+    # tracker, which unlinks it when the reader exits; skip the registration
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class BoardPublisher:
+    """Writes an engine's board into a new shared memory segment every tick.
+
+    `name` is the segment name readers attach to (random if omitted);
+    creating a name that already exists raises FileExistsError. Call
+    close() to unmap and remove the segment.
+    """
+
+    def __init__(self, width, height, name=None):
+        if width * height >= 1 << 31:
+            raise ValueError(f'board {width}x{height} is too large to publish')
+        self.width = width
+        self.height = height
+        self.capacity = width * height
+        self._shm = shared_memory.SharedMemory(name, create=True,
+                                               size=segment_size(width, height))
+        self._buf = self._shm.buf
+        self._occupancy, self._ring = _views(self._buf, width, height)
+        self._seq = 0
+        _HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, HEADER_SIZE, width, height,
+                          self.capacity, 0, 0, 0, 0, 0, -1, -1, 0, 0, 0, 0)
+        self._snake = None  # Snake whose body the ring holds
+        self._tick = 0
+        self._length = 0
+        self._head_index = 0
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def publish(self, engine):
+        """Write the engine's current state into the segment.
+
+        After exactly one tick of the same game only the cells that changed
+        are written; anything else (a new game, skipped ticks) rewrites the
+        whole body.
+        """
+        snake = engine.snake
+        buf = self._buf
+        self._seq += 1
+        _SEQ.pack_into(buf, SEQ_OFFSET, self._seq)  # Odd: write in progress
+
+        if snake is self._snake and engine.tick == self._tick + 1:
+            self._advance(snake)
+        else:
+            self._rewrite(snake)
+        self._snake = snake
+        self._tick = engine.tick
+
+        bonus = engine.bonus_food
+        bonus_cell, bonus_ms = -1, 0
+        if bonus.active:
+            bonus_cell = snake.pack(bonus.position)
+            bonus_ms = int(bonus.get_time_remaining(engine.now) * 1000)
+        food = engine.food.position
+        flags = (engine.game_over and FLAG_GAME_OVER) | (engine.won and FLAG_WON)
+        _FRAME.pack_into(buf, _FRAME_OFFSET, self._length, engine.tick, engine.clock,
+                         engine.score, self._head_index,
+                         -1 if food is None else snake.pack(food), bonus_cell,
+                         bonus.size, bonus_ms, engine.speed, flags)
+
+        self._seq += 1
+        _SEQ.pack_into(buf, SEQ_OFFSET, self._seq)
+
+    def _advance(self, snake):
+        """Apply one move: clear the vacated tail (if any), then push the new head."""
+        occupancy, ring, capacity = self._occupancy, self._ring, self.capacity
+        length = len(snake.body)
+        # The new body ends one cell later; cells from the old tail up to that are vacated
+        first = self._head_index - self._length + 1
+        for index in range(first, first + self._length - length + 1):
+            cell = ring[index % capacity]
+            occupancy[cell >> 3] &= ~(1 << (cell & 7))
+        head = snake.pack(snake.head)
+        self._head_index = (self._head_index + 1) % capacity
+        ring[self._head_index] = head
+        occupancy[head >> 3] |= 1 << (head & 7)
+        self._length = length
+
+    def _rewrite(self, snake):
+        occupancy, ring = self._occupancy, self._ring
+        occupancy[:] = bytes(len(occupancy))
+        width = self.width
+        index = -1
+        for index, (x, y) in enumerate(reversed(snake.body)):  # Tail first
+            cell = y * width + x
+            ring[index] = cell
+            occupancy[cell >> 3] |= 1 << (cell & 7)
+        self._head_index = max(index, 0)
+        self._length = index + 1
+
+    def close(self):
+        """Unmap and remove the segment; attached readers keep their mapping."""
+        self._occupancy.release()
+        self._ring.release()
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+class BoardReader:
+    """Attaches to a published board by segment name.
+
+    `occupancy` (bitmap) and `ring` (cells) are zero-copy memoryviews of
+    the live segment, so they change under the reader; only what is read
+    inside read()'s callback is guaranteed to belong to one tick. NumPy
+    users can wrap them with numpy.frombuffer without copying.
+    """
+
+    def __init__(self, name):
+        self._shm = attach(name)
+        self._buf = self._shm.buf
+        magic, version, header_size, width, height, capacity = (
+            _HEADER.unpack_from(self._buf)[:6])
+        if magic != MAGIC or version != LAYOUT_VERSION or header_size != HEADER_SIZE:
+            self._shm.close()
+            raise ValueError(f"'{name}' is not a published snake board (layout {version})")
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.occupancy, self.ring = _views(self._buf, width, height)
+        self.retries = 0  # Reads discarded because the publisher was writing
+
+    def read(self, fn=None):
+        """Return (BoardSnapshot, fn(self, snapshot)) from a single tick.
+
+        fn may read `occupancy` and `ring` (see body() and occupied()); it
+        is called again if the publisher wrote meanwhile, so it must not
+        have side effects. Without fn the second item is None.
+        """
+        buf = self._buf
+        spins = 0
+        while True:
+            seq = _SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if not seq & 1:
+                fields = _FRAME.unpack_from(buf, _FRAME_OFFSET)
+                snapshot = BoardSnapshot(seq, self.width, self.height, *fields[:-1],
+                                         bool(fields[-1] & FLAG_GAME_OVER),
+                                         bool(fields[-1] & FLAG_WON))
+                try:
+                    result = fn(self, snapshot) if fn else None
+                except Exception:
+                    if _SEQ.unpack_from(buf, SEQ_OFFSET)[0] == seq:
+                        raise
+                    result = None  # A torn read tripped up fn; retry it
+                if _SEQ.unpack_from(buf, SEQ_OFFSET)[0] == seq:
+                    return snapshot, result
+                self.retries += 1
+            spins += 1
+            if spins == SPIN_LIMIT:  # The publisher may be descheduled mid-write
+                time.sleep(0)
+                spins = 0
+
+    def wait(self, since, timeout=None, interval=0.001):
+        """Poll until seq differs from `since`; returns read() or None on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while _SEQ.unpack_from(self._buf, SEQ_OFFSET)[0] == since:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+        return self.read()
+
+    def unpack(self, cell):
+        y, x = divmod(cell, self.width)
+        return x, y
+
+    def body(self, snapshot):
+        """Snake cells (x, y), head first, as of snapshot (call within read())."""
+        ring, capacity = self.ring, self.capacity
+        head = snapshot.head_index
+        return [self.unpack(ring[(head - i) % capacity]) for i in range(snapshot.length)]
+
+    def occupied(self, x, y):
+        """Whether the snake's body covers (x, y) (call within read())."""
+        cell = y * self.width + x
+        return bool(self.occupancy[cell >> 3] >> (cell & 7) & 1)
+
+    def close(self):
+        """Detach; the segment stays until the publisher closes it."""
+        self.occupancy.release()
+        self.ring.release()
+        self._buf = None
+        self._shm.close()
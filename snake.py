@@ -1,55 +1,220 @@
+from array import array
+
 from config import UP, DOWN, LEFT, RIGHT, OPPOSITES, BOARD_WIDTH, BOARD_HEIGHT
 
+MIN_CAPACITY = 16  # Initial ring buffer size; doubled whenever the snake outgrows it
+BITMAP_CELLS = 1 << 28  # Largest board with an occupancy bitmap (32 MB); a set beyond
+
+
+class _Bitmap:
+    """One occupancy bit per board cell, indexed by packed cell."""
+
+    __slots__ = ('bits',)
+
+    def __init__(self, cells):
+        self.bits = bytearray((cells + 7) >> 3)
+
+    def __getitem__(self, cell):
+        return self.bits[cell >> 3] >> (cell & 7) & 1
+
+    def __setitem__(self, cell, flag):
+        if flag:
+            self.bits[cell >> 3] |= 1 << (cell & 7)
+        else:
+            self.bits[cell >> 3] &= ~(1 << (cell & 7))
+
+
+class SparseFlags(set):
+    """Occupancy flags kept as a set of packed cells, indexed like a bitmap.
+
+    Used for boards too large for a bitmap, and by snakes that should not
+    pay for one (see multiplayer.py).
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, cell):
+        return cell in self
+
+    def __setitem__(self, cell, flag):
+        if flag:
+            self.add(cell)
+        else:
+            self.discard(cell)
+
+
+class SnakeBody:
+    """Read-only sequence view of a snake's cells, head first.
+
+    Cells are unpacked into (x, y) tuples only as they are read, so
+    iterating or indexing the body never copies the whole snake.
+    """
+
+    __slots__ = ('_snake',)
+
+    def __init__(self, snake):
+        self._snake = snake
+
+    def __len__(self):
+        return self._snake._length
+
+    def __getitem__(self, index):
+        snake = self._snake
+        length = snake._length
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('snake body index out of range')
+        cells = snake._cells
+        return snake.unpack(cells[(snake._start + index) % len(cells)])
+
+    def __iter__(self):
+        snake = self._snake
+        cells, width = snake._cells, snake.width
+        capacity = len(cells)
+        start = snake._start
+        for i in range(snake._length):
+            y, x = divmod(cells[(start + i) % capacity], width)
+            yield x, y
+
+    def __reversed__(self):
+        snake = self._snake
+        cells, width = snake._cells, snake.width
+        capacity = len(cells)
+        start = snake._start
+        for i in range(snake._length - 1, -1, -1):
+            y, x = divmod(cells[(start + i) % capacity], width)
+            yield x, y
+
+    def __contains__(self, cell):
+        return self._snake.occupies(cell)
+
+    def __repr__(self):
+        return f'SnakeBody({list(self)!r})'
+
 
 class Snake:
-    def __init__(self, start_x=None, start_y=None):
+    """The snake, stored compactly for boards with millions of cells.
+
+    Cells are packed as y * width + x into an array('I') ring buffer (4
+    bytes per segment), with the head moving backwards through it, and
+    occupancy is one bit per board cell (a set of packed cells on boards
+    over BITMAP_CELLS). `body` is a lazy SnakeBody view. The board size is
+    fixed when the snake is created; positions always wrap around it.
+
+    `occupancy` replaces the private occupancy map with any object indexed
+    the same way, so many snakes can mark one shared grid (see arena.py) or
+    keep sparse flags whatever the board size (see multiplayer.py).
+    """
+
+    __slots__ = ('width', 'height', '_cells', '_start', '_length', '_occupied',
+                 '_head_x', '_head_y', '_self_collision', 'direction', '_grow_pending', 'body')
+
+    def __init__(self, start_x=None, start_y=None, width=BOARD_WIDTH, height=BOARD_HEIGHT,
+                 occupancy=None):
         # Start in the middle of the board
         if start_x is None:
-            start_x = BOARD_WIDTH // 2
+            start_x = width // 2
         if start_y is None:
-            start_y = BOARD_HEIGHT // 2
-
-        # Initial snake: 3 segments, moving right
-        self.body = [
-            (start_x, start_y),      # Head
-            (start_x - 1, start_y),  # Body
-            (start_x - 2, start_y),  # Tail
-        ]
+            start_y = height // 2
+
+        self.width = width
+        self.height = height
+        self._cells = array('I' if width * height <= 1 << 32 else 'Q', [0]) * MIN_CAPACITY
+        self._start = 0  # Ring buffer index of the head
+        self._length = 0
+        # Cells currently covered by the body, kept in sync by move()
+        if occupancy is None:
+            occupancy = (_Bitmap(width * height) if width * height <= BITMAP_CELLS
+                         else SparseFlags())
+        self._occupied = occupancy
+        self.body = SnakeBody(self)
+
+        # Initial snake: 3 segments, moving right (appended tail first)
+        for dx in (2, 1, 0):
+            self._push_head((start_x - dx) % width, start_y % height)
+        self._self_collision = False
         self.direction = RIGHT
         self._grow_pending = False
 
+    def pack(self, cell):
+        x, y = cell
+        return y * self.width + x
+
+    def unpack(self, packed):
+        y, x = divmod(packed, self.width)
+        return x, y
+
     @property
     def head(self):
-        return self.body[0]
+        return self._head_x, self._head_y
+
+    @property
+    def tail(self):
+        cells = self._cells
+        return self.unpack(cells[(self._start + self._length - 1) % len(cells)])
+
+    @property
+    def growing(self):
+        """Whether the next move keeps the tail (the snake has just eaten)."""
+        return self._grow_pending
+
+    def occupies(self, cell):
+        """Check if a cell is covered by the snake's body (O(1))."""
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return bool(self._occupied[y * self.width + x])
 
     def change_direction(self, new_direction):
         """Change direction if not opposite to current."""
         if new_direction in OPPOSITES and OPPOSITES[new_direction] != self.direction:
             self.direction = new_direction
 
-    def move(self, width=None, height=None):
-        """Move the snake in the current direction with wall wrapping."""
-        head_x, head_y = self.head
-        dx, dy = self.direction
-        new_x = head_x + dx
-        new_y = head_y + dy
-
-        # Wrap around walls if dimensions provided
-        if width is not None:
-            new_x = new_x % width
-        if height is not None:
-            new_y = new_y % height
+    def _push_head(self, x, y):
+        cells = self._cells
+        if self._length == len(cells):
+            # Unroll into a buffer twice the size, head first
+            start = self._start
+            cells = cells[start:] + cells[:start]
+            cells.extend(cells)
+            self._cells = cells
+            self._start = 0
+        packed = y * self.width + x
+        self._start = (self._start - 1) % len(cells)
+        cells[self._start] = packed
+        self._length += 1
+        self._head_x, self._head_y = x, y
+        self._occupied[packed] = 1
 
-        new_head = (new_x, new_y)
+    def move(self, width=None, height=None):
+        """Move the snake in the current direction with wall wrapping.
 
-        # Insert new head
-        self.body.insert(0, new_head)
+        Returns the tail cell vacated by this move, or None if the snake grew.
+        The arguments are accepted for compatibility; the snake wraps on the
+        board size it was created with.
+        """
+        dx, dy = self.direction
+        new_x = (self._head_x + dx) % self.width
+        new_y = (self._head_y + dy) % self.height
 
-        # Remove tail unless growing
+        # Remove tail unless growing (before the collision test, so the head
+        # may follow directly into the cell the tail just left)
+        vacated = None
         if self._grow_pending:
             self._grow_pending = False
         else:
-            self.body.pop()
+            cells = self._cells
+            self._length -= 1
+            packed = cells[(self._start + self._length) % len(cells)]
+            self._occupied[packed] = 0
+            vacated = self.unpack(packed)
+
+        # Insert new head
+        self._self_collision = bool(self._occupied[new_y * self.width + new_x])
+        self._push_head(new_x, new_y)
+
+        return vacated
 
     def grow(self):
         """Mark snake to grow on next move."""
@@ -62,7 +227,7 @@ class Snake:
 
     def check_self_collision(self):
         """Check if snake hit itself."""
-        return self.head in self.body[1:]
+        return self._self_collision
 
     def check_collision(self, width, height):
         """Check for any collision."""
@@ -0,0 +1,210 @@
+"""
+Curses-free ANSI spectator output.
+
+AnsiStream renders the same screen as UI (layout.py), but as raw ANSI
+escape sequences: the chrome once, then for every frame only a cursor
+move and the glyph of each changed cell, plus the score when it changes.
+Each frame is encoded into one buffer and handed to a sink in a single
+write, so frame size depends on what changed, not on the board size.
+
+Sinks:
+    '-'               stdout
+    PATH              a file (view it later with `cat`, or follow with `tail -f`)
+    tcp:[HOST:]PORT   a listening socket; every connected spectator gets a full
+                      snapshot on connect and the per-frame deltas after that
+                      (`nc HOST PORT` in a terminal to watch)
+"""
+
+import socket
+import sys
+
+import layout
+from config import SNAKE_HEAD, SNAKE_BODY, FOOD_CHAR, BONUS_FOOD_CHAR
+from frame import BoardFrame, EMPTY_CHAR
+
+CLEAR = '\x1b[2J'
+HIDE_CURSOR = '\x1b[?25l'
+SHOW_CURSOR = '\x1b[?25h'
+
+# SGR sequences, each resetting first so attributes never leak between styles
+STYLES = {
+    'ui': '\x1b[0;36m',
+    'border': '\x1b[0;33m',
+    'bonus': '\x1b[0;1;35m',
+    SNAKE_HEAD: '\x1b[0;32m',
+    SNAKE_BODY: '\x1b[0;32m',
+    FOOD_CHAR: '\x1b[0;31m',
+    BONUS_FOOD_CHAR: '\x1b[0;1;35m',
+    EMPTY_CHAR: '\x1b[0m',
+}
+
+MAX_BACKLOG = 1 << 20  # Bytes queued for a spectator before it is dropped as too slow
+
+
+class _Buffer:
+    """Accumulates one frame, skipping redundant cursor moves and style changes."""
+
+    def __init__(self):
+        self.parts = []
+        self.cursor = None
+        self.style = None
+
+    def put(self, row, col, text, style):
+        if self.cursor != (row, col):
+            self.parts.append(f'\x1b[{row + 1};{col + 1}H')
+        if self.style != style:
+            self.parts.append(STYLES[style])
+            self.style = style
+        self.parts.append(text)
+        self.cursor = (row, col + len(text))
+
+    def raw(self, text):
+        self.parts.append(text)
+
+    def encode(self):
+        if self.style not in (None, EMPTY_CHAR):
+            self.parts.append(STYLES[EMPTY_CHAR])
+        return ''.join(self.parts).encode('utf-8')
+
+
+class AnsiStream:
+    """Renders game frames as ANSI deltas into a sink (see open_sink)."""
+
+    def __init__(self, sink, board_width, board_height):
+        self.sink = sink
+        self.board_width = board_width
+        self.board_height = board_height
+        self.frame = BoardFrame()
+        self._chrome_sent = False
+        self._last_score = None
+        self._bonus_shown = False
+        self.frames = 0
+        self.bytes_written = 0
+
+    def invalidate(self):
+        """Force the next frame to repaint the whole screen."""
+        self._chrome_sent = False
+
+    def _draw_chrome(self, out):
+        out.raw(HIDE_CURSOR + STYLES[EMPTY_CHAR] + CLEAR)
+        for row, col, text, style in layout.chrome(self.board_width, self.board_height):
+            out.put(row, col, text, style)
+        out.put(*layout.controls_line(self.board_width, self.board_height), 'ui')
+
+    def render(self, snake, food, score, bonus_food=None, now=None):
+        """Encode one frame and write it to the sink."""
+        out = _Buffer()
+        if not self._chrome_sent:
+            self._draw_chrome(out)
+            self.frame.invalidate()
+            self._last_score = None
+            self._chrome_sent = True
+
+        # Row-major order lets runs of adjacent cells share one cursor move
+        for (x, y), glyph in sorted(self.frame.diff(snake, food, bonus_food),
+                                    key=lambda change: (change[0][1], change[0][0])):
+            out.put(*layout.cell_position(x, y), glyph, glyph)
+
+        bonus_active = bool(bonus_food and bonus_food.active)
+        if score != self._last_score or (self._bonus_shown and not bonus_active):
+            out.put(*layout.score_line(self.board_width, score), 'ui')
+            self._last_score = score
+        if bonus_active:
+            out.put(*layout.bonus_timer(self.board_width, bonus_food.get_time_remaining(now)),
+                    'bonus')
+        self._bonus_shown = bonus_active
+
+        data = out.encode()
+        self.frames += 1
+        self.bytes_written += len(data)
+        self.sink.send(data, self.snapshot)
+
+    def snapshot(self):
+        """The whole current screen, for spectators joining mid-game."""
+        out = _Buffer()
+        self._draw_chrome(out)
+        out.put(*layout.score_line(self.board_width, self._last_score or 0), 'ui')
+        for (x, y), glyph in sorted(self.frame.cells.items(),
+                                    key=lambda item: (item[0][1], item[0][0])):
+            out.put(*layout.cell_position(x, y), glyph, glyph)
+        return out.encode()
+
+    def close(self):
+        """Leave the cursor below the board and close the sink."""
+        rows, _ = layout.screen_size(self.board_width, self.board_height)
+        restore = f'{STYLES[EMPTY_CHAR]}\x1b[{rows + 1};1H{SHOW_CURSOR}'
+        self.sink.send(restore.encode(), lambda: b'')
+        self.sink.close()
+
+
+class FileSink:
+    def __init__(self, file, close_file=False):
+        self.file = file
+        self.close_file = close_file
+
+    def send(self, data, snapshot):
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self):
+        if self.close_file:
+            self.file.close()
+
+
+class BroadcastSink:
+    """Non-blocking TCP fan-out to any number of spectators."""
+
+    def __init__(self, host, port):
+        self.listener = socket.create_server((host, port))
+        self.listener.setblocking(False)
+        self.viewers = {}  # socket -> bytearray of unsent output
+
+    def _accept(self, snapshot):
+        while True:
+            try:
+                viewer, _ = self.listener.accept()
+            except BlockingIOError:
+                return
+            viewer.setblocking(False)
+            self.viewers[viewer] = bytearray(snapshot())
+
+    def send(self, data, snapshot):
+        for viewer, backlog in self.viewers.items():
+            backlog += data
+        self._accept(snapshot)
+
+        for viewer, backlog in list(self.viewers.items()):
+            try:
+                sent = viewer.send(backlog)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                self._drop(viewer)
+                continue
+            del backlog[:sent]
+            if len(backlog) > MAX_BACKLOG:
+                self._drop(viewer)
+
+    def _drop(self, viewer):
+        del self.viewers[viewer]
+        viewer.close()
+
+    def close(self):
+        for viewer in list(self.viewers):
+            try:
+                viewer.setblocking(True)
+                viewer.sendall(self.viewers[viewer])
+            except OSError:
+                pass
+            self._drop(viewer)
+        self.listener.close()
+
+
+def open_sink(target):
+    """Open a sink from a --stream target: '-', a file path or tcp:[HOST:]PORT."""
+    if target == '-':
+        return FileSink(sys.stdout.buffer)
+    if target.startswith('tcp:'):
+        host, _, port = target[len('tcp:'):].rpartition(':')
+        return BroadcastSink(host or '127.0.0.1', int(port))
+    return FileSink(open(target, 'wb'), close_file=True)
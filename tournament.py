@@ -0,0 +1,155 @@
+"""
+Tournament runner for autopilot policies.
+
+Games are played headlessly with Engine and spread over a process pool in
+chunks. Each (policy, board, seed) combination plays the same sequence of
+game seeds, so policies are compared on identical food spawns.
+"""
+
+import importlib
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import Engine
+from policies import POLICIES
+
+
+def resolve_policy(spec):
+    """Look up a built-in policy name or import a 'module:function' spec."""
+    if spec in POLICIES:
+        return POLICIES[spec]
+    module_name, sep, attr = spec.partition(':')
+    if not sep:
+        raise ValueError(f"Unknown policy '{spec}' (use a built-in name or module:function)")
+    module = importlib.import_module(module_name)
+    if not hasattr(module, attr):
+        raise ValueError(f"Module '{module_name}' has no policy '{attr}'")
+    return getattr(module, attr)
+
+
+def play_game(policy, board_width, board_height, seed, max_ticks=None):
+    """Play one headless game and return its result dict.
+
+    Games are cut off after max_ticks (default 50 ticks per board cell) so
+    a policy that circles forever cannot stall the tournament.
+    """
+    max_ticks = max_ticks or board_width * board_height * 50
+    engine = Engine(board_width, board_height, seed=seed)
+    start = time.perf_counter()
+    done = False
+    while not done and engine.tick < max_ticks:
+        _, _, done = engine.step(policy(engine))
+    return {
+        'score': engine.score,
+        'ticks': engine.tick,
+        'won': engine.won,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def _play_chunk(policy_spec, jobs, max_ticks):
+    """Worker entry point: play a chunk of (width, height, seed) jobs."""
+    policy = resolve_policy(policy_spec)
+    return policy_spec, [play_game(policy, w, h, seed, max_ticks) for w, h, seed in jobs]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+class PolicyStats:
+    """Running aggregate of one policy's results."""
+
+    def __init__(self, name):
+        self.name = name
+        self.scores = []
+        self.ticks = 0
+        self.wins = 0
+        self.seconds = 0.0
+
+    def add(self, result):
+        self.scores.append(result['score'])
+        self.ticks += result['ticks']
+        self.wins += result['won']
+        self.seconds += result['seconds']
+
+    @property
+    def games(self):
+        return len(self.scores)
+
+    def summary(self):
+        scores = sorted(self.scores)
+        games = len(scores) or 1
+        return {
+            'policy': self.name,
+            'games': len(scores),
+            'mean_score': sum(scores) / games,
+            'p50_score': percentile(scores, 50),
+            'p90_score': percentile(scores, 90),
+            'p99_score': percentile(scores, 99),
+            'max_score': scores[-1] if scores else 0,
+            'mean_ticks': self.ticks / games,
+            'win_rate': self.wins / games,
+            'ticks_per_second': self.ticks / self.seconds if self.seconds else 0.0,
+        }
+
+
+def run_tournament(policies, boards, seeds, games, workers=None, chunk_size=16,
+                   max_ticks=None, on_result=None):
+    """Play every policy on every board/seed and return summaries ranked by mean score.
+
+    boards is a list of (width, height); each (board, seed) plays `games`
+    games with seeds seed, seed + 1, ... on_result(stats) is called as each
+    chunk finishes, for streaming progress.
+    """
+    stats = {spec: PolicyStats(spec) for spec in policies}
+    for spec in policies:
+        resolve_policy(spec)  # Fail fast on bad specs, before forking
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = []
+        for spec in policies:
+            jobs = [(w, h, seed + i) for w, h in boards for seed in seeds for i in range(games)]
+            for start in range(0, len(jobs), chunk_size):
+                chunk = jobs[start:start + chunk_size]
+                futures.append(pool.submit(_play_chunk, spec, chunk, max_ticks))
+
+        for future in as_completed(futures):
+            spec, results = future.result()
+            for result in results:
+                stats[spec].add(result)
+            if on_result:
+                on_result(stats[spec])
+
+    ranking = [s.summary() for s in stats.values()]
+    ranking.sort(key=lambda s: s['mean_score'], reverse=True)
+    return ranking
+
+
+def format_ranking(ranking):
+    """Format tournament summaries as a text table."""
+    lines = [
+        f"{'#':>2} {'policy':<16} {'games':>6} {'mean':>8} {'p50':>6} {'p90':>6} "
+        f"{'p99':>6} {'ticks':>8} {'win%':>6} {'ticks/s':>10}"
+    ]
+    for i, s in enumerate(ranking):
+        lines.append(
+            f"{i + 1:>2} {s['policy'][:16]:<16} {s['games']:>6} {s['mean_score']:>8.1f} "
+            f"{s['p50_score']:>6} {s['p90_score']:>6} {s['p99_score']:>6} "
+            f"{s['mean_ticks']:>8.1f} {s['win_rate'] * 100:>6.1f} {s['ticks_per_second']:>10.0f}"
+        )
+    return '\n'.join(lines)
+
+
+def save_ranking(ranking):
+    """Record each policy's mean score on the leaderboard."""
+    from leaderboard import save_score
+
+    for s in ranking:
+        save_score(s['policy'], int(s['mean_score']))
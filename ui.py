@@ -1,5 +1,50 @@
 import curses
-from config import BORDER_CHAR, SNAKE_HEAD, SNAKE_BODY, FOOD_CHAR, BONUS_FOOD_CHAR
+
+import layout
+from config import SNAKE_HEAD, SNAKE_BODY, FOOD_CHAR, BONUS_FOOD_CHAR
+from frame import BoardFrame, EMPTY_CHAR
+from viewport import Camera, Minimap, MINIMAP_ROWS
+
+HEADER_ROWS = layout.OFFSET_Y  # Top border, title and score, separator
+FOOTER_ROWS = 3  # Separator, control hints, bottom border
+
+
+class Layer:
+    """Off-screen pad holding one band of screen rows.
+
+    Drawing marks the layer dirty; flush() copies only dirty layers to the
+    virtual screen, so a frame that changes only the board never touches the
+    header or footer. Positions are screen coordinates.
+    """
+
+    def __init__(self, top, rows, cols):
+        self.top = top
+        self.rows = rows
+        self.cols = cols
+        self.pad = curses.newpad(rows, cols)
+        self.dirty = True
+
+    def put(self, row, col, text, attr=0):
+        try:
+            self.pad.addstr(row - self.top, col, text, attr)
+        except curses.error:
+            pass  # Writing the pad's last cell moves the cursor off it
+        self.dirty = True
+
+    def flush(self, screen_rows, screen_cols):
+        """Stage the layer for the next doupdate, clipped to the terminal.
+
+        Returns whether anything was staged.
+        """
+        if not self.dirty:
+            return False
+        self.dirty = False
+        if self.top >= screen_rows or screen_cols <= 0:
+            return False
+        self.pad.noutrefresh(0, 0, self.top, 0,
+                             min(self.top + self.rows, screen_rows) - 1,
+                             min(self.cols, screen_cols) - 1)
+        return True
 
 
 class UI:
@@ -9,8 +54,25 @@ class UI:
         self.board_height = board_height
 
         # Calculate offsets for centering
-        self.offset_x = 2
-        self.offset_y = 3
+        self.offset_x = layout.OFFSET_X
+        self.offset_y = layout.OFFSET_Y
+
+        # Retained-mode rendering state
+        self.frame = BoardFrame()
+        self._screen_size = None
+        self._last_score = None
+        self._bonus_shown = False
+        self._timer_text = None
+        self.cells_drawn = 0  # Board cells emitted by the last render
+        self.chars_drawn = 0  # Text characters emitted by the last render
+
+        # Visible window of the board; the whole board when it fits the terminal
+        self.view_width = board_width
+        self.view_height = board_height
+        self.camera = Camera(board_width, board_height, board_width, board_height)
+        self.minimap = None
+        self.layers = []
+        self._fit_viewport()
 
         # Setup curses
         curses.curs_set(0)  # Hide cursor
@@ -31,135 +93,213 @@ class UI:
         color = curses.color_pair(3) if curses.has_colors() else 0
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
 
-        # Top UI border
-        self.stdscr.addstr(0, 0, '┌' + '─' * (self.board_width + 4) + '┐', ui_color)
-        self.stdscr.addstr(1, 0, '│', ui_color)
-        self.stdscr.addstr(2, 0, '├' + '─' * (self.board_width + 4) + '┤', ui_color)
-
-        # Game area border
-        for y in range(self.board_height + 2):
-            self.stdscr.addstr(self.offset_y + y, 0, '│ ', ui_color)
-            self.stdscr.addstr(self.offset_y + y, self.board_width + 5, ' │', ui_color)
-
-        # Top border of game area
-        self.stdscr.addstr(self.offset_y, self.offset_x, BORDER_CHAR * (self.board_width + 2), color)
-
-        # Side borders of game area
-        for y in range(self.board_height):
-            self.stdscr.addstr(self.offset_y + 1 + y, self.offset_x, BORDER_CHAR, color)
-            self.stdscr.addstr(self.offset_y + 1 + y, self.offset_x + self.board_width + 1, BORDER_CHAR, color)
-
-        # Bottom border of game area
-        self.stdscr.addstr(self.offset_y + self.board_height + 1, self.offset_x,
-                          BORDER_CHAR * (self.board_width + 2), color)
-
-        # Bottom UI borders
-        bottom = self.offset_y + self.board_height + 2
-        self.stdscr.addstr(bottom, 0, '├' + '─' * (self.board_width + 4) + '┤', ui_color)
-        self.stdscr.addstr(bottom + 1, 0, '│', ui_color)
-        self.stdscr.addstr(bottom + 1, self.board_width + 5, '│', ui_color)
-        self.stdscr.addstr(bottom + 2, 0, '└' + '─' * (self.board_width + 4) + '┘', ui_color)
+        for row, col, text, style in layout.chrome(self.view_width, self.view_height):
+            self._layer_at(row).put(row, col, text, color if style == 'border' else ui_color)
 
     def draw_score(self, score):
         """Draw the score at the top."""
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
-        title = "  SNAKE"
-        score_text = f"Score: {score}"
-        padding = self.board_width + 4 - len(title) - len(score_text)
-        self.stdscr.addstr(1, 1, title + ' ' * padding + score_text + ' ', ui_color)
+        self.header.put(*layout.score_line(self.view_width, score), ui_color)
 
     def draw_controls(self):
         """Draw control hints at the bottom."""
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
-        bottom = self.offset_y + self.board_height + 3
-        controls = "  WASD or Arrows to move   Q to quit"
-        padding = self.board_width + 4 - len(controls)
-        self.stdscr.addstr(bottom, 1, controls + ' ' * max(0, padding), ui_color)
-
-    def draw_snake(self, snake):
-        """Draw the snake on the board."""
-        color = curses.color_pair(1) if curses.has_colors() else 0
-
-        for i, (x, y) in enumerate(snake.body):
-            char = SNAKE_HEAD if i == 0 else SNAKE_BODY
-            screen_x = self.offset_x + 1 + x
-            screen_y = self.offset_y + 1 + y
-            try:
-                self.stdscr.addch(screen_y, screen_x, char, color)
-            except curses.error:
-                pass
+        self.footer.put(*layout.controls_line(self.view_width, self.view_height), ui_color)
 
-    def draw_food(self, food):
-        """Draw the food on the board."""
-        if food.position is None:
-            return
+    def draw_bonus_timer(self, bonus_food, now=None):
+        """Draw bonus food timer if active and its text changed.
 
-        color = curses.color_pair(2) if curses.has_colors() else 0
-        x, y = food.position
-        screen_x = self.offset_x + 1 + x
-        screen_y = self.offset_y + 1 + y
-        try:
-            self.stdscr.addch(screen_y, screen_x, FOOD_CHAR, color)
-        except curses.error:
-            pass
-
-    def draw_bonus_food(self, bonus_food):
-        """Draw the 2x2 bonus food on the board."""
-        if not bonus_food.active or bonus_food.position is None:
-            return
-
-        color = curses.color_pair(5) if curses.has_colors() else 0
-        # Make it blink by using bold attribute
-        attr = color | curses.A_BOLD
-
-        x, y = bonus_food.position
-        # Draw 2x2 bonus food
-        for dx in range(2):
-            for dy in range(2):
-                screen_x = self.offset_x + 1 + x + dx
-                screen_y = self.offset_y + 1 + y + dy
-                try:
-                    self.stdscr.addch(screen_y, screen_x, BONUS_FOOD_CHAR, attr)
-                except curses.error:
-                    pass
-
-    def draw_bonus_timer(self, bonus_food):
-        """Draw bonus food timer if active."""
+        The timer shows tenths of a second, so it is redrawn at most every
+        100 ms. Returns the number of characters drawn.
+        """
         if not bonus_food.active:
-            return
+            return 0
 
         ui_color = curses.color_pair(5) if curses.has_colors() else 0
-        remaining = bonus_food.get_time_remaining()
-        timer_text = f"BONUS: {remaining:.1f}s"
+        row, col, text = layout.bonus_timer(self.view_width, bonus_food.get_time_remaining(now))
+        if text == self._timer_text:
+            return 0
         # Draw timer in the header area
-        try:
-            self.stdscr.addstr(1, self.board_width - 5, timer_text, ui_color | curses.A_BOLD)
-        except curses.error:
-            pass
-
-    def clear_game_area(self):
-        """Clear only the game area."""
-        for y in range(self.board_height):
-            for x in range(self.board_width):
-                screen_x = self.offset_x + 1 + x
-                screen_y = self.offset_y + 1 + y
-                try:
-                    self.stdscr.addch(screen_y, screen_x, ' ')
-                except curses.error:
-                    pass
-
-    def render(self, snake, food, score, bonus_food=None):
-        """Render the complete game frame."""
+        self.header.put(row, col, text, ui_color | curses.A_BOLD)
+        self._timer_text = text
+        return len(text)
+
+    def cell_attr(self, glyph):
+        """Get the curses attribute used to draw a board glyph."""
+        if not curses.has_colors():
+            return curses.A_BOLD if glyph == BONUS_FOOD_CHAR else 0
+        if glyph in (SNAKE_HEAD, SNAKE_BODY):
+            return curses.color_pair(1)
+        if glyph == FOOD_CHAR:
+            return curses.color_pair(2)
+        if glyph == BONUS_FOOD_CHAR:
+            return curses.color_pair(5) | curses.A_BOLD
+        return 0
+
+    def invalidate(self):
+        """Force the next render to repaint the chrome and the whole board."""
+        self._screen_size = None
+
+    def _fit_viewport(self):
+        """Size the visible window to the terminal, with a minimap if it is partial."""
+        rows, cols = self.stdscr.getmaxyx()
+        full_rows, full_cols = layout.screen_size(self.board_width, self.board_height)
+        if rows >= full_rows and cols >= full_cols:
+            self.view_width, self.view_height = self.board_width, self.board_height
+            minimap_rows = 0
+        else:
+            minimap_rows = MINIMAP_ROWS
+            self.view_width = max(1, min(self.board_width, cols - (full_cols - self.board_width)))
+            self.view_height = max(1, min(self.board_height,
+                                          rows - (full_rows - self.board_height) - minimap_rows))
+
+        camera = Camera(self.board_width, self.board_height, self.view_width, self.view_height)
+        camera.x, camera.y = self.camera.x, self.camera.y
+        self.camera = camera
+        self.minimap = None
+        if minimap_rows:
+            self.minimap = Minimap(self.board_width, self.board_height,
+                                   self.view_width + 4, minimap_rows)
+            for cell, glyph in self.frame.cells.items():
+                self.minimap.update(cell, EMPTY_CHAR, glyph)
+        self._build_layers()
+
+    def _build_layers(self):
+        """Create one pad per screen band for the current view size."""
+        controls = layout.controls_line(self.view_width, self.view_height)
+        cols = max(col + len(text)
+                   for _, col, text, *_ in layout.chrome(self.view_width, self.view_height)
+                   + (controls,))
+        board_rows = self.view_height + 2
+        self.header = Layer(0, HEADER_ROWS, cols)
+        self.board = Layer(HEADER_ROWS, board_rows, cols)
+        self.footer = Layer(HEADER_ROWS + board_rows, FOOTER_ROWS, cols)
+        self.layers = [self.header, self.board, self.footer]
+        self.minimap_layer = None
+        if self.minimap:
+            top, _ = layout.screen_size(self.view_width, self.view_height)
+            self.minimap_layer = Layer(top, self.minimap.height, cols)
+            self.layers.append(self.minimap_layer)
+
+    def _layer_at(self, row):
+        for layer in self.layers:
+            if layer.top <= row < layer.top + layer.rows:
+                return layer
+        return self.board
+
+    def _flush(self):
+        """Copy the layers drawn on this frame to the terminal in one doupdate."""
+        rows, cols = self._screen_size
+        staged = False
+        for layer in self.layers:
+            staged |= layer.flush(rows, cols)
+        if staged:
+            curses.doupdate()
+
+    def _ensure_chrome(self):
+        """Repaint static chrome on the first frame or after a resize.
+
+        Returns the number of characters drawn (0 when nothing changed).
+        """
+        screen_size = self.stdscr.getmaxyx()
+        if screen_size == self._screen_size:
+            return 0
+        self._screen_size = screen_size
+        self._fit_viewport()
+        # Blank the terminal once; the layers are drawn over it
         self.stdscr.clear()
+        self.stdscr.noutrefresh()
         self.draw_border()
-        self.draw_score(score)
         self.draw_controls()
-        self.draw_snake(snake)
-        self.draw_food(food)
-        if bonus_food:
-            self.draw_bonus_food(bonus_food)
-            self.draw_bonus_timer(bonus_food)
-        self.stdscr.refresh()
+        self._last_score = None
+        self._timer_text = None
+        return (self.view_width + 6) * (self.view_height + 7)
+
+    def _draw_glyph(self, vx, vy, glyph):
+        self.board.put(self.offset_y + 1 + vy, self.offset_x + 1 + vx, glyph,
+                       self.cell_attr(glyph))
+
+    def _draw_cells(self, changes):
+        """Draw the changed cells that are inside the window; returns how many."""
+        drawn = 0
+        for cell, glyph in changes:
+            position = self.camera.to_view(cell)
+            if position is not None:
+                self._draw_glyph(*position, glyph)
+                drawn += 1
+        return drawn
+
+    def _draw_window(self):
+        """Repaint every cell of the window from the retained frame."""
+        cells = self.frame.cells
+        for (vx, vy), cell in self.camera.visible_cells():
+            self._draw_glyph(vx, vy, cells.get(cell, EMPTY_CHAR))
+        return self.view_width * self.view_height
+
+    def _draw_minimap(self):
+        ui_color = curses.color_pair(4) if curses.has_colors() else 0
+        top, _ = layout.screen_size(self.view_width, self.view_height)
+        changes = self.minimap.take_dirty()
+        for (col, row), glyph in changes:
+            self.minimap_layer.put(top + row, 1 + col, glyph, ui_color)
+        return len(changes)
+
+    def render(self, snake, food, score, bonus_food=None, now=None):
+        """Render a game frame, drawing only what changed since the last one.
+
+        On boards larger than the terminal only the window around the head
+        is drawn, so the cost depends on the terminal size, not the board.
+        `now` is the game clock in seconds, used for the bonus timer.
+        Header, board and footer are separate layers, each copied out only
+        when drawn on, and the frame reaches the terminal in one doupdate.
+        """
+        chars = self._ensure_chrome()
+        on_change = self.minimap.update if self.minimap else None
+        changes = self.frame.diff(snake, food, bonus_food, on_change)
+        moved = self.camera.follow(snake.head)
+        if chars and self.camera.full:
+            drawn = self._draw_cells(self.frame.cells.items())  # Screen was just cleared
+        elif chars or moved:
+            drawn = self._draw_window()
+        else:
+            drawn = self._draw_cells(changes)
+        if self.minimap:
+            chars += self._draw_minimap()
+
+        bonus_active = bool(bonus_food and bonus_food.active)
+        if score != self._last_score or (self._bonus_shown and not bonus_active):
+            # Redrawing the score line also erases a finished bonus timer
+            self.draw_score(score)
+            self._last_score = score
+            self._timer_text = None
+            chars += self.view_width + 5
+        if bonus_active:
+            chars += self.draw_bonus_timer(bonus_food, now)
+        self._bonus_shown = bonus_active
+
+        self.cells_drawn = drawn
+        self.chars_drawn = chars + drawn
+
+        self._flush()
+
+    def render_cells(self, changes, score, all_cells=None):
+        """Render board changes tracked outside BoardFrame (multiplayer client).
+
+        `changes` is a list of ((x, y), glyph); `all_cells` is a callable
+        returning every non-empty cell, drawn instead when the chrome was
+        repainted.
+        """
+        chars = self._ensure_chrome()
+        if chars and all_cells is not None:
+            changes = all_cells()
+        drawn = self._draw_cells(changes)
+        if score != self._last_score:
+            self.draw_score(score)
+            self._last_score = score
+            chars += self.view_width + 5
+        self.cells_drawn = drawn
+        self.chars_drawn = chars + drawn
+        self._flush()
 
     def get_input(self):
         """Get keyboard input (non-blocking)."""
@@ -168,13 +308,22 @@ class UI:
         except:
             return -1
 
+    def get_inputs(self):
+        """Get all pending keys (non-blocking), oldest first."""
+        keys = []
+        key = self.get_input()
+        while key != -1:
+            keys.append(key)
+            key = self.get_input()
+        return keys
+
     def show_game_over(self, score):
         """Display game over screen."""
         self.stdscr.clear()
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
 
-        center_y = (self.board_height + 8) // 2
-        center_x = (self.board_width + 6) // 2
+        center_y = (self.view_height + 8) // 2
+        center_x = (self.view_width + 6) // 2
 
         messages = [
             "╔══════════════════╗",
@@ -212,7 +361,7 @@ class UI:
             snake_color = curses.color_pair(1) if curses.has_colors() else 0
 
             center_y = 5
-            center_x = (self.board_width + 6) // 2
+            center_x = (self.view_width + 6) // 2
 
             # ASCII art title
             title = [
@@ -269,7 +418,7 @@ class UI:
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
         gold_color = curses.color_pair(3) if curses.has_colors() else 0
 
-        center_x = (self.board_width + 6) // 2
+        center_x = (self.view_width + 6) // 2
 
         self.stdscr.addstr(2, center_x - 7, "═══ LEADERBOARD ═══", gold_color)
 
@@ -301,8 +450,8 @@ class UI:
         curses.curs_set(1)
 
         ui_color = curses.color_pair(4) if curses.has_colors() else 0
-        center_x = (self.board_width + 6) // 2
-        center_y = (self.board_height + 8) // 2
+        center_x = (self.view_width + 6) // 2
+        center_y = (self.view_height + 8) // 2
 
         self.stdscr.clear()
         self.stdscr.addstr(center_y - 2, center_x - 10, "NEW HIGH SCORE!", ui_color | curses.A_BOLD)
@@ -0,0 +1,126 @@
+"""
+Scrolling viewport and minimap for boards larger than the terminal.
+
+Both are curses-free and work in board cells; UI maps them to the screen.
+"""
+
+from config import SNAKE_HEAD, FOOD_CHAR
+from frame import EMPTY_CHAR
+
+MINIMAP_ROWS = 4
+SHADES = ' ░▒▓█'
+
+
+class Camera:
+    """Top-left board cell of the visible window, following the head.
+
+    The window scrolls in jumps, re-centering on the head when it comes
+    within a quarter of the window of an edge, so most frames only draw
+    changed cells and a scroll repaints one screenful. The board wraps, so
+    the window may straddle an edge.
+    """
+
+    def __init__(self, board_width, board_height, view_width, view_height):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.view_width = min(view_width, board_width)
+        self.view_height = min(view_height, board_height)
+        self.x = 0
+        self.y = 0
+
+    @property
+    def full(self):
+        """Whether the whole board is visible."""
+        return self.view_width == self.board_width and self.view_height == self.board_height
+
+    @staticmethod
+    def _scroll(origin, head, view, board):
+        if view >= board:
+            return 0
+        margin = view // 4
+        if margin <= (head - origin) % board < view - margin:
+            return origin
+        return (head - view // 2) % board
+
+    def follow(self, cell):
+        """Scroll to keep cell (the head) away from the edges; True if it moved."""
+        x = self._scroll(self.x, cell[0], self.view_width, self.board_width)
+        y = self._scroll(self.y, cell[1], self.view_height, self.board_height)
+        moved = (x, y) != (self.x, self.y)
+        self.x, self.y = x, y
+        return moved
+
+    def to_view(self, cell):
+        """Position of a board cell inside the window, or None if it is not visible."""
+        vx = (cell[0] - self.x) % self.board_width
+        vy = (cell[1] - self.y) % self.board_height
+        if vx < self.view_width and vy < self.view_height:
+            return vx, vy
+        return None
+
+    def visible_cells(self):
+        """Yield ((vx, vy), cell) for every cell in the window."""
+        for vy in range(self.view_height):
+            y = (self.y + vy) % self.board_height
+            for vx in range(self.view_width):
+                yield (vx, vy), ((self.x + vx) % self.board_width, y)
+
+
+class Minimap:
+    """The whole board downsampled into a few rows of block characters.
+
+    Each character covers a bucket of board cells and counts the non-empty
+    cells inside it. Counts are updated from the changes BoardFrame reports
+    (see BoardFrame.diff's on_change), so keeping the minimap current costs
+    O(changed cells), never a board scan.
+    """
+
+    def __init__(self, board_width, board_height, width, height=MINIMAP_ROWS):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.width = min(width, board_width)
+        self.height = min(height, board_height)
+        self.bucket_area = (board_width * board_height) / (self.width * self.height)
+        self.counts = [0] * (self.width * self.height)
+        self.head = None  # Bucket holding the head, drawn as SNAKE_HEAD
+        self.food = None  # Bucket holding the food, drawn as FOOD_CHAR
+        self.dirty = set(range(len(self.counts)))
+
+    def bucket(self, cell):
+        x, y = cell
+        return (y * self.height // self.board_height) * self.width + x * self.width // self.board_width
+
+    def update(self, cell, old_glyph, new_glyph):
+        """on_change callback for BoardFrame.diff."""
+        delta = (new_glyph != EMPTY_CHAR) - (old_glyph != EMPTY_CHAR)
+        bucket = self.bucket(cell)
+        if delta:
+            self.counts[bucket] += delta
+            self.dirty.add(bucket)
+        if new_glyph == SNAKE_HEAD:
+            self._mark('head', bucket)
+        elif new_glyph == FOOD_CHAR:
+            self._mark('food', bucket)
+
+    def _mark(self, name, bucket):
+        old = getattr(self, name)
+        if old != bucket:
+            self.dirty.update(b for b in (old, bucket) if b is not None)
+            setattr(self, name, bucket)
+
+    def glyph(self, bucket):
+        if bucket == self.head:
+            return SNAKE_HEAD
+        if bucket == self.food:
+            return FOOD_CHAR
+        count = self.counts[bucket]
+        if count == 0:
+            return SHADES[0]
+        level = 1 + int(count / self.bucket_area * (len(SHADES) - 1))
+        return SHADES[min(level, len(SHADES) - 1)]
+
+    def take_dirty(self):
+        """Return [((column, row), glyph), ...] for buckets changed since the last call."""
+        changes = [((b % self.width, b // self.width), self.glyph(b)) for b in self.dirty]
+        self.dirty.clear()
+        return changes